@@ -1,5 +1,6 @@
+import AESTables
 from AESTables import *
-from AESHelp import in_to_state, out_from_state, xor, gf_mul, get_columns
+from AESHelp import in_to_state, out_from_state, xor, get_columns, mix_packed, inv_mix_packed
 
 
 #
@@ -63,6 +64,20 @@ FIPS 197: Advanced Encryption Standard (November 26, 2001)."""
 #
 # Functions used by AES Cipher
 #
+def round_key(keys, i, n_b=4):
+    """
+round_key(keys, i, n_b=4) -> key list
+
+round_key returns Round Key i of keys as n_b four-byte words.
+keys is either the key list returned by KeyExpansion or the same
+Round Keys as one contiguous buffer, the form a KeySchedule holds;
+the words of a memoryview of the buffer are views, not copies."""
+    if isinstance(keys, list):
+        return keys[i * n_b:(i + 1) * n_b]
+    start = 4 * n_b * i
+    return [keys[j:j + 4] for j in range(start, start + 4 * n_b, 4)]
+
+
 def AddRoundKey(state, key, n_b=4):
     """
 AddRoundKey(state, key, n_b=4) -> state
@@ -113,16 +128,28 @@ MixColumns takes all the columns of the state (2D array
 of longs) and mixes their data independently of one another
 to produce new columns. It is defined in the
 FIPS 197: Advanced Encryption Standard (November 26, 2001)."""
+    mul2, mul3 = AESTables.mul2, AESTables.mul3
     out = [[0 for _ in range(4)] for _ in range(n_b)]
     for col in range(n_b):
-        out[0][col] = \
-            gf_mul(0x02, state[0][col]) ^ gf_mul(0x03, state[1][col]) ^ state[2][col] ^ state[3][col]
-        out[1][col] = state[0][col] ^ gf_mul(0x02, state[1][col]) ^ gf_mul(0x03, state[2][col]) ^ state[3][col]
-        out[2][col] = state[0][col] ^ state[1][col] ^ gf_mul(0x02, state[2][col]) ^ gf_mul(0x03, state[3][col])
-        out[3][col] = gf_mul(0x03, state[0][col]) ^ state[1][col] ^ state[2][col] ^ gf_mul(0x02, state[3][col])
+        s0, s1, s2, s3 = state[0][col], state[1][col], state[2][col], state[3][col]
+        out[0][col] = mul2[s0] ^ mul3[s1] ^ s2 ^ s3
+        out[1][col] = s0 ^ mul2[s1] ^ mul3[s2] ^ s3
+        out[2][col] = s0 ^ s1 ^ mul2[s2] ^ mul3[s3]
+        out[3][col] = mul3[s0] ^ s1 ^ s2 ^ mul2[s3]
     return out
 
 
+def MixColumnsSWAR(state, n_b=4):
+    """
+MixColumnsSWAR(state, n_b=4) -> state
+
+MixColumnsSWAR gives the same result as MixColumns, but packs
+the whole state into one integer and mixes all of its columns
+with a handful of shifts, masks and xors (see mix_packed)."""
+    x = int.from_bytes(out_from_state(state, n_b), 'big')
+    return in_to_state(mix_packed(x, n_b).to_bytes(4 * n_b, 'big'), n_b)
+
+
 #
 # AES Cipher
 #
@@ -140,15 +167,15 @@ Cipher is defined in the
 FIPS 197: Advanced Encryption Standard (November 26, 2001)."""
     state = in_to_state(inp)
     n_r = n_k + 6
-    state = AddRoundKey(state, keys[0:n_b])
+    state = AddRoundKey(state, round_key(keys, 0, n_b))
     for i in range(1, n_r):
         SubBytes(state)
         ShiftRows(state)
         state = MixColumns(state)
-        state = AddRoundKey(state, keys[i * n_b:(i + 1) * n_b])
+        state = AddRoundKey(state, round_key(keys, i, n_b))
     SubBytes(state)
     ShiftRows(state)
-    state = AddRoundKey(state, keys[n_r * n_b:(n_r + 1) * n_b])
+    state = AddRoundKey(state, round_key(keys, n_r, n_b))
     return out_from_state(state)
 
 
@@ -189,31 +216,28 @@ of longs) and mixes their data independently of one another
 to produce new columns. The inverse of MixColumns.
 It is defined in the
 FIPS 197: Advanced Encryption Standard (November 26, 2001)."""
+    mul9, mul11, mul13, mul14 = AESTables.mul9, AESTables.mul11, AESTables.mul13, AESTables.mul14
     out = [[0 for _ in range(4)] for _ in range(n_b)]
     for col in range(n_b):
-        out[0][col] = \
-            gf_mul(0x0e, state[0][col]) ^ \
-            gf_mul(0x0b, state[1][col]) ^ \
-            gf_mul(0x0d, state[2][col]) ^ \
-            gf_mul(0x09, state[3][col])
-        out[1][col] = \
-            gf_mul(0x09, state[0][col]) ^ \
-            gf_mul(0x0e, state[1][col]) ^ \
-            gf_mul(0x0b, state[2][col]) ^ \
-            gf_mul(0x0d, state[3][col])
-        out[2][col] = \
-            gf_mul(0x0d, state[0][col]) ^ \
-            gf_mul(0x09, state[1][col]) ^ \
-            gf_mul(0x0e, state[2][col]) ^ \
-            gf_mul(0x0b, state[3][col])
-        out[3][col] = \
-            gf_mul(0x0b, state[0][col]) ^ \
-            gf_mul(0x0d, state[1][col]) ^ \
-            gf_mul(0x09, state[2][col]) ^ \
-            gf_mul(0x0e, state[3][col])
+        s0, s1, s2, s3 = state[0][col], state[1][col], state[2][col], state[3][col]
+        out[0][col] = mul14[s0] ^ mul11[s1] ^ mul13[s2] ^ mul9[s3]
+        out[1][col] = mul9[s0] ^ mul14[s1] ^ mul11[s2] ^ mul13[s3]
+        out[2][col] = mul13[s0] ^ mul9[s1] ^ mul14[s2] ^ mul11[s3]
+        out[3][col] = mul11[s0] ^ mul13[s1] ^ mul9[s2] ^ mul14[s3]
     return out
 
 
+def InvMixColumnsSWAR(state, n_b=4):
+    """
+InvMixColumnsSWAR(state, n_b=4) -> state
+
+InvMixColumnsSWAR gives the same result as InvMixColumns, but
+packs the whole state into one integer and unmixes all of its
+columns at once (see inv_mix_packed)."""
+    x = int.from_bytes(out_from_state(state, n_b), 'big')
+    return in_to_state(inv_mix_packed(x, n_b).to_bytes(4 * n_b, 'big'), n_b)
+
+
 #
 # Inverse Cipher
 #
@@ -230,13 +254,66 @@ For this standard, n_b = 4. InvCipher is defined in the
 FIPS 197: Advanced Encryption Standard (November 26, 2001)."""
     state = in_to_state(inp)
     n_r = n_k + 6
-    state = AddRoundKey(state, keys[n_r * n_b:(n_r + 1) * n_b])
+    state = AddRoundKey(state, round_key(keys, n_r, n_b))
     for i in range(n_r - 1, 0, -1):
         InvShiftRows(state)
         InvSubBytes(state)
-        state = AddRoundKey(state, keys[i * n_b:(i + 1) * n_b])
+        state = AddRoundKey(state, round_key(keys, i, n_b))
         state = InvMixColumns(state)
     InvShiftRows(state)
     InvSubBytes(state)
-    state = AddRoundKey(state, keys[0:n_b])
+    state = AddRoundKey(state, round_key(keys, 0, n_b))
+    return out_from_state(state)
+
+
+#
+# Equivalent Inverse Cipher
+#
+def KeyExpansionEIC(key, n_k, n_b=4):
+    """
+KeyExpansionEIC(key, n_k, n_b=4) -> key list
+
+KeyExpansionEIC generates the Round Keys (key list) used by the
+equivalent inverse cipher from the Cipher Key (key).  They are the
+Round Keys of KeyExpansion with InvMixColumns applied to every
+Round Key except the first and the last.
+n_k is the number of 32-bit words comprising the Cipher Key (key).
+  For this standard, n_k = 4, 6, or 8.
+n_b is the number of columns (32-bit words) comprising the state.
+  For this standard, n_b = 4.
+KeyExpansionEIC is defined in section 5.3.5 of the
+FIPS 197: Advanced Encryption Standard (November 26, 2001)."""
+    w = KeyExpansion(key, n_k, n_b)
+    n_r = n_k + 6
+    dw = list(w)
+    for i in range(1, n_r):
+        state = InvMixColumns(get_columns(w[i * n_b:(i + 1) * n_b]))
+        dw[i * n_b:(i + 1) * n_b] = [bytes(col) for col in get_columns(state)]
+    return dw
+
+
+def EqInvCipher(inp, keys, n_k, n_b=4):
+    """
+EqInvCipher(inp, keys, n_k, n_b = 4) -> state
+
+EqInvCipher converts ciphertext (inp) to plaintext using the
+Round Keys (keys) produced by KeyExpansionEIC.  It gives the
+same result as InvCipher, but its rounds apply the
+transformations in the same order as those of Cipher.
+n_k is the number of 32-bit words comprising the Cipher Key.
+For this standard, n_k = 4, 6, or 8.
+n_b is the number of columns (32-bit words) comprising the state.
+For this standard, n_b = 4. EqInvCipher is defined in section 5.3.5 of the
+FIPS 197: Advanced Encryption Standard (November 26, 2001)."""
+    state = in_to_state(inp)
+    n_r = n_k + 6
+    state = AddRoundKey(state, round_key(keys, n_r, n_b))
+    for i in range(n_r - 1, 0, -1):
+        InvSubBytes(state)
+        InvShiftRows(state)
+        state = InvMixColumns(state)
+        state = AddRoundKey(state, round_key(keys, i, n_b))
+    InvSubBytes(state)
+    InvShiftRows(state)
+    state = AddRoundKey(state, round_key(keys, 0, n_b))
     return out_from_state(state)
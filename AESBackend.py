@@ -0,0 +1,328 @@
+from abc import ABC, abstractmethod
+from array import array
+from os import environ
+from threading import local
+from AES import Cipher, EqInvCipher
+from AESKeySchedule import KeySchedule, ScheduleCache, schedule_tag
+
+
+#
+# Block cipher backends.  A backend is an Engine subclass: an Engine
+# takes the KeySchedule of one Cipher Key, keeps it in the form its
+# backend needs and encrypts and decrypts blocks with it.  The mode
+# modules get their Engine from new_engine, which uses the selected
+# backend and the schedule cache.  Each Engine imports the modules of
+# its backend when the first one is made, so that importing the mode
+# modules does not load NumPy or OpenSSL.
+#
+class Engine(ABC):
+    """
+Engine(schedule) -> Engine
+
+An Engine encrypts and decrypts 16-byte blocks under the Cipher
+Key of the KeySchedule (schedule).  Subclasses provide cipher and
+inv_cipher, and may override cipher_blocks and inv_cipher_blocks
+with a faster way of transforming many blocks at once.  wipe
+overwrites the schedule and drops whatever the Engine derived
+from it; the Engine cannot be used afterwards."""
+    __slots__ = ('schedule', 'n_k')
+
+    def __init__(self, schedule):
+        self.schedule = schedule
+        self.n_k = schedule.n_k
+
+    @abstractmethod
+    def cipher(self, block):
+        """
+cipher(block) -> bytes
+
+cipher encrypts the 16-byte block."""
+
+    @abstractmethod
+    def inv_cipher(self, block):
+        """
+inv_cipher(block) -> bytes
+
+inv_cipher decrypts the 16-byte block."""
+
+    def cipher_blocks(self, data):
+        """
+cipher_blocks(data) -> bytes
+
+cipher_blocks encrypts every 16-byte block of data, whose
+length must be a multiple of 16."""
+        cipher = self.cipher
+        return b''.join([cipher(data[i:i + 16]) for i in range(0, len(data), 16)])
+
+    def inv_cipher_blocks(self, data):
+        """
+inv_cipher_blocks(data) -> bytes
+
+inv_cipher_blocks decrypts every 16-byte block of data, whose
+length must be a multiple of 16."""
+        inv_cipher = self.inv_cipher
+        return b''.join([inv_cipher(data[i:i + 16]) for i in range(0, len(data), 16)])
+
+    def wipe(self):
+        self.schedule.wipe()
+
+
+class ReferenceEngine(Engine):
+    """The FIPS 197 reference Cipher and equivalent inverse cipher of AES.
+The cipher reads the Round Keys through one memoryview of each of
+the schedule's buffers (see AES.round_key), not a view per word."""
+    __slots__ = ('keys', 'dkeys')
+
+    def __init__(self, schedule):
+        Engine.__init__(self, schedule)
+        self.keys = memoryview(schedule.enc)
+        self.dkeys = None
+
+    def cipher(self, block):
+        return Cipher(block, self.keys, self.n_k)
+
+    def inv_cipher(self, block):
+        if self.dkeys is None:
+            self.dkeys = memoryview(self.schedule.decryption())
+        return EqInvCipher(block, self.dkeys, self.n_k)
+
+    def wipe(self):
+        Engine.wipe(self)
+        self.keys = self.dkeys = None
+
+
+class TableEngine(Engine):
+    """The T-table Cipher and Inverse Cipher of AESTTable."""
+    __slots__ = ('w', 'dw', 'encrypt', 'decrypt')
+
+    def __init__(self, schedule):
+        from AESTTable import Cipher, InvCipher
+        Engine.__init__(self, schedule)
+        self.w = schedule.word_array(schedule.enc)
+        self.dw = None
+        self.encrypt = Cipher
+        self.decrypt = InvCipher
+
+    def cipher(self, block):
+        return self.encrypt(block, self.w, self.n_k)
+
+    def inv_cipher(self, block):
+        if self.dw is None:
+            self.dw = self.schedule.word_array(self.schedule.decryption(), True)
+        return self.decrypt(block, self.dw, self.n_k)
+
+    def wipe(self):
+        Engine.wipe(self)
+        for words in (self.w, self.dw):
+            if words is not None:
+                words[:] = array('I', bytes(4 * len(words)))
+        self.w = self.dw = None
+
+
+class UnrolledEngine(Engine):
+    """The key-specialised unrolled functions of AESUnrolled."""
+    __slots__ = ('cipher', 'inv_cipher')
+
+    def __init__(self, schedule):
+        from AESUnrolled import compile_cipher
+        Engine.__init__(self, schedule)
+        self.cipher = compile_cipher(schedule.word_array(schedule.enc), self.n_k)
+        self.inv_cipher = compile_cipher(schedule.word_array(schedule.decryption(), True), self.n_k, True)
+
+    def wipe(self):
+        Engine.wipe(self)
+        self.cipher = self.inv_cipher = None
+
+
+class BitsliceEngine(TableEngine):
+    """AESBitslice for runs of blocks to encrypt, AESTTable otherwise."""
+    __slots__ = ('encrypt_blocks',)
+
+    def __init__(self, schedule):
+        from AESBitslice import cipher_blocks
+        TableEngine.__init__(self, schedule)
+        self.encrypt_blocks = cipher_blocks
+
+    def cipher_blocks(self, data):
+        return self.encrypt_blocks(data, self.schedule.words(self.schedule.enc), self.n_k)
+
+
+class NumpyEngine(TableEngine):
+    """AESNumpy for runs of blocks, AESTTable for single blocks."""
+    __slots__ = ('encrypt_blocks', 'decrypt_blocks')
+
+    def __init__(self, schedule):
+        from AESNumpy import numpy, cipher_blocks, inv_cipher_blocks
+        if numpy is None:
+            raise ImportError("NumPy is not installed")
+        TableEngine.__init__(self, schedule)
+        self.encrypt_blocks = cipher_blocks
+        self.decrypt_blocks = inv_cipher_blocks
+
+    def cipher_blocks(self, data):
+        return self.encrypt_blocks(data, self.schedule.words(self.schedule.enc), self.n_k)
+
+    def inv_cipher_blocks(self, data):
+        return self.decrypt_blocks(data, self.schedule.words(self.schedule.enc), self.n_k)
+
+
+class OpenSSLEngine(Engine):
+    """AES-ECB of the cryptography package (OpenSSL).  An OpenSSL
+context must not be used by two threads at once, and new_engine
+hands the same Engine to every thread, so each thread gets its own
+encryptor and decryptor on its first call."""
+    __slots__ = ('aes', 'contexts')
+
+    def __init__(self, schedule):
+        from cryptography.hazmat.primitives.ciphers import Cipher as OpenSSLCipher, algorithms, modes
+        Engine.__init__(self, schedule)
+        self.aes = OpenSSLCipher(algorithms.AES(bytes(schedule.key)), modes.ECB())
+        self.contexts = local()
+
+    def updates(self):
+        # The update functions of this thread's encryptor and decryptor
+        contexts = self.contexts
+        try:
+            return contexts.updates
+        except AttributeError:
+            contexts.updates = (self.aes.encryptor().update, self.aes.decryptor().update)
+            return contexts.updates
+
+    def cipher(self, block):
+        return self.updates()[0](block)
+
+    def inv_cipher(self, block):
+        return self.updates()[1](block)
+
+    cipher_blocks = cipher
+    inv_cipher_blocks = inv_cipher
+
+    def wipe(self):
+        Engine.wipe(self)
+        self.aes = None
+        self.contexts = local()
+
+
+#
+# The registry.  BACKENDS lists the backends, most preferred first.
+# A backend is self-tested, and the package it needs imported, only
+# when it is first considered; one whose package is not installed
+# (its Engine raises ImportError) fails its self-test and is passed
+# over.
+#
+BACKENDS = {}
+SELF_TEST = {}
+schedule_cache = ScheduleCache()
+ENVIRONMENT_VARIABLE = 'AES_BACKEND'
+selected = None
+
+
+def register_backend(name, engine):
+    """
+register_backend(name, engine) -> None
+
+register_backend adds the Engine subclass (engine) to the
+registry under name.  A newly registered backend is the least
+preferred one; it is used automatically only if no other backend
+passes its self-test."""
+    BACKENDS[name] = engine
+    SELF_TEST.pop(name, None)
+
+
+register_backend('openssl', OpenSSLEngine)
+register_backend('numpy', NumpyEngine)
+register_backend('bitslice', BitsliceEngine)
+register_backend('unrolled', UnrolledEngine)
+register_backend('table', TableEngine)
+register_backend('reference', ReferenceEngine)
+
+
+def self_test(name):
+    """
+self_test(name) -> bool
+
+self_test checks the backend name against the ECB test vectors
+of AESVectors, block by block and as a whole, in both directions.
+The result is remembered, so each backend is tested once.  A
+backend whose package is missing fails; any other error in it is
+raised."""
+    if name not in SELF_TEST:
+        from AESVectors import ecb_vectors
+        try:
+            passed = True
+            for key, n_k, plaintext, ciphertext in ecb_vectors:
+                engine = BACKENDS[name](KeySchedule(key, n_k))
+                for i in range(0, len(plaintext), 16):
+                    passed = passed and \
+                        bytes(engine.cipher(plaintext[i:i + 16])) == ciphertext[i:i + 16] and \
+                        bytes(engine.inv_cipher(ciphertext[i:i + 16])) == plaintext[i:i + 16]
+                passed = passed and \
+                    bytes(engine.cipher_blocks(plaintext)) == ciphertext and \
+                    bytes(engine.inv_cipher_blocks(ciphertext)) == plaintext
+        except ImportError:
+            passed = False
+        SELF_TEST[name] = passed
+    return SELF_TEST[name]
+
+
+def available_backends():
+    """
+available_backends() -> name list
+
+available_backends returns the registered backends that pass
+their self-test, most preferred first."""
+    return [name for name in BACKENDS if self_test(name)]
+
+
+def set_backend(name=None):
+    """
+set_backend(name=None) -> None
+
+set_backend pins the backend used by new_engine to name.  With
+no name the choice goes back to the environment variable
+AES_BACKEND, or, if that is not set, to the most preferred
+backend that passes its self-test."""
+    global selected
+    if name is not None:
+        if name not in BACKENDS:
+            raise Exception("Unknown AES backend '%s'" % name)
+        if not self_test(name):
+            raise Exception("AES backend '%s' failed its self-test" % name)
+    selected = name
+
+
+def get_backend():
+    """
+get_backend() -> name
+
+get_backend returns the name of the backend used by new_engine."""
+    global selected
+    if selected is None:
+        name = environ.get(ENVIRONMENT_VARIABLE)
+        if name:
+            set_backend(name)
+        else:
+            selected = next(name for name in BACKENDS if self_test(name))
+    return selected
+
+
+def new_engine(key, n_k):
+    """
+new_engine(key, n_k) -> Engine
+
+new_engine returns an Engine of the selected backend for the
+Cipher Key (key), from schedule_cache if one was made recently.
+Hand it back with release_engine once done with it.
+n_k is the number of 32-bit words comprising the Cipher Key (key).
+  For this standard, n_k = 4, 6, or 8."""
+    name = get_backend()
+    return schedule_cache.acquire(schedule_tag(key, n_k, name),
+                                  lambda: BACKENDS[name](KeySchedule(key, n_k)))
+
+
+def release_engine(engine):
+    """
+release_engine(engine) -> None
+
+release_engine hands back an Engine returned by new_engine."""
+    schedule_cache.release(engine)
@@ -0,0 +1,242 @@
+from functools import lru_cache
+
+
+#
+# Bitsliced AES for many blocks at once.  A batch of n blocks is held
+# as one integer of 128 * n bits, byte i of the batch in bits 8i..8i+7.
+# SubBytes splits that integer into eight bit planes and evaluates the
+# S-box as the 113-gate Boolean circuit of Boyar and Peralta on all
+# 16 * n bytes at once; ShiftRows, MixColumns and AddRoundKey are
+# shifts, masks and xors on the whole integer.  No table is indexed
+# with data, so the timing does not depend on the data or the key.
+#
+LANES = 256
+
+
+@lru_cache(maxsize=8)
+def lane_masks(n):
+    """
+lane_masks(n) -> tuple
+
+lane_masks returns the masks used by the round functions for a
+batch of n blocks: the low bit of every byte, the low seven bits
+of every byte, the ShiftRows byte groups with their shifts, and
+the MixColumns rotation masks."""
+    def repeat(pattern):
+        return int.from_bytes(bytes(pattern) * n, 'little')
+    bit0 = repeat([0x01] * 16)
+    low7 = repeat([0x7f] * 16)
+    shifts = {}
+    for c in range(4):
+        for r in range(4):
+            i = r + 4 * c
+            shifts.setdefault(8 * (r + 4 * ((c + r) % 4) - i), [0] * 16)[i] = 0xff
+    shift_rows = tuple((d, repeat(pattern)) for d, pattern in shifts.items())
+    rot1_low = repeat([0xff, 0xff, 0xff, 0x00] * 4)
+    rot1_high = repeat([0x00, 0x00, 0x00, 0xff] * 4)
+    rot2_low = repeat([0xff, 0xff, 0x00, 0x00] * 4)
+    rot2_high = repeat([0x00, 0x00, 0xff, 0xff] * 4)
+    return bit0, low7, shift_rows, rot1_low, rot1_high, rot2_low, rot2_high
+
+
+def sub_bytes(x, one):
+    """
+sub_bytes(x, one) -> int
+
+sub_bytes applies the S-box to every byte of x.  one is the
+mask with the low bit of every byte set."""
+    x0 = (x >> 7) & one
+    x1 = (x >> 6) & one
+    x2 = (x >> 5) & one
+    x3 = (x >> 4) & one
+    x4 = (x >> 3) & one
+    x5 = (x >> 2) & one
+    x6 = (x >> 1) & one
+    x7 = x & one
+
+    # Top linear transformation
+    y14 = x3 ^ x5
+    y13 = x0 ^ x6
+    y9 = x0 ^ x3
+    y8 = x0 ^ x5
+    t0 = x1 ^ x2
+    y1 = t0 ^ x7
+    y4 = y1 ^ x3
+    y12 = y13 ^ y14
+    y2 = y1 ^ x0
+    y5 = y1 ^ x6
+    y3 = y5 ^ y8
+    t1 = x4 ^ y12
+    y15 = t1 ^ x5
+    y20 = t1 ^ x1
+    y6 = y15 ^ x7
+    y10 = y15 ^ t0
+    y11 = y20 ^ y9
+    y7 = x7 ^ y11
+    y17 = y10 ^ y11
+    y19 = y10 ^ y8
+    y16 = t0 ^ y11
+    y21 = y13 ^ y16
+    y18 = x0 ^ y16
+
+    # Non-linear section
+    t2 = y12 & y15
+    t3 = y3 & y6
+    t4 = t3 ^ t2
+    t5 = y4 & x7
+    t6 = t5 ^ t2
+    t7 = y13 & y16
+    t8 = y5 & y1
+    t9 = t8 ^ t7
+    t10 = y2 & y7
+    t11 = t10 ^ t7
+    t12 = y9 & y11
+    t13 = y14 & y17
+    t14 = t13 ^ t12
+    t15 = y8 & y10
+    t16 = t15 ^ t12
+    t17 = t4 ^ t14
+    t18 = t6 ^ t16
+    t19 = t9 ^ t14
+    t20 = t11 ^ t16
+    t21 = t17 ^ y20
+    t22 = t18 ^ y19
+    t23 = t19 ^ y21
+    t24 = t20 ^ y18
+    t25 = t21 ^ t22
+    t26 = t21 & t23
+    t27 = t24 ^ t26
+    t28 = t25 & t27
+    t29 = t28 ^ t22
+    t30 = t23 ^ t24
+    t31 = t22 ^ t26
+    t32 = t31 & t30
+    t33 = t32 ^ t24
+    t34 = t23 ^ t33
+    t35 = t27 ^ t33
+    t36 = t24 & t35
+    t37 = t36 ^ t34
+    t38 = t27 ^ t36
+    t39 = t29 & t38
+    t40 = t25 ^ t39
+    t41 = t40 ^ t37
+    t42 = t29 ^ t33
+    t43 = t29 ^ t40
+    t44 = t33 ^ t37
+    t45 = t42 ^ t41
+    z0 = t44 & y15
+    z1 = t37 & y6
+    z2 = t33 & x7
+    z3 = t43 & y16
+    z4 = t40 & y1
+    z5 = t29 & y7
+    z6 = t42 & y11
+    z7 = t45 & y17
+    z8 = t41 & y10
+    z9 = t44 & y12
+    z10 = t37 & y3
+    z11 = t33 & y4
+    z12 = t43 & y13
+    z13 = t40 & y5
+    z14 = t29 & y2
+    z15 = t42 & y9
+    z16 = t45 & y14
+    z17 = t41 & y8
+
+    # Bottom linear transformation
+    t46 = z15 ^ z16
+    t47 = z10 ^ z11
+    t48 = z5 ^ z13
+    t49 = z9 ^ z10
+    t50 = z2 ^ z12
+    t51 = z2 ^ z5
+    t52 = z7 ^ z8
+    t53 = z0 ^ z3
+    t54 = z6 ^ z7
+    t55 = z16 ^ z17
+    t56 = z12 ^ t48
+    t57 = t50 ^ t53
+    t58 = z4 ^ t46
+    t59 = z3 ^ t54
+    t60 = t46 ^ t57
+    t61 = z14 ^ t57
+    t62 = t52 ^ t58
+    t63 = t49 ^ t58
+    t64 = z4 ^ t59
+    t65 = t61 ^ t62
+    t66 = z1 ^ t63
+    s0 = t59 ^ t63
+    s6 = t56 ^ t62 ^ one
+    s7 = t48 ^ t60 ^ one
+    t67 = t64 ^ t65
+    s3 = t53 ^ t66
+    s4 = t51 ^ t66
+    s5 = t47 ^ t65
+    s1 = t64 ^ s3 ^ one
+    s2 = t55 ^ t67 ^ one
+    return (s0 << 7) | (s1 << 6) | (s2 << 5) | (s3 << 4) | (s4 << 3) | (s5 << 2) | (s6 << 1) | s7
+
+
+def shift_rows(x, groups):
+    """
+shift_rows(x, groups) -> int
+
+shift_rows applies ShiftRows to every block of x.  groups lists
+the bit shift and mask of each group of bytes that move together."""
+    out = 0
+    for d, mask in groups:
+        if d >= 0:
+            out |= (x >> d) & mask
+        else:
+            out |= (x << -d) & mask
+    return out
+
+
+def mix_columns(x, one, low7, rot1_low, rot1_high, rot2_low, rot2_high):
+    """
+mix_columns(x, one, low7, rot1_low, rot1_high, rot2_low, rot2_high) -> int
+
+mix_columns applies MixColumns to every block of x, computing
+02*a for all bytes at once with a shift and a conditional
+reduction by 0x1b."""
+    r1 = ((x >> 8) & rot1_low) | ((x << 24) & rot1_high)
+    r2 = ((x >> 16) & rot2_low) | ((x << 16) & rot2_high)
+    r3 = ((r2 >> 8) & rot1_low) | ((r2 << 24) & rot1_high)
+    y = x ^ r1
+    y = ((y & low7) << 1) ^ (((y >> 7) & one) * 0x1b)
+    return y ^ r1 ^ r2 ^ r3
+
+
+def cipher_batch(data, keys, n_k):
+    """
+cipher_batch(data, keys, n_k) -> bytes
+
+cipher_batch encrypts len(data) // 16 blocks of data with the
+expanded Cipher Key (keys) in a single bitsliced pass.
+n_k is the number of 32-bit words comprising the Cipher Key.
+  For this standard, n_k = 4, 6, or 8."""
+    n = len(data) // 16
+    n_r = n_k + 6
+    one, low7, groups, rot1_low, rot1_high, rot2_low, rot2_high = lane_masks(n)
+    round_keys = [int.from_bytes(b''.join(keys[4 * i:4 * i + 4]) * n, 'little') for i in range(n_r + 1)]
+    x = int.from_bytes(data[0:16 * n], 'little') ^ round_keys[0]
+    for i in range(1, n_r):
+        x = shift_rows(sub_bytes(x, one), groups)
+        x = mix_columns(x, one, low7, rot1_low, rot1_high, rot2_low, rot2_high) ^ round_keys[i]
+    x = shift_rows(sub_bytes(x, one), groups) ^ round_keys[n_r]
+    return x.to_bytes(16 * n, 'little')
+
+
+def cipher_blocks(data, keys, n_k, lanes=LANES):
+    """
+cipher_blocks(data, keys, n_k, lanes=LANES) -> bytes
+
+cipher_blocks encrypts every 16-byte block of data (whose length
+must be a multiple of 16) with the expanded Cipher Key (keys),
+lanes blocks per bitsliced pass.
+n_k is the number of 32-bit words comprising the Cipher Key.
+  For this standard, n_k = 4, 6, or 8."""
+    if len(data) % 16 != 0:
+        raise Exception("data must be a whole number of blocks")
+    step = 16 * lanes
+    return b''.join(cipher_batch(data[i:i + step], keys, n_k) for i in range(0, len(data), step))
@@ -0,0 +1,115 @@
+from collections import OrderedDict
+from threading import Lock
+
+
+#
+# Memoization of ECB blocks.  ECB is deterministic for a given Cipher
+# Key, so data that repeats the same 16-byte blocks (fixed-width
+# records, long runs of zeros) can skip the cipher for every block it
+# has seen before.
+#
+# Caveat: a BlockCache holds plaintext blocks next to their ciphertext
+# blocks, in memory, for as long as they stay cached, which may be long
+# after the files they came from are closed: anything able to read the
+# process's memory learns them.  A hit is also much faster than a
+# miss, so the time taken tells an observer which blocks repeat ones
+# processed earlier, across files and in both directions; ECB
+# ciphertext already shows repeats within one file, but not this.
+# Use a BlockCache only where both are acceptable; it is off unless
+# one is passed in.
+#
+DEFAULT_BLOCK_CACHE_BUDGET = 1 << 24
+
+# Estimated memory of one cached block in each direction: the two
+# 16-byte bytes objects, the key tuple and the OrderedDict entry
+ENTRY_BYTES = 256
+
+
+class BlockCache:
+    """
+BlockCache(budget=DEFAULT_BLOCK_CACHE_BUDGET) -> BlockCache
+
+A BlockCache is a thread-safe, least-recently-used cache of
+plaintext to ciphertext and ciphertext to plaintext blocks, taking
+about budget bytes of memory at most.  Entries are kept apart per
+Cipher Key by the tag of schedule_tag.  Each block transformed
+through transform is cached in both directions.
+hits and misses count the blocks looked up."""
+
+    def __init__(self, budget=DEFAULT_BLOCK_CACHE_BUDGET):
+        self.entries = OrderedDict()
+        self.lock = Lock()
+        self.maxsize = budget // ENTRY_BYTES
+        self.hits = 0
+        self.misses = 0
+
+    def transform(self, tag, data, inverse, blocks):
+        """
+transform(tag, data, inverse, blocks) -> bytes
+
+transform encrypts, or with inverse decrypts, every 16-byte block
+of data under the Cipher Key of tag.  Blocks found in the cache
+are taken from it; the others are transformed by a single call of
+blocks, each distinct block once, and cached."""
+        entries = self.entries
+        out = []
+        missing = {}
+        with self.lock:
+            for i in range(0, len(data), 16):
+                block = data[i:i + 16]
+                k = (tag, inverse, block)
+                result = entries.get(k)
+                if result is None:
+                    missing.setdefault(block, []).append(len(out))
+                else:
+                    entries.move_to_end(k)
+                out.append(result)
+            misses = sum([len(places) for places in missing.values()])
+            self.hits += len(out) - misses
+            self.misses += misses
+        if missing:
+            todo = list(missing)
+            results = blocks(b''.join(todo))
+            with self.lock:
+                for j in range(len(todo)):
+                    block, result = todo[j], results[16 * j:16 * j + 16]
+                    entries[(tag, inverse, block)] = result
+                    entries[(tag, not inverse, result)] = block
+                    for i in missing[block]:
+                        out[i] = result
+                while len(entries) > self.maxsize:
+                    entries.popitem(last=False)
+        return b''.join(out)
+
+    def resize(self, budget):
+        """
+resize(budget) -> None
+
+resize changes the memory budget, evicting the least recently used
+blocks if the cache now holds too many."""
+        with self.lock:
+            self.maxsize = budget // ENTRY_BYTES
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        """
+clear() -> None
+
+clear drops every cached block and resets the hit and miss counters."""
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+stats() -> dict
+
+stats returns the hits, misses, hit rate, current size and maxsize
+(in cached blocks) of the cache."""
+        with self.lock:
+            looked_up = self.hits + self.misses
+            return {'hits': self.hits, 'misses': self.misses,
+                    'hit_rate': self.hits / looked_up if looked_up else 0.0,
+                    'size': len(self.entries), 'maxsize': self.maxsize}
@@ -0,0 +1,103 @@
+from AESHelp import wide_numpy
+
+
+#
+# Counter blocks for the Counter mode (NIST SP 800-38A section 6.5 and
+# appendix B).  A counter block is a fixed nonce followed by a counter
+# field of m bits; the standard incrementing function adds one to the
+# counter field modulo 2^m and leaves the nonce alone.  The counter
+# blocks of a message must all be distinct, so at most 2^m of them can
+# be taken from one starting block.
+#
+COUNTER_128 = 128    # the whole block is the counter
+COUNTER_64 = 64      # 64-bit nonce, 64-bit counter
+COUNTER_32 = 32      # 96-bit nonce, 32-bit counter (RFC 3686, GCM)
+LAYOUTS = {'128': COUNTER_128, '64/64': COUNTER_64, '96/32': COUNTER_32}
+
+WORD64 = (1 << 64) - 1
+
+
+class CounterBlock:
+    """
+CounterBlock(initial, counter_bits=COUNTER_128) -> CounterBlock
+
+A CounterBlock produces the counter blocks T1, T2, ... of SP 800-38A
+starting from the 16-byte block initial, whose low counter_bits bits
+are the counter field.  The counter is kept as an integer; next_block
+returns one counter block and blocks returns the next n of them as
+one contiguous byte string.  Asking for more than 2^counter_bits
+blocks in all raises an Exception, since the counter field would
+then repeat a value."""
+    __slots__ = ('nonce', 'counter', 'counter_bits', 'remaining')
+
+    def __init__(self, initial, counter_bits=COUNTER_128):
+        if len(initial) != 16:
+            raise Exception("The initial counter block must be 16 bytes long")
+        if counter_bits not in LAYOUTS.values():
+            raise Exception("Unsupported counter field of %d bits" % counter_bits)
+        value = int.from_bytes(initial, 'big')
+        self.counter_bits = counter_bits
+        self.counter = value & ((1 << counter_bits) - 1)
+        self.nonce = value ^ self.counter
+        self.remaining = 1 << counter_bits
+
+    @classmethod
+    def from_nonce(cls, nonce, counter=0):
+        """
+from_nonce(nonce, counter=0) -> CounterBlock
+
+from_nonce returns a CounterBlock whose blocks are the byte string
+nonce followed by a counter field starting at counter; the counter
+field takes up the 128 - 8 * len(nonce) bits that nonce leaves."""
+        counter_bits = 128 - 8 * len(nonce)
+        if counter < 0 or counter >> counter_bits:
+            raise Exception("Counter does not fit in %d bits" % counter_bits)
+        return cls(nonce + counter.to_bytes(counter_bits // 8, 'big'), counter_bits)
+
+    def take(self, n):
+        # Reserves n blocks and returns the counter field of the first
+        if n > self.remaining:
+            raise Exception("Counter overflow: only %d counter blocks are left" % self.remaining)
+        self.remaining -= n
+        counter = self.counter
+        self.counter = (counter + n) & ((1 << self.counter_bits) - 1)
+        return counter
+
+    def skip(self, n):
+        """
+skip(n) -> None
+
+skip moves past the next n counter blocks without producing them,
+as for a message whose first 16 * n bytes are handled elsewhere."""
+        self.take(n)
+
+    def next_block(self):
+        """
+next_block() -> bytes
+
+next_block returns the next counter block."""
+        return (self.nonce | self.take(1)).to_bytes(16, 'big')
+
+    def blocks(self, n):
+        """
+blocks(n) -> bytes
+
+blocks returns the next n counter blocks, 16 * n bytes in all.
+When wide_numpy allows NumPy the blocks are filled in as two
+columns of 64-bit words, if the counter does not carry out of the
+low word."""
+        if n == 0:
+            return b''
+        counter = self.take(n)
+        nonce = self.nonce
+        modulus = 1 << self.counter_bits
+        if counter + n <= modulus:
+            low = (nonce | counter) & WORD64
+            numpy = wide_numpy(16 * n)
+            if numpy is not None and low + n <= WORD64 + 1:
+                out = numpy.empty((n, 2), dtype='>u8')
+                out[:, 0] = (nonce | counter) >> 64
+                out[:, 1] = numpy.arange(n, dtype=numpy.uint64) + numpy.uint64(low)
+                return out.tobytes()
+            return b''.join([(nonce | c).to_bytes(16, 'big') for c in range(counter, counter + n)])
+        return b''.join([(nonce | ((counter + i) % modulus)).to_bytes(16, 'big') for i in range(n)])
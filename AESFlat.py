@@ -0,0 +1,92 @@
+from AES import KeyExpansion, KeyExpansionEIC
+from AESTables import sbox, sboxInv, mul2, mul3, mul9, mul11, mul13, mul14
+
+
+#
+# Flat-buffer AES: the state is a preallocated 16-byte bytearray in
+# the column-major byte order of FIPS 197 section 3.4 (byte r + 4c
+# holds row r of column c), and the Round Keys are stored back to
+# back in a single bytes object.  Blocks are transformed in place,
+# so no lists or byte strings are allocated per block.
+#
+class FlatCipher:
+    """
+FlatCipher(key, n_k) -> FlatCipher
+
+FlatCipher holds the Round Keys of the Cipher Key (key) and
+the state buffers used to encrypt and decrypt blocks in place.
+n_k is the number of 32-bit words comprising the Cipher Key (key).
+  For this standard, n_k = 4, 6, or 8.
+A FlatCipher must not be shared between threads."""
+
+    def __init__(self, key, n_k):
+        self.n_k = n_k
+        self.n_r = n_k + 6
+        self.round_keys = b''.join(KeyExpansion(key, n_k))
+        dw = KeyExpansionEIC(key, n_k)
+        self.inv_round_keys = b''.join(b''.join(dw[i * 4:(i + 1) * 4]) for i in range(self.n_r, -1, -1))
+        self.state = bytearray(16)
+        self.scratch = bytearray(16)
+
+    def cipher_into(self, src, dst, offset=0):
+        """
+cipher_into(src, dst, offset=0) -> None
+
+cipher_into encrypts the 16 bytes of src starting at offset
+and writes the ciphertext to the same 16 bytes of dst.  src and
+dst may be the same buffer."""
+        s = self.state
+        t = self.scratch
+        rk = self.round_keys
+        for i in range(16):
+            s[i] = src[offset + i] ^ rk[i]
+        k = 16
+        for _ in range(1, self.n_r):
+            for c in (0, 4, 8, 12):
+                a0 = sbox[s[c]]
+                a1 = sbox[s[(c + 5) & 15]]
+                a2 = sbox[s[(c + 10) & 15]]
+                a3 = sbox[s[(c + 15) & 15]]
+                t[c] = mul2[a0] ^ mul3[a1] ^ a2 ^ a3 ^ rk[k + c]
+                t[c + 1] = a0 ^ mul2[a1] ^ mul3[a2] ^ a3 ^ rk[k + c + 1]
+                t[c + 2] = a0 ^ a1 ^ mul2[a2] ^ mul3[a3] ^ rk[k + c + 2]
+                t[c + 3] = mul3[a0] ^ a1 ^ a2 ^ mul2[a3] ^ rk[k + c + 3]
+            s, t = t, s
+            k += 16
+        for c in (0, 4, 8, 12):
+            dst[offset + c] = sbox[s[c]] ^ rk[k + c]
+            dst[offset + c + 1] = sbox[s[(c + 5) & 15]] ^ rk[k + c + 1]
+            dst[offset + c + 2] = sbox[s[(c + 10) & 15]] ^ rk[k + c + 2]
+            dst[offset + c + 3] = sbox[s[(c + 15) & 15]] ^ rk[k + c + 3]
+
+    def inv_cipher_into(self, src, dst, offset=0):
+        """
+inv_cipher_into(src, dst, offset=0) -> None
+
+inv_cipher_into decrypts the 16 bytes of src starting at offset
+and writes the plaintext to the same 16 bytes of dst.  It runs
+the equivalent inverse cipher of FIPS 197 section 5.3.5.  src and
+dst may be the same buffer."""
+        s = self.state
+        t = self.scratch
+        rk = self.inv_round_keys
+        for i in range(16):
+            s[i] = src[offset + i] ^ rk[i]
+        k = 16
+        for _ in range(1, self.n_r):
+            for c in (0, 4, 8, 12):
+                a0 = sboxInv[s[c]]
+                a1 = sboxInv[s[(c + 13) & 15]]
+                a2 = sboxInv[s[(c + 10) & 15]]
+                a3 = sboxInv[s[(c + 7) & 15]]
+                t[c] = mul14[a0] ^ mul11[a1] ^ mul13[a2] ^ mul9[a3] ^ rk[k + c]
+                t[c + 1] = mul9[a0] ^ mul14[a1] ^ mul11[a2] ^ mul13[a3] ^ rk[k + c + 1]
+                t[c + 2] = mul13[a0] ^ mul9[a1] ^ mul14[a2] ^ mul11[a3] ^ rk[k + c + 2]
+                t[c + 3] = mul11[a0] ^ mul13[a1] ^ mul9[a2] ^ mul14[a3] ^ rk[k + c + 3]
+            s, t = t, s
+            k += 16
+        for c in (0, 4, 8, 12):
+            dst[offset + c] = sboxInv[s[c]] ^ rk[k + c]
+            dst[offset + c + 1] = sboxInv[s[(c + 13) & 15]] ^ rk[k + c + 1]
+            dst[offset + c + 2] = sboxInv[s[(c + 10) & 15]] ^ rk[k + c + 2]
+            dst[offset + c + 3] = sboxInv[s[(c + 7) & 15]] ^ rk[k + c + 3]
@@ -0,0 +1,113 @@
+#
+# GHASH, the universal hash function of the Galois/Counter Mode
+# (NIST Special Publication 800-38D section 6.4).  A block is an
+# element of GF(2^128) whose bit 0 (the most significant bit of its
+# first byte) is the coefficient of x^0, so as a big-endian integer
+# multiplying by x is a shift right by one, reduced by R = 0xe1 || 0^120
+# when a bit falls off the end.
+#
+# gf128_mult is the bit-at-a-time multiplication of Algorithm 1.
+# GHashTable multiplies by a fixed H with Shoup's method: a table of
+# H times every 4-bit or 8-bit polynomial, so that X * H is worked out
+# one nibble or byte of X at a time by Horner's rule, together with a
+# table that reduces the bits shifted out at each step.  The first
+# table depends on H and so on the key; the second does not.
+#
+R = 0xe1 << 120
+GHASH_TABLE_BITS = 8
+
+
+def gf128_mult(x, y):
+    """
+gf128_mult(x, y) -> number
+
+gf128_mult returns the product of the blocks x and y, given as
+integers, in GF(2^128) (Algorithm 1 of NIST SP 800-38D)."""
+    z = 0
+    v = y
+    for i in range(127, -1, -1):
+        if (x >> i) & 1:
+            z ^= v
+        v = (v >> 1) ^ R if v & 1 else v >> 1
+    return z
+
+
+def mult_x(v, n):
+    # v * x^n, one shift at a time
+    for i in range(n):
+        v = (v >> 1) ^ R if v & 1 else v >> 1
+    return v
+
+
+def reduction_table(bits):
+    # The reduction of each value of the low bits shifted out of Z when
+    # computing Z * x^bits as (Z >> bits) ^ table[Z & (2^bits - 1)]
+    return [mult_x(v, bits) for v in range(1 << bits)]
+
+
+REDUCTION = {4: reduction_table(4), 8: reduction_table(8)}
+
+
+class GHashTable:
+    """
+GHashTable(h, table_bits=GHASH_TABLE_BITS) -> GHashTable
+
+A GHashTable holds the Shoup table of the hash subkey h (an
+integer) for table_bits of 4 or 8: 16 or 256 multiples of h, in
+2 or 32 kilobytes of integers.  The 8-bit table takes half as many
+steps per block.  update hashes blocks with it; wipe drops it."""
+    __slots__ = ('table_bits', 'm', 'r')
+
+    def __init__(self, h, table_bits=GHASH_TABLE_BITS):
+        if table_bits not in REDUCTION:
+            raise Exception("Unsupported GHASH table of %d bits" % table_bits)
+        self.table_bits = table_bits
+        self.r = REDUCTION[table_bits]
+        # Entry n is p(n) * h, p(n) being the polynomial whose
+        # coefficients of x^0 .. x^(table_bits - 1) are the bits of n,
+        # most significant first; it is linear in n
+        m = [0] * (1 << table_bits)
+        v = h
+        for i in range(table_bits - 1, -1, -1):
+            m[1 << i] = v
+            v = mult_x(v, 1)
+        for n in range(1, 1 << table_bits):
+            low = n & -n
+            if n != low:
+                m[n] = m[low] ^ m[n ^ low]
+        self.m = m
+
+    def update(self, y, data):
+        """
+update(y, data) -> number
+
+update returns the GHASH state after hashing the whole blocks of
+data into the state y: y = (y xor X_i) * H for each block X_i.
+The length of data must be a multiple of 16."""
+        m, r = self.m, self.r
+        if self.table_bits == 8:
+            for k in range(0, len(data), 16):
+                x = (y ^ int.from_bytes(data[k:k + 16], 'big')).to_bytes(16, 'big')
+                z = m[x[15]]
+                for c in x[14::-1]:
+                    z = (z >> 8) ^ r[z & 0xff] ^ m[c]
+                y = z
+        else:
+            for k in range(0, len(data), 16):
+                x = (y ^ int.from_bytes(data[k:k + 16], 'big')).to_bytes(16, 'big')
+                z = m[x[15] & 0xf]
+                z = (z >> 4) ^ r[z & 0xf] ^ m[x[15] >> 4]
+                for c in x[14::-1]:
+                    z = (z >> 4) ^ r[z & 0xf] ^ m[c & 0xf]
+                    z = (z >> 4) ^ r[z & 0xf] ^ m[c >> 4]
+                y = z
+        return y
+
+    def wipe(self):
+        """
+wipe() -> None
+
+wipe overwrites the multiples of the hash subkey with zeros."""
+        if self.m is not None:
+            self.m[:] = [0] * len(self.m)
+        self.m = None
@@ -1,6 +1,50 @@
-from AES import KeyExpansion
+from sys import modules
 from AESTables import ltable, a_table
 
+# Number of bytes the mode functions read and process at a time
+CHUNK_SIZE = 65536
+
+# Shortest buffers that xor_bytes and xor_into hand to NumPy
+NUMPY_XOR_MIN = 1024
+
+# Bytes processed without NumPy before wide_numpy imports it: about
+# as long as the import itself takes, so short-lived processes
+# working on small files never pay for it
+NUMPY_IMPORT_AFTER = 1 << 24
+numpy_deferred = 0
+
+
+def optional_numpy():
+    """
+optional_numpy() -> module
+
+optional_numpy imports and returns NumPy, or returns None if it is
+not installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def wide_numpy(length):
+    """
+wide_numpy(length) -> module
+
+wide_numpy returns NumPy if it should be used for a buffer of length
+bytes, or None.  NumPy is used for buffers of NUMPY_XOR_MIN bytes or
+more once it has been imported, and imported once callers have
+asked about NUMPY_IMPORT_AFTER bytes without it."""
+    global numpy_deferred
+    if length < NUMPY_XOR_MIN:
+        return None
+    numpy = modules.get('numpy')
+    if numpy is None:
+        numpy_deferred += length
+        if numpy_deferred >= NUMPY_IMPORT_AFTER:
+            numpy = optional_numpy()
+    return numpy
+
 
 def in_to_state(bytestring, n_b=4):
     """
@@ -97,6 +141,61 @@ xor performs the exclusive-or operation on two byte strings."""
     return z
 
 
+def xor_bytes(byte_string1, byte_string2):
+    """
+xor_bytes(byte_string1, byte_string2) -> bytes
+
+xor_bytes performs the exclusive-or operation on two byte strings
+of the same, arbitrary length in a single step: with NumPy if
+wide_numpy allows it, otherwise on the strings converted to
+integers."""
+    length = len(byte_string1)
+    if length != len(byte_string2):
+        raise Exception("Byte strings are of different lengths")
+    numpy = wide_numpy(length)
+    if numpy is not None:
+        return numpy.bitwise_xor(numpy.frombuffer(byte_string1, dtype=numpy.uint8),
+                                 numpy.frombuffer(byte_string2, dtype=numpy.uint8)).tobytes()
+    return (int.from_bytes(byte_string1, 'little') ^ int.from_bytes(byte_string2, 'little')).to_bytes(length, 'little')
+
+
+def xor_into(dst, src):
+    """
+xor_into(dst, src) -> None
+
+xor_into xors the byte string src into the writable buffer dst
+(a bytearray or a memoryview of one) in place."""
+    length = len(dst)
+    if length != len(src):
+        raise Exception("Byte strings are of different lengths")
+    numpy = wide_numpy(length)
+    if numpy is not None:
+        out = numpy.frombuffer(dst, dtype=numpy.uint8)
+        out ^= numpy.frombuffer(src, dtype=numpy.uint8)
+    else:
+        dst[:] = (int.from_bytes(dst, 'little') ^ int.from_bytes(src, 'little')).to_bytes(length, 'little')
+
+
+def read_chunk(f_in, size=CHUNK_SIZE):
+    """
+read_chunk(f_in, size=CHUNK_SIZE) -> bytes
+
+read_chunk reads size bytes from f_in, or fewer only at the end of
+the file, so that every chunk but the last is whole blocks."""
+    chunk = f_in.read(size)
+    if len(chunk) == size or chunk == b'':
+        return chunk
+    pieces = [chunk]
+    size -= len(chunk)
+    while size > 0:
+        chunk = f_in.read(size)
+        if chunk == b'':
+            break
+        pieces.append(chunk)
+        size -= len(chunk)
+    return b''.join(pieces)
+
+
 def msb(s, os):
     """
 msb(s, os) -> os
@@ -127,30 +226,47 @@ def aes_file_helper(bits, in_name, out_name):
         f_out = open(out_name, 'wb')
     except OSError:
         raise
+    return f_in, f_out, key_words(bits)
+
+
+def key_words(bits):
+    """
+key_words(bits) -> number
+
+key_words returns n_k, the number of 32-bit words in a Cipher Key
+of the given number of bits."""
     if bits == 128:
-        n_k = 4
+        return 4
     elif bits == 192:
-        n_k = 6
+        return 6
     elif bits == 256:
-        n_k = 8
+        return 8
     else:
         raise Exception("%d-bit Encryption is not supported" % bits)
-    return f_in, f_out, n_k
 
 
 def aes_ctr_ofb_helper(bits, in_name, key, mode, out_name):
     from os import urandom
+    from AESBackend import new_engine, release_engine
     f_in, f_out, n_k = aes_file_helper(bits, in_name, out_name)
-    keys = KeyExpansion(key, n_k)
-    if mode == 'e':
-        ctr = urandom(16)
-        f_out.write(ctr)
-    elif mode == 'd':
-        ctr = f_in.read(16)
-    else:
-        raise Exception('Unsupported Mode')
-    m = f_in.read(16)
-    return ctr, f_in, f_out, keys, m, n_k
+    engine = None
+    try:
+        engine = new_engine(key, n_k)
+        if mode == 'e':
+            ctr = urandom(16)
+            f_out.write(ctr)
+        elif mode == 'd':
+            ctr = f_in.read(16)
+        else:
+            raise Exception('Unsupported Mode')
+        m = read_chunk(f_in)
+    except Exception:
+        if engine is not None:
+            release_engine(engine)
+        f_in.close()
+        f_out.close()
+        raise
+    return ctr, f_in, f_out, engine, m
 
 
 #
@@ -205,6 +321,75 @@ https://www.samiam.org/galois.html."""
     return s
 
 
+# Masks for SWAR arithmetic on a state packed into one integer (the
+# bytes of out_from_state, most significant first), by number of
+# columns n_b: low 7 bits and low bit of every byte, then rows 0-2
+# and row 3 of every column, then rows 0-1 and rows 2-3
+PACKED_MASKS = {}
+
+
+def packed_masks(n_b):
+    """
+packed_masks(n_b) -> tuple
+
+packed_masks returns the masks used by the packed-state functions
+for a state of n_b columns, computing them on the first call."""
+    masks = PACKED_MASKS.get(n_b)
+    if masks is None:
+        masks = tuple(int.from_bytes(pattern * n_b, 'big') for pattern in
+                      (b'\x7f' * 4, b'\x01' * 4, b'\xff\xff\xff\x00', b'\x00\x00\x00\xff',
+                       b'\xff\xff\x00\x00', b'\x00\x00\xff\xff'))
+        PACKED_MASKS[n_b] = masks
+    return masks
+
+
+def xtime_packed(x, n_b=4):
+    """
+xtime_packed(x, n_b=4) -> number
+
+xtime_packed multiplies all 4 * n_b bytes packed into the integer
+x by {02} in GF(2^8) at once: each byte is shifted left and the
+bytes whose high bit was set are reduced by 0x1b."""
+    low7, one = packed_masks(n_b)[0:2]
+    return ((x & low7) << 1) ^ (((x >> 7) & one) * 0x1b)
+
+
+def mix_packed(x, n_b=4):
+    """
+mix_packed(x, n_b=4) -> number
+
+mix_packed applies MixColumns to a packed state x of n_b columns.
+Row r of each column becomes 02*a[r] ^ 03*a[r+1] ^ a[r+2] ^ a[r+3],
+computed as xtime(a[r] ^ a[r+1]) ^ a[r+1] ^ a[r+2] ^ a[r+3] with
+the rows rotated inside each 32-bit column."""
+    low7, one, up_high, up_low, half_high, half_low = packed_masks(n_b)
+    r1 = ((x << 8) & up_high) | ((x >> 24) & up_low)
+    r2 = ((x << 16) & half_high) | ((x >> 16) & half_low)
+    r3 = ((r2 << 8) & up_high) | ((r2 >> 24) & up_low)
+    y = x ^ r1
+    return ((y & low7) << 1) ^ (((y >> 7) & one) * 0x1b) ^ r1 ^ r2 ^ r3
+
+
+def inv_mix_packed(x, n_b=4):
+    """
+inv_mix_packed(x, n_b=4) -> number
+
+inv_mix_packed applies InvMixColumns to a packed state x of n_b
+columns using the decomposition InvMixColumns = MixColumns *
+(04 + 05*y^2): rows r and r+2 of each column are first xored with
+xtime(xtime(a[r] ^ a[r+2])), then mixed as in mix_packed, both
+inlined so that the masks are looked up once."""
+    low7, one, up_high, up_low, half_high, half_low = packed_masks(n_b)
+    y = x ^ (((x << 16) & half_high) | ((x >> 16) & half_low))
+    y = ((y & low7) << 1) ^ (((y >> 7) & one) * 0x1b)
+    x ^= ((y & low7) << 1) ^ (((y >> 7) & one) * 0x1b)
+    r1 = ((x << 8) & up_high) | ((x >> 24) & up_low)
+    r2 = ((x << 16) & half_high) | ((x >> 16) & half_low)
+    r3 = ((r2 << 8) & up_high) | ((r2 >> 24) & up_low)
+    y = x ^ r1
+    return ((y & low7) << 1) ^ (((y >> 7) & one) * 0x1b) ^ r1 ^ r2 ^ r3
+
+
 def get_columns(state, n_b=4):
     """
 get_columns(state, n_b=4) -> column list
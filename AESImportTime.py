@@ -0,0 +1,48 @@
+import subprocess
+import sys
+from statistics import median
+
+
+#
+# Import-time benchmark.  Every measurement runs in a fresh
+# interpreter, as a short-lived command-line job would, and reports
+# the median of several runs.  Run it as a script:
+#   python AESImportTime.py [runs]
+#
+MODULES = ['AES', 'AES_ECB', 'AES_CBC', 'AES_CFB', 'AES_CTR', 'AES_OFB']
+
+TIMER = """
+import sys, time
+sys.path.insert(0, %r)
+t = time.perf_counter()
+import %s
+%s
+print(time.perf_counter() - t)
+"""
+
+FIRST_ENGINE = """
+from AESBackend import new_engine, release_engine
+release_engine(new_engine(0x2b7e151628aed2a6abf7158809cf4f3c, 4))
+"""
+
+
+def import_time(module, runs=15, first_engine=False):
+    """
+import_time(module, runs=15, first_engine=False) -> seconds
+
+import_time returns the median time a fresh interpreter takes to
+import module, and with first_engine to then also get its first
+Engine from AESBackend (which loads and self-tests the backend)."""
+    from os.path import abspath, dirname
+    script = TIMER % (dirname(abspath(__file__)), module, FIRST_ENGINE if first_engine else '')
+    return median(float(subprocess.run([sys.executable, '-c', script], check=True,
+                                       capture_output=True, text=True).stdout)
+                  for _ in range(runs))
+
+
+if __name__ == '__main__':
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    print('%-10s %12s %20s' % ('module', 'import (ms)', 'first engine (ms)'))
+    for name in MODULES:
+        print('%-10s %12.2f %20.2f' % (name, 1000 * import_time(name, runs),
+                                       1000 * import_time(name, runs, True)))
@@ -0,0 +1,200 @@
+from array import array
+from collections import OrderedDict
+from hashlib import sha256
+from sys import byteorder
+from threading import Lock
+from AES import KeyExpansion, KeyExpansionEIC
+
+
+#
+# Key schedules and the cache that lets the mode functions reuse them
+#
+class KeySchedule:
+    """
+KeySchedule(key, n_k) -> KeySchedule
+
+A KeySchedule holds the Cipher Key (key) and its Round Keys for
+the Cipher (enc) and, from the first call of decryption, for the
+equivalent inverse cipher (dec).  Each is one contiguous
+bytearray, so wipe can overwrite all of them, and a schedule
+takes a few hundred bytes rather than the few kilobytes of the
+word lists returned by KeyExpansion and KeyExpansionEIC.
+n_k is the number of 32-bit words comprising the Cipher Key (key).
+  For this standard, n_k = 4, 6, or 8."""
+    __slots__ = ('n_k', 'key', 'enc', 'dec')
+
+    def __init__(self, key, n_k):
+        self.n_k = n_k
+        self.key = bytearray(key.to_bytes(4 * n_k, 'big'))
+        self.enc = bytearray(b''.join(KeyExpansion(key, n_k)))
+        self.dec = None
+
+    def cipher_key(self):
+        """
+cipher_key() -> number
+
+cipher_key returns the Cipher Key as an integer."""
+        return int.from_bytes(self.key, 'big')
+
+    def decryption(self):
+        """
+decryption() -> bytearray
+
+decryption returns the Round Keys of KeyExpansionEIC, which are
+computed on the first call."""
+        if self.dec is None:
+            self.dec = bytearray(b''.join(KeyExpansionEIC(self.cipher_key(), self.n_k)))
+        return self.dec
+
+    @staticmethod
+    def words(buf):
+        """
+words(buf) -> key list
+
+words returns the Round Keys in buf as a list of 4-byte words in
+the form returned by KeyExpansion.  The words are views of buf, so
+wiping the schedule also wipes them."""
+        view = memoryview(buf)
+        return [view[i:i + 4] for i in range(0, len(buf), 4)]
+
+    @staticmethod
+    def word_array(buf, reverse=False):
+        """
+word_array(buf, reverse=False) -> array
+
+word_array returns the Round Keys in buf as an array('I') of
+32-bit big-endian words, the form used by AESTTable.  With reverse
+the Round Keys are listed last round first, the order in which
+AESTTable.InvCipher uses the Round Keys of KeyExpansionEIC."""
+        if reverse:
+            buf = b''.join(buf[i:i + 16] for i in range(len(buf) - 16, -16, -16))
+        words = array('I', buf)
+        if byteorder == 'little':
+            words.byteswap()
+        return words
+
+    def wipe(self):
+        """
+wipe() -> None
+
+wipe overwrites the Cipher Key and the Round Keys with zeros."""
+        for buf in (self.key, self.enc, self.dec):
+            if buf is not None:
+                buf[:] = bytes(len(buf))
+
+
+def schedule_tag(key, n_k, *extra):
+    """
+schedule_tag(key, n_k, *extra) -> tuple
+
+schedule_tag returns the cache tag of a Cipher Key: a SHA-256
+digest of the key, so that the cache index itself holds no key
+material, together with n_k and any extra values."""
+    return (sha256(key.to_bytes(4 * n_k, 'big')).digest(), n_k) + extra
+
+
+DEFAULT_CACHE_SIZE = 64
+
+
+class ScheduleCache:
+    """
+ScheduleCache(maxsize=DEFAULT_CACHE_SIZE) -> ScheduleCache
+
+A ScheduleCache is a thread-safe, least-recently-used cache of at
+most maxsize objects that each hold a key schedule and have a wipe
+method.  acquire returns an object for a tag, creating it on a
+miss; release hands it back.  An object that falls out of the
+cache is wiped as soon as no caller holds it any more.
+hits and misses count the outcomes of acquire."""
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.users = {}
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def acquire(self, tag, create):
+        """
+acquire(tag, create) -> object
+
+acquire returns the cached object for tag, calling create() to
+make it if there is none.  Every acquire must be matched by a
+release of the returned object."""
+        with self.lock:
+            obj = self.entries.get(tag)
+            if obj is not None:
+                self.entries.move_to_end(tag)
+                self.hits += 1
+                self.users[id(obj)][1] += 1
+                return obj
+            self.misses += 1
+        new = create()
+        with self.lock:
+            obj = self.entries.get(tag)
+            if obj is None:
+                obj = new
+                self.entries[tag] = obj
+                self.users[id(obj)] = [obj, 0, True]
+                self.evict()
+            else:
+                self.entries.move_to_end(tag)
+                new.wipe()
+            self.users[id(obj)][1] += 1
+            return obj
+
+    def release(self, obj):
+        """
+release(obj) -> None
+
+release hands back an object returned by acquire."""
+        with self.lock:
+            entry = self.users[id(obj)]
+            entry[1] -= 1
+            if entry[1] == 0 and not entry[2]:
+                del self.users[id(obj)]
+                obj.wipe()
+
+    def evict(self):
+        # Called with the lock held
+        while len(self.entries) > self.maxsize:
+            obj = self.entries.popitem(last=False)[1]
+            entry = self.users[id(obj)]
+            entry[2] = False
+            if entry[1] == 0:
+                del self.users[id(obj)]
+                obj.wipe()
+
+    def resize(self, maxsize):
+        """
+resize(maxsize) -> None
+
+resize changes the number of objects the cache may hold,
+evicting the least recently used ones if it now holds too many."""
+        with self.lock:
+            self.maxsize = maxsize
+            self.evict()
+
+    def clear(self):
+        """
+clear() -> None
+
+clear evicts every object and resets the hit and miss counters."""
+        with self.lock:
+            maxsize = self.maxsize
+            self.maxsize = 0
+            self.evict()
+            self.maxsize = maxsize
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+stats() -> dict
+
+stats returns the hits, misses, current size and maxsize of the
+cache."""
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'size': len(self.entries), 'maxsize': self.maxsize}
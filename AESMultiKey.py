@@ -0,0 +1,114 @@
+from AESTables import rcon
+from AESBackend import new_engine, release_engine
+from AESNumpy import numpy
+if numpy is not None:
+    from AESNumpy import SBOX, SBOX_INV, SHIFT_ROWS, INV_SHIFT_ROWS, MixColumns, InvMixColumns
+    RCON = numpy.frombuffer(rcon, dtype=numpy.uint8)
+
+
+#
+# AES under many Cipher Keys at once: block i of a batch is encrypted
+# or decrypted under key i.  Repeated keys are expanded only once.
+# With NumPy the key expansion runs across all distinct keys and the
+# rounds across all blocks in one pass, each block picking its Round
+# Keys by index; without it every distinct key gets an Engine of the
+# selected backend.
+#
+def KeyExpansion(keys, n_k):
+    """
+KeyExpansion(keys, n_k) -> array
+
+KeyExpansion expands the M Cipher Keys given as an (M, 4 * n_k)
+uint8 array all at once, returning their Round Keys as an
+(M, n_r + 1, 16) uint8 array.  It follows AES.KeyExpansion step for
+step, with each step applied to every key.
+n_k is the number of 32-bit words comprising each Cipher Key.
+  For this standard, n_k = 4, 6, or 8."""
+    n_r = n_k + 6
+    m = keys.shape[0]
+    w = numpy.zeros((m, 4 * (n_r + 1), 4), dtype=numpy.uint8)
+    w[:, 0:n_k] = keys.reshape(m, n_k, 4)
+    for i in range(n_k, 4 * (n_r + 1)):
+        temp = w[:, i - 1]
+        if i % n_k == 0:
+            temp = SBOX[temp[:, [1, 2, 3, 0]]]
+            temp[:, 0] ^= RCON[i // n_k]
+        elif n_k > 6 and i % n_k == 4:
+            temp = SBOX[temp]
+        w[:, i] = w[:, i - n_k] ^ temp
+    return w.reshape(m, n_r + 1, 16)
+
+
+def Cipher(blocks, w, index, n_k):
+    """
+Cipher(blocks, w, index, n_k) -> blocks
+
+Cipher encrypts every row of the (N, 16) uint8 array blocks, row i
+under the Round Keys w[index[i]] of KeyExpansion.
+n_k is the number of 32-bit words comprising each Cipher Key.
+  For this standard, n_k = 4, 6, or 8."""
+    n_r = n_k + 6
+    state = blocks ^ w[index, 0]
+    for i in range(1, n_r):
+        state = MixColumns(SBOX[state[:, SHIFT_ROWS]]) ^ w[index, i]
+    return SBOX[state[:, SHIFT_ROWS]] ^ w[index, n_r]
+
+
+def InvCipher(blocks, w, index, n_k):
+    """
+InvCipher(blocks, w, index, n_k) -> blocks
+
+InvCipher decrypts every row of the (N, 16) uint8 array blocks, row i
+under the Round Keys w[index[i]] of KeyExpansion.
+n_k is the number of 32-bit words comprising each Cipher Key.
+  For this standard, n_k = 4, 6, or 8."""
+    n_r = n_k + 6
+    state = blocks ^ w[index, n_r]
+    for i in range(n_r - 1, 0, -1):
+        state = InvMixColumns(SBOX_INV[state[:, INV_SHIFT_ROWS]] ^ w[index, i])
+    return SBOX_INV[state[:, INV_SHIFT_ROWS]] ^ w[index, 0]
+
+
+def multi_key_helper(keys, blocks, n_k, batch, single):
+    if len(keys) != len(blocks):
+        raise Exception("keys and blocks must be of the same length")
+    if len(keys) == 0:
+        return []
+    if numpy is None:
+        engines = {}
+        try:
+            for key in keys:
+                if key not in engines:
+                    engines[key] = new_engine(key, n_k)
+            return [bytes(single(engines[key], block)) for key, block in zip(keys, blocks)]
+        finally:
+            for engine in engines.values():
+                release_engine(engine)
+    key_bytes = numpy.frombuffer(b''.join(key.to_bytes(4 * n_k, 'big') for key in keys),
+                                 dtype=numpy.uint8).reshape(-1, 4 * n_k)
+    distinct, index = numpy.unique(key_bytes, axis=0, return_inverse=True)
+    data = numpy.frombuffer(b''.join(blocks), dtype=numpy.uint8).reshape(-1, 16)
+    out = batch(data, KeyExpansion(distinct, n_k), index.reshape(-1), n_k).tobytes()
+    return [out[i:i + 16] for i in range(0, len(out), 16)]
+
+
+def cipher_multi_key(keys, blocks, n_k):
+    """
+cipher_multi_key(keys, blocks, n_k) -> block list
+
+cipher_multi_key encrypts each 16-byte block of the list blocks
+under the Cipher Key at the same position of the list keys.
+n_k is the number of 32-bit words comprising each Cipher Key.
+  For this standard, n_k = 4, 6, or 8."""
+    return multi_key_helper(keys, blocks, n_k, Cipher, lambda engine, block: engine.cipher(block))
+
+
+def inv_cipher_multi_key(keys, blocks, n_k):
+    """
+inv_cipher_multi_key(keys, blocks, n_k) -> block list
+
+inv_cipher_multi_key decrypts each 16-byte block of the list blocks
+under the Cipher Key at the same position of the list keys.
+n_k is the number of 32-bit words comprising each Cipher Key.
+  For this standard, n_k = 4, 6, or 8."""
+    return multi_key_helper(keys, blocks, n_k, InvCipher, lambda engine, block: engine.inv_cipher(block))
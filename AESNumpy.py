@@ -0,0 +1,137 @@
+import AES
+from AESHelp import optional_numpy
+from AESTables import sbox, sboxInv, mul2, mul3, mul9, mul11, mul13, mul14
+numpy = optional_numpy()
+
+
+#
+# Vectorized AES for many blocks at once.  A batch is an (N, 16)
+# uint8 array whose rows are blocks in the byte order of FIPS 197
+# section 3.4; every round runs over all N rows with NumPy fancy
+# indexing into the S-boxes and GF(2^8) multiplication tables.
+# NumPy is optional: without it cipher_blocks and inv_cipher_blocks
+# fall back to AES.Cipher and AES.InvCipher.
+#
+CHUNK_BLOCKS = 65536
+
+# Source byte of each state byte after ShiftRows and InvShiftRows
+SHIFT_ROWS = [0, 5, 10, 15, 4, 9, 14, 3, 8, 13, 2, 7, 12, 1, 6, 11]
+INV_SHIFT_ROWS = [0, 13, 10, 7, 4, 1, 14, 11, 8, 5, 2, 15, 12, 9, 6, 3]
+
+if numpy is not None:
+    SBOX = numpy.frombuffer(sbox, dtype=numpy.uint8)
+    SBOX_INV = numpy.frombuffer(sboxInv, dtype=numpy.uint8)
+    MUL2 = numpy.frombuffer(mul2, dtype=numpy.uint8)
+    MUL3 = numpy.frombuffer(mul3, dtype=numpy.uint8)
+    MUL9 = numpy.frombuffer(mul9, dtype=numpy.uint8)
+    MUL11 = numpy.frombuffer(mul11, dtype=numpy.uint8)
+    MUL13 = numpy.frombuffer(mul13, dtype=numpy.uint8)
+    MUL14 = numpy.frombuffer(mul14, dtype=numpy.uint8)
+
+
+def round_keys(keys, n_k):
+    """
+round_keys(keys, n_k) -> array
+
+round_keys returns the expanded Cipher Key (keys) as an
+(n_r + 1, 16) uint8 array, one Round Key per row."""
+    return numpy.frombuffer(b''.join(keys), dtype=numpy.uint8).reshape(n_k + 7, 16)
+
+
+def MixColumns(blocks):
+    """
+MixColumns(blocks) -> blocks
+
+MixColumns mixes the columns of every block of an (N, 16)
+uint8 array with the mul2 and mul3 tables."""
+    s = blocks.reshape(-1, 4, 4)
+    a0, a1, a2, a3 = s[:, :, 0], s[:, :, 1], s[:, :, 2], s[:, :, 3]
+    out = numpy.empty_like(s)
+    out[:, :, 0] = MUL2[a0] ^ MUL3[a1] ^ a2 ^ a3
+    out[:, :, 1] = a0 ^ MUL2[a1] ^ MUL3[a2] ^ a3
+    out[:, :, 2] = a0 ^ a1 ^ MUL2[a2] ^ MUL3[a3]
+    out[:, :, 3] = MUL3[a0] ^ a1 ^ a2 ^ MUL2[a3]
+    return out.reshape(-1, 16)
+
+
+def InvMixColumns(blocks):
+    """
+InvMixColumns(blocks) -> blocks
+
+InvMixColumns unmixes the columns of every block of an (N, 16)
+uint8 array with the mul9, mul11, mul13 and mul14 tables."""
+    s = blocks.reshape(-1, 4, 4)
+    a0, a1, a2, a3 = s[:, :, 0], s[:, :, 1], s[:, :, 2], s[:, :, 3]
+    out = numpy.empty_like(s)
+    out[:, :, 0] = MUL14[a0] ^ MUL11[a1] ^ MUL13[a2] ^ MUL9[a3]
+    out[:, :, 1] = MUL9[a0] ^ MUL14[a1] ^ MUL11[a2] ^ MUL13[a3]
+    out[:, :, 2] = MUL13[a0] ^ MUL9[a1] ^ MUL14[a2] ^ MUL11[a3]
+    out[:, :, 3] = MUL11[a0] ^ MUL13[a1] ^ MUL9[a2] ^ MUL14[a3]
+    return out.reshape(-1, 16)
+
+
+def Cipher(blocks, keys, n_k):
+    """
+Cipher(blocks, keys, n_k) -> blocks
+
+Cipher encrypts every block of an (N, 16) uint8 array with the
+expanded Cipher Key (keys) of AES.KeyExpansion.
+n_k is the number of 32-bit words comprising the Cipher Key.
+  For this standard, n_k = 4, 6, or 8."""
+    n_r = n_k + 6
+    w = round_keys(keys, n_k)
+    state = blocks ^ w[0]
+    for i in range(1, n_r):
+        state = MixColumns(SBOX[state[:, SHIFT_ROWS]]) ^ w[i]
+    return SBOX[state[:, SHIFT_ROWS]] ^ w[n_r]
+
+
+def InvCipher(blocks, keys, n_k):
+    """
+InvCipher(blocks, keys, n_k) -> blocks
+
+InvCipher decrypts every block of an (N, 16) uint8 array with the
+expanded Cipher Key (keys) of AES.KeyExpansion.
+n_k is the number of 32-bit words comprising the Cipher Key.
+  For this standard, n_k = 4, 6, or 8."""
+    n_r = n_k + 6
+    w = round_keys(keys, n_k)
+    state = blocks ^ w[n_r]
+    for i in range(n_r - 1, 0, -1):
+        state = InvMixColumns(SBOX_INV[state[:, INV_SHIFT_ROWS]] ^ w[i])
+    return SBOX_INV[state[:, INV_SHIFT_ROWS]] ^ w[0]
+
+
+def blocks_helper(data, keys, n_k, batch, single):
+    if len(data) % 16 != 0:
+        raise Exception("data must be a whole number of blocks")
+    if numpy is None:
+        return b''.join(single(data[i:i + 16], keys, n_k) for i in range(0, len(data), 16))
+    step = 16 * CHUNK_BLOCKS
+    out = []
+    for i in range(0, len(data), step):
+        blocks = numpy.frombuffer(data[i:i + step], dtype=numpy.uint8).reshape(-1, 16)
+        out.append(batch(blocks, keys, n_k).tobytes())
+    return b''.join(out)
+
+
+def cipher_blocks(data, keys, n_k):
+    """
+cipher_blocks(data, keys, n_k) -> bytes
+
+cipher_blocks encrypts every 16-byte block of data (whose length
+must be a multiple of 16) with the expanded Cipher Key (keys), in
+vectorized batches of CHUNK_BLOCKS blocks when NumPy is installed
+and one AES.Cipher call per block when it is not."""
+    return blocks_helper(data, keys, n_k, Cipher, AES.Cipher)
+
+
+def inv_cipher_blocks(data, keys, n_k):
+    """
+inv_cipher_blocks(data, keys, n_k) -> bytes
+
+inv_cipher_blocks decrypts every 16-byte block of data (whose length
+must be a multiple of 16) with the expanded Cipher Key (keys), in
+vectorized batches of CHUNK_BLOCKS blocks when NumPy is installed
+and one AES.InvCipher call per block when it is not."""
+    return blocks_helper(data, keys, n_k, InvCipher, AES.InvCipher)
@@ -0,0 +1,247 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from AESBackend import new_engine, release_engine, get_backend, set_backend
+from AESCounter import CounterBlock
+from AESHelp import key_words
+from AES_ECB import encrypt_chunk_ecb, decrypt_chunk_ecb
+from AES_CTR import cipher_chunk_ctr
+from AES_CBC import decrypt_chunk_cbc
+from AES_CFB import decrypt_chunk_cfb, segment_bytes
+from AES_XTS import xts_chunk, xts_keys, xts_n_k
+
+
+#
+# Parallel file processing for the modes whose blocks can be
+# transformed independently: ECB, CTR, whose counter block for byte
+# offset k is the initial counter block advanced by k // 16, XTS,
+# whose sectors are independent, and the decryption of CBC and CFB,
+# where a chunk needs only the 16 bytes of ciphertext (or IV) before
+# it.
+# The input is split into chunks of PARALLEL_CHUNK bytes handed to a
+# pool of worker processes.  Each worker reads its chunk with
+# os.pread and writes the result at its place in the preallocated
+# output with os.pwrite, so no file data passes through the parent.
+# The output is byte-identical to that of the sequential functions.
+#
+PARALLEL_CHUNK = 1 << 22
+
+
+def read_at(fd, length, offset):
+    pieces = []
+    while length > 0:
+        piece = os.pread(fd, length, offset)
+        if piece == b'':
+            break
+        pieces.append(piece)
+        length -= len(piece)
+        offset += len(piece)
+    return b''.join(pieces)
+
+
+def write_at(fd, data, offset):
+    view = memoryview(data)
+    while len(view) > 0:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+
+def chunk_worker(backend, key, n_k, in_name, out_name, in_offset, length, out_offset, transform):
+    """
+chunk_worker(backend, key, n_k, in_name, out_name, in_offset, length, out_offset, transform) -> number
+
+chunk_worker runs in a worker process.  It reads length bytes of
+in_name from in_offset, passes them to transform together with an
+Engine of the backend for the Cipher Key (key), and writes the result
+to out_name at out_offset, returning the number of bytes written.
+The Engine comes from the worker's own schedule cache, so each
+worker expands the Cipher Key once for all of its chunks."""
+    if get_backend() != backend:
+        set_backend(backend)
+    engine = new_engine(key, n_k)
+    fd_in = os.open(in_name, os.O_RDONLY)
+    try:
+        fd_out = os.open(out_name, os.O_WRONLY)
+        try:
+            out = transform(engine, read_at(fd_in, length, in_offset))
+            write_at(fd_out, out, out_offset)
+        finally:
+            os.close(fd_out)
+    finally:
+        os.close(fd_in)
+        release_engine(engine)
+    return len(out)
+
+
+def ctr_chunk(engine, data, initial, counter_bits, blocks):
+    # CTR for a chunk that starts blocks counter blocks into the message
+    counter = CounterBlock(initial, counter_bits)
+    counter.skip(blocks)
+    return cipher_chunk_ctr(engine, counter, data)
+
+
+def cbc_chunk(engine, data, last):
+    # CBC decryption of data[16:], chained from data[0:16]
+    return decrypt_chunk_cbc(engine, data[0:16], data[16:], last)
+
+
+def cfb_chunk(engine, data, byte, last):
+    # CFB decryption of data[16:], whose input blocks start with data[0:16]
+    return decrypt_chunk_cfb(engine, data[0:16], data[16:], byte, last)
+
+
+def run_chunks(key, n_k, in_name, out_name, jobs, workers):
+    """
+run_chunks(key, n_k, in_name, out_name, jobs, workers) -> number list
+
+run_chunks runs chunk_worker for every (in_offset, length,
+out_offset, transform) of jobs on a pool of workers processes and
+returns the number of bytes each wrote."""
+    backend = get_backend()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(chunk_worker, backend, key, n_k, in_name, out_name, *job) for job in jobs]
+        return [future.result() for future in futures]
+
+
+def use_parallel(size, workers, chunk):
+    # Worth starting a pool only for files of more than one chunk
+    return workers is not None and workers > 1 and size > chunk and hasattr(os, 'pwrite')
+
+
+def ecb_parallel(key, bits, in_name, out_name, inverse, workers, chunk=PARALLEL_CHUNK):
+    """
+ecb_parallel(key, bits, in_name, out_name, inverse, workers, chunk=PARALLEL_CHUNK) -> bool
+
+ecb_parallel encrypts, or with inverse decrypts, the file in_name
+into out_name in ECB mode on workers processes, chunk bytes (a
+multiple of 16) per job.  It returns False without doing anything
+if the file is too small to split or os.pwrite is not available,
+leaving the work to the sequential function."""
+    n_k = key_words(bits)
+    size = os.path.getsize(in_name)
+    if not use_parallel(size, workers, chunk):
+        return False
+    with open(out_name, 'wb') as f_out:
+        f_out.truncate(size if inverse else (size + 15) // 16 * 16)
+    jobs = []
+    for offset in range(0, size, chunk):
+        if inverse:
+            transform = partial(decrypt_chunk_ecb, last=offset + chunk >= size)
+        else:
+            transform = encrypt_chunk_ecb
+        jobs.append((offset, min(chunk, size - offset), offset, transform))
+    written = run_chunks(key, n_k, in_name, out_name, jobs, workers)
+    if inverse:
+        os.truncate(out_name, sum(written))
+    return True
+
+
+def ctr_parallel(key, bits, mode, in_name, out_name, counter_bits, workers, chunk=PARALLEL_CHUNK):
+    """
+ctr_parallel(key, bits, mode, in_name, out_name, counter_bits, workers, chunk=PARALLEL_CHUNK) -> bool
+
+ctr_parallel encrypts (mode 'e') or decrypts (mode 'd') the file
+in_name into out_name in CTR mode on workers processes, chunk bytes
+(a multiple of 16) per job.  Like the sequential function it writes
+a random initial counter block ahead of the ciphertext when
+encrypting and reads it back when decrypting.  It returns False
+without doing anything if the file is too small to split or
+os.pwrite is not available."""
+    n_k = key_words(bits)
+    size = os.path.getsize(in_name)
+    if mode == 'e':
+        start = 0
+    elif mode == 'd':
+        start = 16
+    else:
+        raise Exception('Unsupported Mode')
+    if not use_parallel(size - start, workers, chunk):
+        return False
+    if mode == 'e':
+        initial = os.urandom(16)
+        header = initial
+    else:
+        with open(in_name, 'rb') as f_in:
+            initial = f_in.read(16)
+        header = b''
+    CounterBlock(initial, counter_bits).skip((size - start + 15) // 16)
+    with open(out_name, 'wb') as f_out:
+        f_out.write(header)
+        f_out.truncate(len(header) + size - start)
+    jobs = [(offset, min(chunk, size - offset), offset - start + len(header),
+             partial(ctr_chunk, initial=initial, counter_bits=counter_bits, blocks=(offset - start) // 16))
+            for offset in range(start, size, chunk)]
+    run_chunks(key, n_k, in_name, out_name, jobs, workers)
+    return True
+
+
+def chained_parallel(key, bits, in_name, out_name, workers, chunk, transform):
+    """
+chained_parallel(key, bits, in_name, out_name, workers, chunk, transform) -> bool
+
+chained_parallel decrypts the file in_name, a 16-byte IV followed by
+the ciphertext, into out_name on workers processes.  Each job gets
+chunk bytes of ciphertext together with the 16 bytes before them;
+transform(engine, data, last) decrypts them.  It returns False
+without doing anything if the file is too small to split or
+os.pwrite is not available."""
+    n_k = key_words(bits)
+    size = os.path.getsize(in_name)
+    if not use_parallel(size - 16, workers, chunk):
+        return False
+    with open(out_name, 'wb') as f_out:
+        f_out.truncate(size - 16)
+    jobs = [(offset - 16, min(chunk, size - offset) + 16, offset - 16,
+             partial(transform, last=offset + chunk >= size))
+            for offset in range(16, size, chunk)]
+    written = run_chunks(key, n_k, in_name, out_name, jobs, workers)
+    os.truncate(out_name, sum(written))
+    return True
+
+
+def cbc_decrypt_parallel(key, bits, in_name, out_name, workers, chunk=PARALLEL_CHUNK):
+    """
+cbc_decrypt_parallel(key, bits, in_name, out_name, workers, chunk=PARALLEL_CHUNK) -> bool
+
+cbc_decrypt_parallel decrypts the file in_name into out_name in
+CBC mode on workers processes, chunk bytes (a multiple of 16) per
+job; see chained_parallel."""
+    return chained_parallel(key, bits, in_name, out_name, workers, chunk, cbc_chunk)
+
+
+def cfb_decrypt_parallel(key, bits, s, in_name, out_name, workers, chunk=PARALLEL_CHUNK):
+    """
+cfb_decrypt_parallel(key, bits, s, in_name, out_name, workers, chunk=PARALLEL_CHUNK) -> bool
+
+cfb_decrypt_parallel decrypts the file in_name into out_name in
+s-bit CFB mode on workers processes, about chunk bytes per job
+(rounded down to whole segments); see chained_parallel."""
+    byte = segment_bytes(s)
+    return chained_parallel(key, bits, in_name, out_name, workers, chunk // byte * byte,
+                            partial(cfb_chunk, byte=byte))
+
+
+def xts_parallel(key, bits, inverse, in_name, out_name, sector_size, sector, workers, chunk=PARALLEL_CHUNK):
+    """
+xts_parallel(key, bits, inverse, in_name, out_name, sector_size, sector, workers, chunk=PARALLEL_CHUNK) -> bool
+
+xts_parallel encrypts, or with inverse decrypts, the file in_name
+into out_name in XTS mode on workers processes, about chunk bytes
+(rounded down to whole sectors) per job, the first sector being
+number sector.  It returns False without doing anything if the
+file is too small to split or os.pwrite is not available."""
+    n_k = xts_n_k(bits)
+    key1, key2 = xts_keys(key, n_k)
+    chunk = max(chunk // sector_size, 1) * sector_size
+    size = os.path.getsize(in_name)
+    if not use_parallel(size, workers, chunk):
+        return False
+    with open(out_name, 'wb') as f_out:
+        f_out.truncate(size)
+    jobs = [(offset, min(chunk, size - offset), offset,
+             partial(xts_chunk, tweak_key=key2, sector=sector + offset // sector_size,
+                     sector_size=sector_size, inverse=inverse))
+            for offset in range(0, size, chunk)]
+    run_chunks(key1, n_k, in_name, out_name, jobs, workers)
+    return True
@@ -0,0 +1,126 @@
+from queue import Queue, Empty
+from threading import Event, Thread
+from time import perf_counter
+from AESHelp import read_chunk, CHUNK_SIZE
+
+
+#
+# A pipelined file driver for the modes whose cipher work is serial.
+# A reader thread reads the input ahead into a bounded queue of
+# chunks and a writer thread writes the output behind from another,
+# so the thread running the cipher does nothing but cipher work.
+# File reads and writes release the GIL, so the stages overlap.
+#
+PIPELINE_DEPTH = 4
+
+# Wall time in seconds recorded by a Pipeline for each stage:
+#   reader_io       reading the input
+#   reader_blocked  waiting for room in the input queue (cipher-bound)
+#   cipher_input    the cipher waiting for input (read-bound)
+#   cipher_output   the cipher waiting for room to write (write-bound)
+#   writer_io       writing the output
+#   writer_idle     waiting for output from the cipher
+#   wall            from starting the Pipeline to closing it
+STAGES = ('reader_io', 'reader_blocked', 'cipher_input', 'cipher_output',
+          'writer_io', 'writer_idle', 'wall')
+
+
+class Pipeline:
+    """
+Pipeline(f_in, f_out, chunk_size=CHUNK_SIZE, depth=PIPELINE_DEPTH) -> Pipeline
+
+A Pipeline reads f_in in chunks of chunk_size bytes in a reader
+thread and writes to f_out in a writer thread, each with a queue of
+at most depth chunks.  read returns the next chunk (b'' at the end
+of the file) and write queues a buffer to be written.  close waits
+for the output to be written and returns the time each stage spent
+working and blocked (see STAGES); the files are left open."""
+    __slots__ = ('inputs', 'outputs', 'stop', 'reader', 'writer', 'times', 'error', 'start')
+
+    def __init__(self, f_in, f_out, chunk_size=CHUNK_SIZE, depth=PIPELINE_DEPTH):
+        self.inputs = Queue(depth)
+        self.outputs = Queue(depth)
+        self.stop = Event()
+        self.times = dict.fromkeys(STAGES, 0.0)
+        self.error = None
+        self.start = perf_counter()
+        self.reader = Thread(target=self.read_ahead, args=(f_in, chunk_size), daemon=True)
+        self.writer = Thread(target=self.write_behind, args=(f_out,), daemon=True)
+        self.reader.start()
+        self.writer.start()
+
+    def read_ahead(self, f_in, chunk_size):
+        # Runs in the reader thread
+        times = self.times
+        try:
+            chunk = None
+            while chunk != b'' and not self.stop.is_set():
+                t = perf_counter()
+                chunk = read_chunk(f_in, chunk_size)
+                u = perf_counter()
+                self.inputs.put(chunk)
+                times['reader_io'] += u - t
+                times['reader_blocked'] += perf_counter() - u
+        except Exception as e:
+            self.inputs.put(e)
+
+    def write_behind(self, f_out):
+        # Runs in the writer thread; after an error it only drains the queue
+        times = self.times
+        while True:
+            t = perf_counter()
+            data = self.outputs.get()
+            u = perf_counter()
+            times['writer_idle'] += u - t
+            if data is None:
+                break
+            if self.error is None:
+                try:
+                    f_out.write(data)
+                except Exception as e:
+                    self.error = e
+                times['writer_io'] += perf_counter() - u
+
+    def read(self):
+        """
+read() -> bytes
+
+read returns the next chunk of the input, or b'' at its end."""
+        t = perf_counter()
+        chunk = self.inputs.get()
+        self.times['cipher_input'] += perf_counter() - t
+        if isinstance(chunk, Exception):
+            raise chunk
+        return chunk
+
+    def write(self, data):
+        """
+write(data) -> None
+
+write queues data to be written to the output."""
+        if self.error is not None:
+            raise self.error
+        t = perf_counter()
+        self.outputs.put(data)
+        self.times['cipher_output'] += perf_counter() - t
+
+    def close(self, check=True):
+        """
+close(check=True) -> dict
+
+close stops the reader, waits for the writer to write everything
+queued and returns the stage times.  If a write failed, its error
+is raised, unless check is False: a caller closing the Pipeline
+because of another exception passes False, so as not to hide it."""
+        self.stop.set()
+        while self.reader.is_alive():
+            try:
+                self.inputs.get(timeout=0.01)
+            except Empty:
+                pass
+        self.outputs.put(None)
+        self.writer.join()
+        self.times['wall'] = perf_counter() - self.start
+        if check and self.error is not None:
+            raise self.error
+        return dict(self.times)
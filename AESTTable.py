@@ -0,0 +1,114 @@
+import AES
+from AESTables import sbox, sboxInv, te0, te1, te2, te3, td0, td1, td2, td3
+
+
+#
+# Table-driven AES: the state is held as four 32-bit column words
+# and SubBytes, ShiftRows and MixColumns are folded into the
+# T-table lookups of AESTables.
+#
+
+
+#
+# Key schedules for the table-driven Cipher and Inverse Cipher
+#
+def KeyExpansion(key, n_k):
+    """
+KeyExpansion(key, n_k) -> word list
+
+KeyExpansion generates the Round Keys of AES.KeyExpansion
+as a list of 32-bit big-endian words (ints) for use by Cipher.
+n_k is the number of 32-bit words comprising the Cipher Key (key).
+  For this standard, n_k = 4, 6, or 8."""
+    return [int.from_bytes(w, 'big') for w in AES.KeyExpansion(key, n_k)]
+
+
+def KeyExpansionEIC(key, n_k):
+    """
+KeyExpansionEIC(key, n_k) -> word list
+
+KeyExpansionEIC generates the Round Keys of AES.KeyExpansionEIC
+as a list of 32-bit big-endian words (ints) for use by InvCipher.
+The Round Keys are listed in the order InvCipher uses them
+(last round first).
+n_k is the number of 32-bit words comprising the Cipher Key (key).
+  For this standard, n_k = 4, 6, or 8."""
+    w = [int.from_bytes(word, 'big') for word in AES.KeyExpansionEIC(key, n_k)]
+    dw = []
+    for i in range(n_k + 6, -1, -1):
+        dw += w[i * 4:(i + 1) * 4]
+    return dw
+
+
+#
+# Table-driven Cipher
+#
+def Cipher(inp, w, n_k):
+    """
+Cipher(inp, w, n_k) -> bytes
+
+Cipher converts the 16-byte plaintext (inp) to ciphertext
+using the Round Keys (w) produced by KeyExpansion.  Each of
+the first n_r - 1 rounds is sixteen T-table lookups; the final
+round, which has no MixColumns, uses the sbox directly.
+n_k is the number of 32-bit words comprising the Cipher Key.
+  For this standard, n_k = 4, 6, or 8."""
+    n_r = n_k + 6
+    s0 = int.from_bytes(inp[0:4], 'big') ^ w[0]
+    s1 = int.from_bytes(inp[4:8], 'big') ^ w[1]
+    s2 = int.from_bytes(inp[8:12], 'big') ^ w[2]
+    s3 = int.from_bytes(inp[12:16], 'big') ^ w[3]
+    k = 4
+    for _ in range(1, n_r):
+        t0 = te0[s0 >> 24] ^ te1[(s1 >> 16) & 255] ^ te2[(s2 >> 8) & 255] ^ te3[s3 & 255] ^ w[k]
+        t1 = te0[s1 >> 24] ^ te1[(s2 >> 16) & 255] ^ te2[(s3 >> 8) & 255] ^ te3[s0 & 255] ^ w[k + 1]
+        t2 = te0[s2 >> 24] ^ te1[(s3 >> 16) & 255] ^ te2[(s0 >> 8) & 255] ^ te3[s1 & 255] ^ w[k + 2]
+        t3 = te0[s3 >> 24] ^ te1[(s0 >> 16) & 255] ^ te2[(s1 >> 8) & 255] ^ te3[s2 & 255] ^ w[k + 3]
+        s0, s1, s2, s3 = t0, t1, t2, t3
+        k += 4
+    u0 = ((sbox[s0 >> 24] << 24) | (sbox[(s1 >> 16) & 255] << 16) |
+          (sbox[(s2 >> 8) & 255] << 8) | sbox[s3 & 255]) ^ w[k]
+    u1 = ((sbox[s1 >> 24] << 24) | (sbox[(s2 >> 16) & 255] << 16) |
+          (sbox[(s3 >> 8) & 255] << 8) | sbox[s0 & 255]) ^ w[k + 1]
+    u2 = ((sbox[s2 >> 24] << 24) | (sbox[(s3 >> 16) & 255] << 16) |
+          (sbox[(s0 >> 8) & 255] << 8) | sbox[s1 & 255]) ^ w[k + 2]
+    u3 = ((sbox[s3 >> 24] << 24) | (sbox[(s0 >> 16) & 255] << 16) |
+          (sbox[(s1 >> 8) & 255] << 8) | sbox[s2 & 255]) ^ w[k + 3]
+    return ((u0 << 96) | (u1 << 64) | (u2 << 32) | u3).to_bytes(16, 'big')
+
+
+#
+# Table-driven Inverse Cipher
+#
+def InvCipher(inp, dw, n_k):
+    """
+InvCipher(inp, dw, n_k) -> bytes
+
+InvCipher converts the 16-byte ciphertext (inp) to plaintext
+using the Round Keys (dw) produced by KeyExpansionEIC.  It is
+the equivalent inverse cipher of FIPS 197 section 5.3.5, so its
+rounds have the same structure as those of Cipher.
+n_k is the number of 32-bit words comprising the Cipher Key.
+  For this standard, n_k = 4, 6, or 8."""
+    n_r = n_k + 6
+    s0 = int.from_bytes(inp[0:4], 'big') ^ dw[0]
+    s1 = int.from_bytes(inp[4:8], 'big') ^ dw[1]
+    s2 = int.from_bytes(inp[8:12], 'big') ^ dw[2]
+    s3 = int.from_bytes(inp[12:16], 'big') ^ dw[3]
+    k = 4
+    for _ in range(1, n_r):
+        t0 = td0[s0 >> 24] ^ td1[(s3 >> 16) & 255] ^ td2[(s2 >> 8) & 255] ^ td3[s1 & 255] ^ dw[k]
+        t1 = td0[s1 >> 24] ^ td1[(s0 >> 16) & 255] ^ td2[(s3 >> 8) & 255] ^ td3[s2 & 255] ^ dw[k + 1]
+        t2 = td0[s2 >> 24] ^ td1[(s1 >> 16) & 255] ^ td2[(s0 >> 8) & 255] ^ td3[s3 & 255] ^ dw[k + 2]
+        t3 = td0[s3 >> 24] ^ td1[(s2 >> 16) & 255] ^ td2[(s1 >> 8) & 255] ^ td3[s0 & 255] ^ dw[k + 3]
+        s0, s1, s2, s3 = t0, t1, t2, t3
+        k += 4
+    u0 = ((sboxInv[s0 >> 24] << 24) | (sboxInv[(s3 >> 16) & 255] << 16) |
+          (sboxInv[(s2 >> 8) & 255] << 8) | sboxInv[s1 & 255]) ^ dw[k]
+    u1 = ((sboxInv[s1 >> 24] << 24) | (sboxInv[(s0 >> 16) & 255] << 16) |
+          (sboxInv[(s3 >> 8) & 255] << 8) | sboxInv[s2 & 255]) ^ dw[k + 1]
+    u2 = ((sboxInv[s2 >> 24] << 24) | (sboxInv[(s1 >> 16) & 255] << 16) |
+          (sboxInv[(s0 >> 8) & 255] << 8) | sboxInv[s3 & 255]) ^ dw[k + 2]
+    u3 = ((sboxInv[s3 >> 24] << 24) | (sboxInv[(s2 >> 16) & 255] << 16) |
+          (sboxInv[(s1 >> 8) & 255] << 8) | sboxInv[s0 & 255]) ^ dw[k + 3]
+    return ((u0 << 96) | (u1 << 64) | (u2 << 32) | u3).to_bytes(16, 'big')
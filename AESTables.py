@@ -1,72 +1,40 @@
 # Log table using 0xe5 (229) as the generator 
-ltable = [
-    0x00, 0xff, 0xc8, 0x08, 0x91, 0x10, 0xd0, 0x36,
-    0x5a, 0x3e, 0xd8, 0x43, 0x99, 0x77, 0xfe, 0x18,
-    0x23, 0x20, 0x07, 0x70, 0xa1, 0x6c, 0x0c, 0x7f,
-    0x62, 0x8b, 0x40, 0x46, 0xc7, 0x4b, 0xe0, 0x0e,
-    0xeb, 0x16, 0xe8, 0xad, 0xcf, 0xcd, 0x39, 0x53,
-    0x6a, 0x27, 0x35, 0x93, 0xd4, 0x4e, 0x48, 0xc3,
-    0x2b, 0x79, 0x54, 0x28, 0x09, 0x78, 0x0f, 0x21,
-    0x90, 0x87, 0x14, 0x2a, 0xa9, 0x9c, 0xd6, 0x74,
-    0xb4, 0x7c, 0xde, 0xed, 0xb1, 0x86, 0x76, 0xa4,
-    0x98, 0xe2, 0x96, 0x8f, 0x02, 0x32, 0x1c, 0xc1,
-    0x33, 0xee, 0xef, 0x81, 0xfd, 0x30, 0x5c, 0x13,
-    0x9d, 0x29, 0x17, 0xc4, 0x11, 0x44, 0x8c, 0x80,
-    0xf3, 0x73, 0x42, 0x1e, 0x1d, 0xb5, 0xf0, 0x12,
-    0xd1, 0x5b, 0x41, 0xa2, 0xd7, 0x2c, 0xe9, 0xd5,
-    0x59, 0xcb, 0x50, 0xa8, 0xdc, 0xfc, 0xf2, 0x56,
-    0x72, 0xa6, 0x65, 0x2f, 0x9f, 0x9b, 0x3d, 0xba,
-    0x7d, 0xc2, 0x45, 0x82, 0xa7, 0x57, 0xb6, 0xa3,
-    0x7a, 0x75, 0x4f, 0xae, 0x3f, 0x37, 0x6d, 0x47,
-    0x61, 0xbe, 0xab, 0xd3, 0x5f, 0xb0, 0x58, 0xaf,
-    0xca, 0x5e, 0xfa, 0x85, 0xe4, 0x4d, 0x8a, 0x05,
-    0xfb, 0x60, 0xb7, 0x7b, 0xb8, 0x26, 0x4a, 0x67,
-    0xc6, 0x1a, 0xf8, 0x69, 0x25, 0xb3, 0xdb, 0xbd,
-    0x66, 0xdd, 0xf1, 0xd2, 0xdf, 0x03, 0x8d, 0x34,
-    0xd9, 0x92, 0x0d, 0x63, 0x55, 0xaa, 0x49, 0xec,
-    0xbc, 0x95, 0x3c, 0x84, 0x0b, 0xf5, 0xe6, 0xe7,
-    0xe5, 0xac, 0x7e, 0x6e, 0xb9, 0xf9, 0xda, 0x8e,
-    0x9a, 0xc9, 0x24, 0xe1, 0x0a, 0x15, 0x6b, 0x3a,
-    0xa0, 0x51, 0xf4, 0xea, 0xb2, 0x97, 0x9e, 0x5d,
-    0x22, 0x88, 0x94, 0xce, 0x19, 0x01, 0x71, 0x4c,
-    0xa5, 0xe3, 0xc5, 0x31, 0xbb, 0xcc, 0x1f, 0x2d,
-    0x3b, 0x52, 0x6f, 0xf6, 0x2e, 0x89, 0xf7, 0xc0,
-    0x68, 0x1b, 0x64, 0x04, 0x06, 0xbf, 0x83, 0x38]
+ltable = (
+    b'\x00\xff\xc8\x08\x91\x10\xd0\x36\x5a\x3e\xd8\x43\x99\x77\xfe\x18'
+    b'\x23\x20\x07\x70\xa1\x6c\x0c\x7f\x62\x8b\x40\x46\xc7\x4b\xe0\x0e'
+    b'\xeb\x16\xe8\xad\xcf\xcd\x39\x53\x6a\x27\x35\x93\xd4\x4e\x48\xc3'
+    b'\x2b\x79\x54\x28\x09\x78\x0f\x21\x90\x87\x14\x2a\xa9\x9c\xd6\x74'
+    b'\xb4\x7c\xde\xed\xb1\x86\x76\xa4\x98\xe2\x96\x8f\x02\x32\x1c\xc1'
+    b'\x33\xee\xef\x81\xfd\x30\x5c\x13\x9d\x29\x17\xc4\x11\x44\x8c\x80'
+    b'\xf3\x73\x42\x1e\x1d\xb5\xf0\x12\xd1\x5b\x41\xa2\xd7\x2c\xe9\xd5'
+    b'\x59\xcb\x50\xa8\xdc\xfc\xf2\x56\x72\xa6\x65\x2f\x9f\x9b\x3d\xba'
+    b'\x7d\xc2\x45\x82\xa7\x57\xb6\xa3\x7a\x75\x4f\xae\x3f\x37\x6d\x47'
+    b'\x61\xbe\xab\xd3\x5f\xb0\x58\xaf\xca\x5e\xfa\x85\xe4\x4d\x8a\x05'
+    b'\xfb\x60\xb7\x7b\xb8\x26\x4a\x67\xc6\x1a\xf8\x69\x25\xb3\xdb\xbd'
+    b'\x66\xdd\xf1\xd2\xdf\x03\x8d\x34\xd9\x92\x0d\x63\x55\xaa\x49\xec'
+    b'\xbc\x95\x3c\x84\x0b\xf5\xe6\xe7\xe5\xac\x7e\x6e\xb9\xf9\xda\x8e'
+    b'\x9a\xc9\x24\xe1\x0a\x15\x6b\x3a\xa0\x51\xf4\xea\xb2\x97\x9e\x5d'
+    b'\x22\x88\x94\xce\x19\x01\x71\x4c\xa5\xe3\xc5\x31\xbb\xcc\x1f\x2d'
+    b'\x3b\x52\x6f\xf6\x2e\x89\xf7\xc0\x68\x1b\x64\x04\x06\xbf\x83\x38')
 
 # Anti-log table:
-a_table = [
-    0x01, 0xe5, 0x4c, 0xb5, 0xfb, 0x9f, 0xfc, 0x12,
-    0x03, 0x34, 0xd4, 0xc4, 0x16, 0xba, 0x1f, 0x36,
-    0x05, 0x5c, 0x67, 0x57, 0x3a, 0xd5, 0x21, 0x5a,
-    0x0f, 0xe4, 0xa9, 0xf9, 0x4e, 0x64, 0x63, 0xee,
-    0x11, 0x37, 0xe0, 0x10, 0xd2, 0xac, 0xa5, 0x29,
-    0x33, 0x59, 0x3b, 0x30, 0x6d, 0xef, 0xf4, 0x7b,
-    0x55, 0xeb, 0x4d, 0x50, 0xb7, 0x2a, 0x07, 0x8d,
-    0xff, 0x26, 0xd7, 0xf0, 0xc2, 0x7e, 0x09, 0x8c,
-    0x1a, 0x6a, 0x62, 0x0b, 0x5d, 0x82, 0x1b, 0x8f,
-    0x2e, 0xbe, 0xa6, 0x1d, 0xe7, 0x9d, 0x2d, 0x8a,
-    0x72, 0xd9, 0xf1, 0x27, 0x32, 0xbc, 0x77, 0x85,
-    0x96, 0x70, 0x08, 0x69, 0x56, 0xdf, 0x99, 0x94,
-    0xa1, 0x90, 0x18, 0xbb, 0xfa, 0x7a, 0xb0, 0xa7,
-    0xf8, 0xab, 0x28, 0xd6, 0x15, 0x8e, 0xcb, 0xf2,
-    0x13, 0xe6, 0x78, 0x61, 0x3f, 0x89, 0x46, 0x0d,
-    0x35, 0x31, 0x88, 0xa3, 0x41, 0x80, 0xca, 0x17,
-    0x5f, 0x53, 0x83, 0xfe, 0xc3, 0x9b, 0x45, 0x39,
-    0xe1, 0xf5, 0x9e, 0x19, 0x5e, 0xb6, 0xcf, 0x4b,
-    0x38, 0x04, 0xb9, 0x2b, 0xe2, 0xc1, 0x4a, 0xdd,
-    0x48, 0x0c, 0xd0, 0x7d, 0x3d, 0x58, 0xde, 0x7c,
-    0xd8, 0x14, 0x6b, 0x87, 0x47, 0xe8, 0x79, 0x84,
-    0x73, 0x3c, 0xbd, 0x92, 0xc9, 0x23, 0x8b, 0x97,
-    0x95, 0x44, 0xdc, 0xad, 0x40, 0x65, 0x86, 0xa2,
-    0xa4, 0xcc, 0x7f, 0xec, 0xc0, 0xaf, 0x91, 0xfd,
-    0xf7, 0x4f, 0x81, 0x2f, 0x5b, 0xea, 0xa8, 0x1c,
-    0x02, 0xd1, 0x98, 0x71, 0xed, 0x25, 0xe3, 0x24,
-    0x06, 0x68, 0xb3, 0x93, 0x2c, 0x6f, 0x3e, 0x6c,
-    0x0a, 0xb8, 0xce, 0xae, 0x74, 0xb1, 0x42, 0xb4,
-    0x1e, 0xd3, 0x49, 0xe9, 0x9c, 0xc8, 0xc6, 0xc7,
-    0x22, 0x6e, 0xdb, 0x20, 0xbf, 0x43, 0x51, 0x52,
-    0x66, 0xb2, 0x76, 0x60, 0xda, 0xc5, 0xf3, 0xf6,
-    0xaa, 0xcd, 0x9a, 0xa0, 0x75, 0x54, 0x0e, 0x01]
+a_table = (
+    b'\x01\xe5\x4c\xb5\xfb\x9f\xfc\x12\x03\x34\xd4\xc4\x16\xba\x1f\x36'
+    b'\x05\x5c\x67\x57\x3a\xd5\x21\x5a\x0f\xe4\xa9\xf9\x4e\x64\x63\xee'
+    b'\x11\x37\xe0\x10\xd2\xac\xa5\x29\x33\x59\x3b\x30\x6d\xef\xf4\x7b'
+    b'\x55\xeb\x4d\x50\xb7\x2a\x07\x8d\xff\x26\xd7\xf0\xc2\x7e\x09\x8c'
+    b'\x1a\x6a\x62\x0b\x5d\x82\x1b\x8f\x2e\xbe\xa6\x1d\xe7\x9d\x2d\x8a'
+    b'\x72\xd9\xf1\x27\x32\xbc\x77\x85\x96\x70\x08\x69\x56\xdf\x99\x94'
+    b'\xa1\x90\x18\xbb\xfa\x7a\xb0\xa7\xf8\xab\x28\xd6\x15\x8e\xcb\xf2'
+    b'\x13\xe6\x78\x61\x3f\x89\x46\x0d\x35\x31\x88\xa3\x41\x80\xca\x17'
+    b'\x5f\x53\x83\xfe\xc3\x9b\x45\x39\xe1\xf5\x9e\x19\x5e\xb6\xcf\x4b'
+    b'\x38\x04\xb9\x2b\xe2\xc1\x4a\xdd\x48\x0c\xd0\x7d\x3d\x58\xde\x7c'
+    b'\xd8\x14\x6b\x87\x47\xe8\x79\x84\x73\x3c\xbd\x92\xc9\x23\x8b\x97'
+    b'\x95\x44\xdc\xad\x40\x65\x86\xa2\xa4\xcc\x7f\xec\xc0\xaf\x91\xfd'
+    b'\xf7\x4f\x81\x2f\x5b\xea\xa8\x1c\x02\xd1\x98\x71\xed\x25\xe3\x24'
+    b'\x06\x68\xb3\x93\x2c\x6f\x3e\x6c\x0a\xb8\xce\xae\x74\xb1\x42\xb4'
+    b'\x1e\xd3\x49\xe9\x9c\xc8\xc6\xc7\x22\x6e\xdb\x20\xbf\x43\x51\x52'
+    b'\x66\xb2\x76\x60\xda\xc5\xf3\xf6\xaa\xcd\x9a\xa0\x75\x54\x0e\x01')
 
 
 # Calculates the s-box value for a given input
@@ -82,141 +50,127 @@ def get_sbox(inp):
 
 
 # lookup table for s-box
-sbox = [
-    0x63, 0x7c, 0x77, 0x7b, 0xf2, 0x6b, 0x6f, 0xc5,
-    0x30, 0x01, 0x67, 0x2b, 0xfe, 0xd7, 0xab, 0x76,
-    0xca, 0x82, 0xc9, 0x7d, 0xfa, 0x59, 0x47, 0xf0,
-    0xad, 0xd4, 0xa2, 0xaf, 0x9c, 0xa4, 0x72, 0xc0,
-    0xb7, 0xfd, 0x93, 0x26, 0x36, 0x3f, 0xf7, 0xcc,
-    0x34, 0xa5, 0xe5, 0xf1, 0x71, 0xd8, 0x31, 0x15,
-    0x04, 0xc7, 0x23, 0xc3, 0x18, 0x96, 0x05, 0x9a,
-    0x07, 0x12, 0x80, 0xe2, 0xeb, 0x27, 0xb2, 0x75,
-    0x09, 0x83, 0x2c, 0x1a, 0x1b, 0x6e, 0x5a, 0xa0,
-    0x52, 0x3b, 0xd6, 0xb3, 0x29, 0xe3, 0x2f, 0x84,
-    0x53, 0xd1, 0x00, 0xed, 0x20, 0xfc, 0xb1, 0x5b,
-    0x6a, 0xcb, 0xbe, 0x39, 0x4a, 0x4c, 0x58, 0xcf,
-    0xd0, 0xef, 0xaa, 0xfb, 0x43, 0x4d, 0x33, 0x85,
-    0x45, 0xf9, 0x02, 0x7f, 0x50, 0x3c, 0x9f, 0xa8,
-    0x51, 0xa3, 0x40, 0x8f, 0x92, 0x9d, 0x38, 0xf5,
-    0xbc, 0xb6, 0xda, 0x21, 0x10, 0xff, 0xf3, 0xd2,
-    0xcd, 0x0c, 0x13, 0xec, 0x5f, 0x97, 0x44, 0x17,
-    0xc4, 0xa7, 0x7e, 0x3d, 0x64, 0x5d, 0x19, 0x73,
-    0x60, 0x81, 0x4f, 0xdc, 0x22, 0x2a, 0x90, 0x88,
-    0x46, 0xee, 0xb8, 0x14, 0xde, 0x5e, 0x0b, 0xdb,
-    0xe0, 0x32, 0x3a, 0x0a, 0x49, 0x06, 0x24, 0x5c,
-    0xc2, 0xd3, 0xac, 0x62, 0x91, 0x95, 0xe4, 0x79,
-    0xe7, 0xc8, 0x37, 0x6d, 0x8d, 0xd5, 0x4e, 0xa9,
-    0x6c, 0x56, 0xf4, 0xea, 0x65, 0x7a, 0xae, 0x08,
-    0xba, 0x78, 0x25, 0x2e, 0x1c, 0xa6, 0xb4, 0xc6,
-    0xe8, 0xdd, 0x74, 0x1f, 0x4b, 0xbd, 0x8b, 0x8a,
-    0x70, 0x3e, 0xb5, 0x66, 0x48, 0x03, 0xf6, 0x0e,
-    0x61, 0x35, 0x57, 0xb9, 0x86, 0xc1, 0x1d, 0x9e,
-    0xe1, 0xf8, 0x98, 0x11, 0x69, 0xd9, 0x8e, 0x94,
-    0x9b, 0x1e, 0x87, 0xe9, 0xce, 0x55, 0x28, 0xdf,
-    0x8c, 0xa1, 0x89, 0x0d, 0xbf, 0xe6, 0x42, 0x68,
-    0x41, 0x99, 0x2d, 0x0f, 0xb0, 0x54, 0xbb, 0x16]
+sbox = (
+    b'\x63\x7c\x77\x7b\xf2\x6b\x6f\xc5\x30\x01\x67\x2b\xfe\xd7\xab\x76'
+    b'\xca\x82\xc9\x7d\xfa\x59\x47\xf0\xad\xd4\xa2\xaf\x9c\xa4\x72\xc0'
+    b'\xb7\xfd\x93\x26\x36\x3f\xf7\xcc\x34\xa5\xe5\xf1\x71\xd8\x31\x15'
+    b'\x04\xc7\x23\xc3\x18\x96\x05\x9a\x07\x12\x80\xe2\xeb\x27\xb2\x75'
+    b'\x09\x83\x2c\x1a\x1b\x6e\x5a\xa0\x52\x3b\xd6\xb3\x29\xe3\x2f\x84'
+    b'\x53\xd1\x00\xed\x20\xfc\xb1\x5b\x6a\xcb\xbe\x39\x4a\x4c\x58\xcf'
+    b'\xd0\xef\xaa\xfb\x43\x4d\x33\x85\x45\xf9\x02\x7f\x50\x3c\x9f\xa8'
+    b'\x51\xa3\x40\x8f\x92\x9d\x38\xf5\xbc\xb6\xda\x21\x10\xff\xf3\xd2'
+    b'\xcd\x0c\x13\xec\x5f\x97\x44\x17\xc4\xa7\x7e\x3d\x64\x5d\x19\x73'
+    b'\x60\x81\x4f\xdc\x22\x2a\x90\x88\x46\xee\xb8\x14\xde\x5e\x0b\xdb'
+    b'\xe0\x32\x3a\x0a\x49\x06\x24\x5c\xc2\xd3\xac\x62\x91\x95\xe4\x79'
+    b'\xe7\xc8\x37\x6d\x8d\xd5\x4e\xa9\x6c\x56\xf4\xea\x65\x7a\xae\x08'
+    b'\xba\x78\x25\x2e\x1c\xa6\xb4\xc6\xe8\xdd\x74\x1f\x4b\xbd\x8b\x8a'
+    b'\x70\x3e\xb5\x66\x48\x03\xf6\x0e\x61\x35\x57\xb9\x86\xc1\x1d\x9e'
+    b'\xe1\xf8\x98\x11\x69\xd9\x8e\x94\x9b\x1e\x87\xe9\xce\x55\x28\xdf'
+    b'\x8c\xa1\x89\x0d\xbf\xe6\x42\x68\x41\x99\x2d\x0f\xb0\x54\xbb\x16')
 
 # lookup table for Inverse s-box
-sboxInv = [
-    0x52, 0x09, 0x6a, 0xd5, 0x30, 0x36, 0xa5, 0x38,
-    0xbf, 0x40, 0xa3, 0x9e, 0x81, 0xf3, 0xd7, 0xfb,
-    0x7c, 0xe3, 0x39, 0x82, 0x9b, 0x2f, 0xff, 0x87,
-    0x34, 0x8e, 0x43, 0x44, 0xc4, 0xde, 0xe9, 0xcb,
-    0x54, 0x7b, 0x94, 0x32, 0xa6, 0xc2, 0x23, 0x3d,
-    0xee, 0x4c, 0x95, 0x0b, 0x42, 0xfa, 0xc3, 0x4e,
-    0x08, 0x2e, 0xa1, 0x66, 0x28, 0xd9, 0x24, 0xb2,
-    0x76, 0x5b, 0xa2, 0x49, 0x6d, 0x8b, 0xd1, 0x25,
-    0x72, 0xf8, 0xf6, 0x64, 0x86, 0x68, 0x98, 0x16,
-    0xd4, 0xa4, 0x5c, 0xcc, 0x5d, 0x65, 0xb6, 0x92,
-    0x6c, 0x70, 0x48, 0x50, 0xfd, 0xed, 0xb9, 0xda,
-    0x5e, 0x15, 0x46, 0x57, 0xa7, 0x8d, 0x9d, 0x84,
-    0x90, 0xd8, 0xab, 0x00, 0x8c, 0xbc, 0xd3, 0x0a,
-    0xf7, 0xe4, 0x58, 0x05, 0xb8, 0xb3, 0x45, 0x06,
-    0xd0, 0x2c, 0x1e, 0x8f, 0xca, 0x3f, 0x0f, 0x02,
-    0xc1, 0xaf, 0xbd, 0x03, 0x01, 0x13, 0x8a, 0x6b,
-    0x3a, 0x91, 0x11, 0x41, 0x4f, 0x67, 0xdc, 0xea,
-    0x97, 0xf2, 0xcf, 0xce, 0xf0, 0xb4, 0xe6, 0x73,
-    0x96, 0xac, 0x74, 0x22, 0xe7, 0xad, 0x35, 0x85,
-    0xe2, 0xf9, 0x37, 0xe8, 0x1c, 0x75, 0xdf, 0x6e,
-    0x47, 0xf1, 0x1a, 0x71, 0x1d, 0x29, 0xc5, 0x89,
-    0x6f, 0xb7, 0x62, 0x0e, 0xaa, 0x18, 0xbe, 0x1b,
-    0xfc, 0x56, 0x3e, 0x4b, 0xc6, 0xd2, 0x79, 0x20,
-    0x9a, 0xdb, 0xc0, 0xfe, 0x78, 0xcd, 0x5a, 0xf4,
-    0x1f, 0xdd, 0xa8, 0x33, 0x88, 0x07, 0xc7, 0x31,
-    0xb1, 0x12, 0x10, 0x59, 0x27, 0x80, 0xec, 0x5f,
-    0x60, 0x51, 0x7f, 0xa9, 0x19, 0xb5, 0x4a, 0x0d,
-    0x2d, 0xe5, 0x7a, 0x9f, 0x93, 0xc9, 0x9c, 0xef,
-    0xa0, 0xe0, 0x3b, 0x4d, 0xae, 0x2a, 0xf5, 0xb0,
-    0xc8, 0xeb, 0xbb, 0x3c, 0x83, 0x53, 0x99, 0x61,
-    0x17, 0x2b, 0x04, 0x7e, 0xba, 0x77, 0xd6, 0x26,
-    0xe1, 0x69, 0x14, 0x63, 0x55, 0x21, 0x0c, 0x7d]
+sboxInv = (
+    b'\x52\x09\x6a\xd5\x30\x36\xa5\x38\xbf\x40\xa3\x9e\x81\xf3\xd7\xfb'
+    b'\x7c\xe3\x39\x82\x9b\x2f\xff\x87\x34\x8e\x43\x44\xc4\xde\xe9\xcb'
+    b'\x54\x7b\x94\x32\xa6\xc2\x23\x3d\xee\x4c\x95\x0b\x42\xfa\xc3\x4e'
+    b'\x08\x2e\xa1\x66\x28\xd9\x24\xb2\x76\x5b\xa2\x49\x6d\x8b\xd1\x25'
+    b'\x72\xf8\xf6\x64\x86\x68\x98\x16\xd4\xa4\x5c\xcc\x5d\x65\xb6\x92'
+    b'\x6c\x70\x48\x50\xfd\xed\xb9\xda\x5e\x15\x46\x57\xa7\x8d\x9d\x84'
+    b'\x90\xd8\xab\x00\x8c\xbc\xd3\x0a\xf7\xe4\x58\x05\xb8\xb3\x45\x06'
+    b'\xd0\x2c\x1e\x8f\xca\x3f\x0f\x02\xc1\xaf\xbd\x03\x01\x13\x8a\x6b'
+    b'\x3a\x91\x11\x41\x4f\x67\xdc\xea\x97\xf2\xcf\xce\xf0\xb4\xe6\x73'
+    b'\x96\xac\x74\x22\xe7\xad\x35\x85\xe2\xf9\x37\xe8\x1c\x75\xdf\x6e'
+    b'\x47\xf1\x1a\x71\x1d\x29\xc5\x89\x6f\xb7\x62\x0e\xaa\x18\xbe\x1b'
+    b'\xfc\x56\x3e\x4b\xc6\xd2\x79\x20\x9a\xdb\xc0\xfe\x78\xcd\x5a\xf4'
+    b'\x1f\xdd\xa8\x33\x88\x07\xc7\x31\xb1\x12\x10\x59\x27\x80\xec\x5f'
+    b'\x60\x51\x7f\xa9\x19\xb5\x4a\x0d\x2d\xe5\x7a\x9f\x93\xc9\x9c\xef'
+    b'\xa0\xe0\x3b\x4d\xae\x2a\xf5\xb0\xc8\xeb\xbb\x3c\x83\x53\x99\x61'
+    b'\x17\x2b\x04\x7e\xba\x77\xd6\x26\xe1\x69\x14\x63\x55\x21\x0c\x7d')
 
 # lookup table for Round Constants
-rcon = [
-    0x8d, 0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40,
-    0x80, 0x1b, 0x36, 0x6c, 0xd8, 0xab, 0x4d, 0x9a,
-    0x2f, 0x5e, 0xbc, 0x63, 0xc6, 0x97, 0x35, 0x6a,
-    0xd4, 0xb3, 0x7d, 0xfa, 0xef, 0xc5, 0x91, 0x39,
-    0x72, 0xe4, 0xd3, 0xbd, 0x61, 0xc2, 0x9f, 0x25,
-    0x4a, 0x94, 0x33, 0x66, 0xcc, 0x83, 0x1d, 0x3a,
-    0x74, 0xe8, 0xcb, 0x8d, 0x01, 0x02, 0x04, 0x08,
-    0x10, 0x20, 0x40, 0x80, 0x1b, 0x36, 0x6c, 0xd8,
-    0xab, 0x4d, 0x9a, 0x2f, 0x5e, 0xbc, 0x63, 0xc6,
-    0x97, 0x35, 0x6a, 0xd4, 0xb3, 0x7d, 0xfa, 0xef,
-    0xc5, 0x91, 0x39, 0x72, 0xe4, 0xd3, 0xbd, 0x61,
-    0xc2, 0x9f, 0x25, 0x4a, 0x94, 0x33, 0x66, 0xcc,
-    0x83, 0x1d, 0x3a, 0x74, 0xe8, 0xcb, 0x8d, 0x01,
-    0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80, 0x1b,
-    0x36, 0x6c, 0xd8, 0xab, 0x4d, 0x9a, 0x2f, 0x5e,
-    0xbc, 0x63, 0xc6, 0x97, 0x35, 0x6a, 0xd4, 0xb3,
-    0x7d, 0xfa, 0xef, 0xc5, 0x91, 0x39, 0x72, 0xe4,
-    0xd3, 0xbd, 0x61, 0xc2, 0x9f, 0x25, 0x4a, 0x94,
-    0x33, 0x66, 0xcc, 0x83, 0x1d, 0x3a, 0x74, 0xe8,
-    0xcb, 0x8d, 0x01, 0x02, 0x04, 0x08, 0x10, 0x20,
-    0x40, 0x80, 0x1b, 0x36, 0x6c, 0xd8, 0xab, 0x4d,
-    0x9a, 0x2f, 0x5e, 0xbc, 0x63, 0xc6, 0x97, 0x35,
-    0x6a, 0xd4, 0xb3, 0x7d, 0xfa, 0xef, 0xc5, 0x91,
-    0x39, 0x72, 0xe4, 0xd3, 0xbd, 0x61, 0xc2, 0x9f,
-    0x25, 0x4a, 0x94, 0x33, 0x66, 0xcc, 0x83, 0x1d,
-    0x3a, 0x74, 0xe8, 0xcb, 0x8d, 0x01, 0x02, 0x04,
-    0x08, 0x10, 0x20, 0x40, 0x80, 0x1b, 0x36, 0x6c,
-    0xd8, 0xab, 0x4d, 0x9a, 0x2f, 0x5e, 0xbc, 0x63,
-    0xc6, 0x97, 0x35, 0x6a, 0xd4, 0xb3, 0x7d, 0xfa,
-    0xef, 0xc5, 0x91, 0x39, 0x72, 0xe4, 0xd3, 0xbd,
-    0x61, 0xc2, 0x9f, 0x25, 0x4a, 0x94, 0x33, 0x66,
-    0xcc, 0x83, 0x1d, 0x3a, 0x74, 0xe8, 0xcb]
+rcon = (
+    b'\x8d\x01\x02\x04\x08\x10\x20\x40\x80\x1b\x36\x6c\xd8\xab\x4d\x9a'
+    b'\x2f\x5e\xbc\x63\xc6\x97\x35\x6a\xd4\xb3\x7d\xfa\xef\xc5\x91\x39'
+    b'\x72\xe4\xd3\xbd\x61\xc2\x9f\x25\x4a\x94\x33\x66\xcc\x83\x1d\x3a'
+    b'\x74\xe8\xcb\x8d\x01\x02\x04\x08\x10\x20\x40\x80\x1b\x36\x6c\xd8'
+    b'\xab\x4d\x9a\x2f\x5e\xbc\x63\xc6\x97\x35\x6a\xd4\xb3\x7d\xfa\xef'
+    b'\xc5\x91\x39\x72\xe4\xd3\xbd\x61\xc2\x9f\x25\x4a\x94\x33\x66\xcc'
+    b'\x83\x1d\x3a\x74\xe8\xcb\x8d\x01\x02\x04\x08\x10\x20\x40\x80\x1b'
+    b'\x36\x6c\xd8\xab\x4d\x9a\x2f\x5e\xbc\x63\xc6\x97\x35\x6a\xd4\xb3'
+    b'\x7d\xfa\xef\xc5\x91\x39\x72\xe4\xd3\xbd\x61\xc2\x9f\x25\x4a\x94'
+    b'\x33\x66\xcc\x83\x1d\x3a\x74\xe8\xcb\x8d\x01\x02\x04\x08\x10\x20'
+    b'\x40\x80\x1b\x36\x6c\xd8\xab\x4d\x9a\x2f\x5e\xbc\x63\xc6\x97\x35'
+    b'\x6a\xd4\xb3\x7d\xfa\xef\xc5\x91\x39\x72\xe4\xd3\xbd\x61\xc2\x9f'
+    b'\x25\x4a\x94\x33\x66\xcc\x83\x1d\x3a\x74\xe8\xcb\x8d\x01\x02\x04'
+    b'\x08\x10\x20\x40\x80\x1b\x36\x6c\xd8\xab\x4d\x9a\x2f\x5e\xbc\x63'
+    b'\xc6\x97\x35\x6a\xd4\xb3\x7d\xfa\xef\xc5\x91\x39\x72\xe4\xd3\xbd'
+    b'\x61\xc2\x9f\x25\x4a\x94\x33\x66\xcc\x83\x1d\x3a\x74\xe8\xcb')
 
 # lookup table for GF multiplicative inverse
-gf_min_v = [
-    0x00, 0x01, 0x8d, 0xf6, 0xcb, 0x52, 0x7b, 0xd1,
-    0xe8, 0x4f, 0x29, 0xc0, 0xb0, 0xe1, 0xe5, 0xc7,
-    0x74, 0xb4, 0xaa, 0x4b, 0x99, 0x2b, 0x60, 0x5f,
-    0x58, 0x3f, 0xfd, 0xcc, 0xff, 0x40, 0xee, 0xb2,
-    0x3a, 0x6e, 0x5a, 0xf1, 0x55, 0x4d, 0xa8, 0xc9,
-    0xc1, 0x0a, 0x98, 0x15, 0x30, 0x44, 0xa2, 0xc2,
-    0x2c, 0x45, 0x92, 0x6c, 0xf3, 0x39, 0x66, 0x42,
-    0xf2, 0x35, 0x20, 0x6f, 0x77, 0xbb, 0x59, 0x19,
-    0x1d, 0xfe, 0x37, 0x67, 0x2d, 0x31, 0xf5, 0x69,
-    0xa7, 0x64, 0xab, 0x13, 0x54, 0x25, 0xe9, 0x09,
-    0xed, 0x5c, 0x05, 0xca, 0x4c, 0x24, 0x87, 0xbf,
-    0x18, 0x3e, 0x22, 0xf0, 0x51, 0xec, 0x61, 0x17,
-    0x16, 0x5e, 0xaf, 0xd3, 0x49, 0xa6, 0x36, 0x43,
-    0xf4, 0x47, 0x91, 0xdf, 0x33, 0x93, 0x21, 0x3b,
-    0x79, 0xb7, 0x97, 0x85, 0x10, 0xb5, 0xba, 0x3c,
-    0xb6, 0x70, 0xd0, 0x06, 0xa1, 0xfa, 0x81, 0x82,
-    0x83, 0x7e, 0x7f, 0x80, 0x96, 0x73, 0xbe, 0x56,
-    0x9b, 0x9e, 0x95, 0xd9, 0xf7, 0x02, 0xb9, 0xa4,
-    0xde, 0x6a, 0x32, 0x6d, 0xd8, 0x8a, 0x84, 0x72,
-    0x2a, 0x14, 0x9f, 0x88, 0xf9, 0xdc, 0x89, 0x9a,
-    0xfb, 0x7c, 0x2e, 0xc3, 0x8f, 0xb8, 0x65, 0x48,
-    0x26, 0xc8, 0x12, 0x4a, 0xce, 0xe7, 0xd2, 0x62,
-    0x0c, 0xe0, 0x1f, 0xef, 0x11, 0x75, 0x78, 0x71,
-    0xa5, 0x8e, 0x76, 0x3d, 0xbd, 0xbc, 0x86, 0x57,
-    0x0b, 0x28, 0x2f, 0xa3, 0xda, 0xd4, 0xe4, 0x0f,
-    0xa9, 0x27, 0x53, 0x04, 0x1b, 0xfc, 0xac, 0xe6,
-    0x7a, 0x07, 0xae, 0x63, 0xc5, 0xdb, 0xe2, 0xea,
-    0x94, 0x8b, 0xc4, 0xd5, 0x9d, 0xf8, 0x90, 0x6b,
-    0xb1, 0x0d, 0xd6, 0xeb, 0xc6, 0x0e, 0xcf, 0xad,
-    0x08, 0x4e, 0xd7, 0xe3, 0x5d, 0x50, 0x1e, 0xb3,
-    0x5b, 0x23, 0x38, 0x34, 0x68, 0x46, 0x03, 0x8c,
-    0xdd, 0x9c, 0x7d, 0xa0, 0xcd, 0x1a, 0x41, 0x1c]
+gf_min_v = (
+    b'\x00\x01\x8d\xf6\xcb\x52\x7b\xd1\xe8\x4f\x29\xc0\xb0\xe1\xe5\xc7'
+    b'\x74\xb4\xaa\x4b\x99\x2b\x60\x5f\x58\x3f\xfd\xcc\xff\x40\xee\xb2'
+    b'\x3a\x6e\x5a\xf1\x55\x4d\xa8\xc9\xc1\x0a\x98\x15\x30\x44\xa2\xc2'
+    b'\x2c\x45\x92\x6c\xf3\x39\x66\x42\xf2\x35\x20\x6f\x77\xbb\x59\x19'
+    b'\x1d\xfe\x37\x67\x2d\x31\xf5\x69\xa7\x64\xab\x13\x54\x25\xe9\x09'
+    b'\xed\x5c\x05\xca\x4c\x24\x87\xbf\x18\x3e\x22\xf0\x51\xec\x61\x17'
+    b'\x16\x5e\xaf\xd3\x49\xa6\x36\x43\xf4\x47\x91\xdf\x33\x93\x21\x3b'
+    b'\x79\xb7\x97\x85\x10\xb5\xba\x3c\xb6\x70\xd0\x06\xa1\xfa\x81\x82'
+    b'\x83\x7e\x7f\x80\x96\x73\xbe\x56\x9b\x9e\x95\xd9\xf7\x02\xb9\xa4'
+    b'\xde\x6a\x32\x6d\xd8\x8a\x84\x72\x2a\x14\x9f\x88\xf9\xdc\x89\x9a'
+    b'\xfb\x7c\x2e\xc3\x8f\xb8\x65\x48\x26\xc8\x12\x4a\xce\xe7\xd2\x62'
+    b'\x0c\xe0\x1f\xef\x11\x75\x78\x71\xa5\x8e\x76\x3d\xbd\xbc\x86\x57'
+    b'\x0b\x28\x2f\xa3\xda\xd4\xe4\x0f\xa9\x27\x53\x04\x1b\xfc\xac\xe6'
+    b'\x7a\x07\xae\x63\xc5\xdb\xe2\xea\x94\x8b\xc4\xd5\x9d\xf8\x90\x6b'
+    b'\xb1\x0d\xd6\xeb\xc6\x0e\xcf\xad\x08\x4e\xd7\xe3\x5d\x50\x1e\xb3'
+    b'\x5b\x23\x38\x34\x68\x46\x03\x8c\xdd\x9c\x7d\xa0\xcd\x1a\x41\x1c')
+
+
+# Multiplies two elements of GF(2^8) using the log and anti-log tables
+def gf_product(a, b):
+    if a == 0 or b == 0:
+        return 0
+    return a_table[(ltable[a] + ltable[b]) % 255]
+
+
+# Rotates a 32-bit word right by one byte
+def rot_word_right(word):
+    return ((word >> 8) | (word << 24)) & 0xffffffff
+
+
+# Tables derived from the ones above.  They are built the first time
+# one of them is looked up (see __getattr__), so importing AESTables
+# costs no more than loading the byte strings above.
+
+# Multiplication tables for the constants of MixColumns and
+# InvMixColumns: mul2[x] is 02*x in GF(2^8), and so on
+def mul_tables():
+    return {'mul%d' % c: bytes(gf_product(c, x) for x in range(256)) for c in (2, 3, 9, 11, 13, 14)}
+
+
+# T-tables for the Cipher: te0[x] is the MixColumns column
+# (02*s, s, s, 03*s) for s = sbox[x], packed as a big-endian word.
+# T-tables for the Inverse Cipher: td0[x] is the InvMixColumns column
+# (0e*s, 09*s, 0d*s, 0b*s) for s = sboxInv[x], packed as a big-endian word.
+# te1..te3 and td1..td3 are the same columns rotated by one, two and three bytes
+def t_tables():
+    mul2, mul3, mul9, mul11, mul13, mul14 = (__getattr__('mul%d' % c) for c in (2, 3, 9, 11, 13, 14))
+    tables = {'te0': [(mul2[s] << 24) | (s << 16) | (s << 8) | mul3[s] for s in sbox],
+              'td0': [(mul14[s] << 24) | (mul9[s] << 16) | (mul13[s] << 8) | mul11[s] for s in sboxInv]}
+    for t in ('te', 'td'):
+        for i in range(1, 4):
+            tables[t + str(i)] = [rot_word_right(word) for word in tables[t + str(i - 1)]]
+    return tables
+
+
+derived_tables = dict.fromkeys(['mul2', 'mul3', 'mul9', 'mul11', 'mul13', 'mul14'], mul_tables)
+derived_tables.update(dict.fromkeys(['te0', 'te1', 'te2', 'te3', 'td0', 'td1', 'td2', 'td3'], t_tables))
+
+
+def __getattr__(name):
+    if name not in derived_tables:
+        raise AttributeError("module 'AESTables' has no attribute '%s'" % name)
+    tables = globals()
+    if name not in tables:
+        tables.update(derived_tables[name]())
+    return tables[name]
@@ -5,17 +5,14 @@
 ##
 
 #
-# test file is equivalent to the following four bytes strings:
+# test_string, the test keys and the ECB vectors, also used by the
+#   backend self-test, are in AESVectors:
 #
-t1 = b'\x6b\xc1\xbe\xe2\x2e\x40\x9f\x96\xe9\x3d\x7e\x11\x73\x93\x17\x2a'
-t2 = b'\xae\x2d\x8a\x57\x1e\x03\xac\x9c\x9e\xb7\x6f\xac\x45\xaf\x8e\x51'
-t3 = b'\x30\xc8\x1c\x46\xa3\x5c\xe4\x11\xe5\xfb\xc1\x19\x1a\x0a\x52\xef'
-t4 = b'\xf6\x9f\x24\x45\xdf\x4f\x9b\x17\xad\x2b\x41\x7b\xe6\x6c\x37\x10'
-test_string = t1 + t2 + t3 + t4
+from AESVectors import *
 
 
 #
-# that string can be used as an argument in the following function,
+# test_string can be used as an argument in the following function,
 #   to create the file:
 #
 def to_file(teststr):
@@ -25,14 +22,311 @@ def to_file(teststr):
 
 
 #
-# test keys:
+# GCM test cases 1 to 18 of The Galois/Counter Mode of Operation
+#   (McGrew and Viega), used in the validation of NIST Special
+#   Publication 800-38D: (key, n_k, iv, plaintext, aad, ciphertext, tag)
 #
-key128 = 0x2b7e151628aed2a6abf7158809cf4f3c
-key192 = 0x8e73b0f7da0e6452c810f32b809079e562f8ead2522c6b7b
-key256 = \
-    0x603deb1015ca71be2b73aef0857d77811f352c073b6108d72d9810a30914dff4
+gcm_key0 = 0
+gcm_key128 = 0xfeffe9928665731c6d6a8f9467308308
+gcm_key192 = 0xfeffe9928665731c6d6a8f9467308308feffe9928665731c
+gcm_key256 = \
+    0xfeffe9928665731c6d6a8f9467308308feffe9928665731c6d6a8f9467308308
+gcm_iv = \
+    b'\xca\xfe\xba\xbe\xfa\xce\xdb\xad\xde\xca\xf8\x88'
+gcm_iv64 = \
+    b'\xca\xfe\xba\xbe\xfa\xce\xdb\xad'
+gcm_iv480 = \
+    b'\x93\x13\x22\x5d\xf8\x84\x06\xe5\x55\x90\x9c\x5a\xff\x52\x69\xaa' \
+    b'\x6a\x7a\x95\x38\x53\x4f\x7d\xa1\xe4\xc3\x03\xd2\xa3\x18\xa7\x28' \
+    b'\xc3\xc0\xc9\x51\x56\x80\x95\x39\xfc\xf0\xe2\x42\x9a\x6b\x52\x54' \
+    b'\x16\xae\xdb\xf5\xa0\xde\x6a\x57\xa6\x37\xb3\x9b'
+gcm_plaintext = \
+    b'\xd9\x31\x32\x25\xf8\x84\x06\xe5\xa5\x59\x09\xc5\xaf\xf5\x26\x9a' \
+    b'\x86\xa7\xa9\x53\x15\x34\xf7\xda\x2e\x4c\x30\x3d\x8a\x31\x8a\x72' \
+    b'\x1c\x3c\x0c\x95\x95\x68\x09\x53\x2f\xcf\x0e\x24\x49\xa6\xb5\x25' \
+    b'\xb1\x6a\xed\xf5\xaa\x0d\xe6\x57\xba\x63\x7b\x39\x1a\xaf\xd2\x55'
+gcm_aad = \
+    b'\xfe\xed\xfa\xce\xde\xad\xbe\xef\xfe\xed\xfa\xce\xde\xad\xbe\xef' \
+    b'\xab\xad\xda\xd2'
+gcm_c1 = b''
+gcm_t1 = \
+    b'\x58\xe2\xfc\xce\xfa\x7e\x30\x61\x36\x7f\x1d\x57\xa4\xe7\x45\x5a'
+gcm_c2 = \
+    b'\x03\x88\xda\xce\x60\xb6\xa3\x92\xf3\x28\xc2\xb9\x71\xb2\xfe\x78'
+gcm_t2 = \
+    b'\xab\x6e\x47\xd4\x2c\xec\x13\xbd\xf5\x3a\x67\xb2\x12\x57\xbd\xdf'
+gcm_c3 = \
+    b'\x42\x83\x1e\xc2\x21\x77\x74\x24\x4b\x72\x21\xb7\x84\xd0\xd4\x9c' \
+    b'\xe3\xaa\x21\x2f\x2c\x02\xa4\xe0\x35\xc1\x7e\x23\x29\xac\xa1\x2e' \
+    b'\x21\xd5\x14\xb2\x54\x66\x93\x1c\x7d\x8f\x6a\x5a\xac\x84\xaa\x05' \
+    b'\x1b\xa3\x0b\x39\x6a\x0a\xac\x97\x3d\x58\xe0\x91\x47\x3f\x59\x85'
+gcm_t3 = \
+    b'\x4d\x5c\x2a\xf3\x27\xcd\x64\xa6\x2c\xf3\x5a\xbd\x2b\xa6\xfa\xb4'
+gcm_c4 = \
+    b'\x42\x83\x1e\xc2\x21\x77\x74\x24\x4b\x72\x21\xb7\x84\xd0\xd4\x9c' \
+    b'\xe3\xaa\x21\x2f\x2c\x02\xa4\xe0\x35\xc1\x7e\x23\x29\xac\xa1\x2e' \
+    b'\x21\xd5\x14\xb2\x54\x66\x93\x1c\x7d\x8f\x6a\x5a\xac\x84\xaa\x05' \
+    b'\x1b\xa3\x0b\x39\x6a\x0a\xac\x97\x3d\x58\xe0\x91'
+gcm_t4 = \
+    b'\x5b\xc9\x4f\xbc\x32\x21\xa5\xdb\x94\xfa\xe9\x5a\xe7\x12\x1a\x47'
+gcm_c5 = \
+    b'\x61\x35\x3b\x4c\x28\x06\x93\x4a\x77\x7f\xf5\x1f\xa2\x2a\x47\x55' \
+    b'\x69\x9b\x2a\x71\x4f\xcd\xc6\xf8\x37\x66\xe5\xf9\x7b\x6c\x74\x23' \
+    b'\x73\x80\x69\x00\xe4\x9f\x24\xb2\x2b\x09\x75\x44\xd4\x89\x6b\x42' \
+    b'\x49\x89\xb5\xe1\xeb\xac\x0f\x07\xc2\x3f\x45\x98'
+gcm_t5 = \
+    b'\x36\x12\xd2\xe7\x9e\x3b\x07\x85\x56\x1b\xe1\x4a\xac\xa2\xfc\xcb'
+gcm_c6 = \
+    b'\x8c\xe2\x49\x98\x62\x56\x15\xb6\x03\xa0\x33\xac\xa1\x3f\xb8\x94' \
+    b'\xbe\x91\x12\xa5\xc3\xa2\x11\xa8\xba\x26\x2a\x3c\xca\x7e\x2c\xa7' \
+    b'\x01\xe4\xa9\xa4\xfb\xa4\x3c\x90\xcc\xdc\xb2\x81\xd4\x8c\x7c\x6f' \
+    b'\xd6\x28\x75\xd2\xac\xa4\x17\x03\x4c\x34\xae\xe5'
+gcm_t6 = \
+    b'\x61\x9c\xc5\xae\xff\xfe\x0b\xfa\x46\x2a\xf4\x3c\x16\x99\xd0\x50'
+gcm_c7 = b''
+gcm_t7 = \
+    b'\xcd\x33\xb2\x8a\xc7\x73\xf7\x4b\xa0\x0e\xd1\xf3\x12\x57\x24\x35'
+gcm_c8 = \
+    b'\x98\xe7\x24\x7c\x07\xf0\xfe\x41\x1c\x26\x7e\x43\x84\xb0\xf6\x00'
+gcm_t8 = \
+    b'\x2f\xf5\x8d\x80\x03\x39\x27\xab\x8e\xf4\xd4\x58\x75\x14\xf0\xfb'
+gcm_c9 = \
+    b'\x39\x80\xca\x0b\x3c\x00\xe8\x41\xeb\x06\xfa\xc4\x87\x2a\x27\x57' \
+    b'\x85\x9e\x1c\xea\xa6\xef\xd9\x84\x62\x85\x93\xb4\x0c\xa1\xe1\x9c' \
+    b'\x7d\x77\x3d\x00\xc1\x44\xc5\x25\xac\x61\x9d\x18\xc8\x4a\x3f\x47' \
+    b'\x18\xe2\x44\x8b\x2f\xe3\x24\xd9\xcc\xda\x27\x10\xac\xad\xe2\x56'
+gcm_t9 = \
+    b'\x99\x24\xa7\xc8\x58\x73\x36\xbf\xb1\x18\x02\x4d\xb8\x67\x4a\x14'
+gcm_c10 = \
+    b'\x39\x80\xca\x0b\x3c\x00\xe8\x41\xeb\x06\xfa\xc4\x87\x2a\x27\x57' \
+    b'\x85\x9e\x1c\xea\xa6\xef\xd9\x84\x62\x85\x93\xb4\x0c\xa1\xe1\x9c' \
+    b'\x7d\x77\x3d\x00\xc1\x44\xc5\x25\xac\x61\x9d\x18\xc8\x4a\x3f\x47' \
+    b'\x18\xe2\x44\x8b\x2f\xe3\x24\xd9\xcc\xda\x27\x10'
+gcm_t10 = \
+    b'\x25\x19\x49\x8e\x80\xf1\x47\x8f\x37\xba\x55\xbd\x6d\x27\x61\x8c'
+gcm_c11 = \
+    b'\x0f\x10\xf5\x99\xae\x14\xa1\x54\xed\x24\xb3\x6e\x25\x32\x4d\xb8' \
+    b'\xc5\x66\x63\x2e\xf2\xbb\xb3\x4f\x83\x47\x28\x0f\xc4\x50\x70\x57' \
+    b'\xfd\xdc\x29\xdf\x9a\x47\x1f\x75\xc6\x65\x41\xd4\xd4\xda\xd1\xc9' \
+    b'\xe9\x3a\x19\xa5\x8e\x8b\x47\x3f\xa0\xf0\x62\xf7'
+gcm_t11 = \
+    b'\x65\xdc\xc5\x7f\xcf\x62\x3a\x24\x09\x4f\xcc\xa4\x0d\x35\x33\xf8'
+gcm_c12 = \
+    b'\xd2\x7e\x88\x68\x1c\xe3\x24\x3c\x48\x30\x16\x5a\x8f\xdc\xf9\xff' \
+    b'\x1d\xe9\xa1\xd8\xe6\xb4\x47\xef\x6e\xf7\xb7\x98\x28\x66\x6e\x45' \
+    b'\x81\xe7\x90\x12\xaf\x34\xdd\xd9\xe2\xf0\x37\x58\x9b\x29\x2d\xb3' \
+    b'\xe6\x7c\x03\x67\x45\xfa\x22\xe7\xe9\xb7\x37\x3b'
+gcm_t12 = \
+    b'\xdc\xf5\x66\xff\x29\x1c\x25\xbb\xb8\x56\x8f\xc3\xd3\x76\xa6\xd9'
+gcm_c13 = b''
+gcm_t13 = \
+    b'\x53\x0f\x8a\xfb\xc7\x45\x36\xb9\xa9\x63\xb4\xf1\xc4\xcb\x73\x8b'
+gcm_c14 = \
+    b'\xce\xa7\x40\x3d\x4d\x60\x6b\x6e\x07\x4e\xc5\xd3\xba\xf3\x9d\x18'
+gcm_t14 = \
+    b'\xd0\xd1\xc8\xa7\x99\x99\x6b\xf0\x26\x5b\x98\xb5\xd4\x8a\xb9\x19'
+gcm_c15 = \
+    b'\x52\x2d\xc1\xf0\x99\x56\x7d\x07\xf4\x7f\x37\xa3\x2a\x84\x42\x7d' \
+    b'\x64\x3a\x8c\xdc\xbf\xe5\xc0\xc9\x75\x98\xa2\xbd\x25\x55\xd1\xaa' \
+    b'\x8c\xb0\x8e\x48\x59\x0d\xbb\x3d\xa7\xb0\x8b\x10\x56\x82\x88\x38' \
+    b'\xc5\xf6\x1e\x63\x93\xba\x7a\x0a\xbc\xc9\xf6\x62\x89\x80\x15\xad'
+gcm_t15 = \
+    b'\xb0\x94\xda\xc5\xd9\x34\x71\xbd\xec\x1a\x50\x22\x70\xe3\xcc\x6c'
+gcm_c16 = \
+    b'\x52\x2d\xc1\xf0\x99\x56\x7d\x07\xf4\x7f\x37\xa3\x2a\x84\x42\x7d' \
+    b'\x64\x3a\x8c\xdc\xbf\xe5\xc0\xc9\x75\x98\xa2\xbd\x25\x55\xd1\xaa' \
+    b'\x8c\xb0\x8e\x48\x59\x0d\xbb\x3d\xa7\xb0\x8b\x10\x56\x82\x88\x38' \
+    b'\xc5\xf6\x1e\x63\x93\xba\x7a\x0a\xbc\xc9\xf6\x62'
+gcm_t16 = \
+    b'\x76\xfc\x6e\xce\x0f\x4e\x17\x68\xcd\xdf\x88\x53\xbb\x2d\x55\x1b'
+gcm_c17 = \
+    b'\xc3\x76\x2d\xf1\xca\x78\x7d\x32\xae\x47\xc1\x3b\xf1\x98\x44\xcb' \
+    b'\xaf\x1a\xe1\x4d\x0b\x97\x6a\xfa\xc5\x2f\xf7\xd7\x9b\xba\x9d\xe0' \
+    b'\xfe\xb5\x82\xd3\x39\x34\xa4\xf0\x95\x4c\xc2\x36\x3b\xc7\x3f\x78' \
+    b'\x62\xac\x43\x0e\x64\xab\xe4\x99\xf4\x7c\x9b\x1f'
+gcm_t17 = \
+    b'\x3a\x33\x7d\xbf\x46\xa7\x92\xc4\x5e\x45\x49\x13\xfe\x2e\xa8\xf2'
+gcm_c18 = \
+    b'\x5a\x8d\xef\x2f\x0c\x9e\x53\xf1\xf7\x5d\x78\x53\x65\x9e\x2a\x20' \
+    b'\xee\xb2\xb2\x2a\xaf\xde\x64\x19\xa0\x58\xab\x4f\x6f\x74\x6b\xf4' \
+    b'\x0f\xc0\xc3\xb7\x80\xf2\x44\x45\x2d\xa3\xeb\xf1\xc5\xd8\x2c\xde' \
+    b'\xa2\x41\x89\x97\x20\x0e\xf8\x2e\x44\xae\x7e\x3f'
+gcm_t18 = \
+    b'\xa4\x4a\x82\x66\xee\x1c\x8e\xb0\xc8\xb5\xd4\xcf\x5a\xe9\xf1\x9a'
+gcm_vectors = [(gcm_key0, 4, bytes(12), b'', b'', gcm_c1, gcm_t1),
+               (gcm_key0, 4, bytes(12), bytes(16), b'', gcm_c2, gcm_t2),
+               (gcm_key128, 4, gcm_iv, gcm_plaintext, b'', gcm_c3, gcm_t3),
+               (gcm_key128, 4, gcm_iv, gcm_plaintext[0:60], gcm_aad, gcm_c4, gcm_t4),
+               (gcm_key128, 4, gcm_iv64, gcm_plaintext[0:60], gcm_aad, gcm_c5, gcm_t5),
+               (gcm_key128, 4, gcm_iv480, gcm_plaintext[0:60], gcm_aad, gcm_c6, gcm_t6),
+               (gcm_key0, 6, bytes(12), b'', b'', gcm_c7, gcm_t7),
+               (gcm_key0, 6, bytes(12), bytes(16), b'', gcm_c8, gcm_t8),
+               (gcm_key192, 6, gcm_iv, gcm_plaintext, b'', gcm_c9, gcm_t9),
+               (gcm_key192, 6, gcm_iv, gcm_plaintext[0:60], gcm_aad, gcm_c10, gcm_t10),
+               (gcm_key192, 6, gcm_iv64, gcm_plaintext[0:60], gcm_aad, gcm_c11, gcm_t11),
+               (gcm_key192, 6, gcm_iv480, gcm_plaintext[0:60], gcm_aad, gcm_c12, gcm_t12),
+               (gcm_key0, 8, bytes(12), b'', b'', gcm_c13, gcm_t13),
+               (gcm_key0, 8, bytes(12), bytes(16), b'', gcm_c14, gcm_t14),
+               (gcm_key256, 8, gcm_iv, gcm_plaintext, b'', gcm_c15, gcm_t15),
+               (gcm_key256, 8, gcm_iv, gcm_plaintext[0:60], gcm_aad, gcm_c16, gcm_t16),
+               (gcm_key256, 8, gcm_iv64, gcm_plaintext[0:60], gcm_aad, gcm_c17, gcm_t17),
+               (gcm_key256, 8, gcm_iv480, gcm_plaintext[0:60], gcm_aad, gcm_c18, gcm_t18)]
 
 
+#
+# XTS-AES test vectors 1 to 4, 10 and 15 to 18 of IEEE Std 1619-2007,
+#   the XTS key being Key1 || Key2 and the data unit sequence number
+#   an integer: (key, n_k, sector, plaintext, ciphertext)
+#
+xts_key1 = 0x0000000000000000000000000000000000000000000000000000000000000000
+xts_key2 = 0x1111111111111111111111111111111122222222222222222222222222222222
+xts_key3 = 0xfffefdfcfbfaf9f8f7f6f5f4f3f2f1f022222222222222222222222222222222
+xts_key4 = 0x2718281828459045235360287471352631415926535897932384626433832795
+xts_key10 = \
+    0x2718281828459045235360287471352662497757247093699959574966967627 << 256 | \
+    0x3141592653589793238462643383279502884197169399375105820974944592
+xts_key15 = 0xfffefdfcfbfaf9f8f7f6f5f4f3f2f1f0bfbebdbcbbbab9b8b7b6b5b4b3b2b1b0
+xts_plaintext = bytes(range(256)) * 2
+xts_c1 = \
+    b'\x91\x7c\xf6\x9e\xbd\x68\xb2\xec\x9b\x9f\xe9\xa3\xea\xdd\xa6\x92' \
+    b'\xcd\x43\xd2\xf5\x95\x98\xed\x85\x8c\x02\xc2\x65\x2f\xbf\x92\x2e'
+xts_c2 = \
+    b'\xc4\x54\x18\x5e\x6a\x16\x93\x6e\x39\x33\x40\x38\xac\xef\x83\x8b' \
+    b'\xfb\x18\x6f\xff\x74\x80\xad\xc4\x28\x93\x82\xec\xd6\xd3\x94\xf0'
+xts_c3 = \
+    b'\xaf\x85\x33\x6b\x59\x7a\xfc\x1a\x90\x0b\x2e\xb2\x1e\xc9\x49\xd2' \
+    b'\x92\xdf\x4c\x04\x7e\x0b\x21\x53\x21\x86\xa5\x97\x1a\x22\x7a\x89'
+xts_c4 = \
+    b'\x27\xa7\x47\x9b\xef\xa1\xd4\x76\x48\x9f\x30\x8c\xd4\xcf\xa6\xe2' \
+    b'\xa9\x6e\x4b\xbe\x32\x08\xff\x25\x28\x7d\xd3\x81\x96\x16\xe8\x9c' \
+    b'\xc7\x8c\xf7\xf5\xe5\x43\x44\x5f\x83\x33\xd8\xfa\x7f\x56\x00\x00' \
+    b'\x05\x27\x9f\xa5\xd8\xb5\xe4\xad\x40\xe7\x36\xdd\xb4\xd3\x54\x12' \
+    b'\x32\x80\x63\xfd\x2a\xab\x53\xe5\xea\x1e\x0a\x9f\x33\x25\x00\xa5' \
+    b'\xdf\x94\x87\xd0\x7a\x5c\x92\xcc\x51\x2c\x88\x66\xc7\xe8\x60\xce' \
+    b'\x93\xfd\xf1\x66\xa2\x49\x12\xb4\x22\x97\x61\x46\xae\x20\xce\x84' \
+    b'\x6b\xb7\xdc\x9b\xa9\x4a\x76\x7a\xae\xf2\x0c\x0d\x61\xad\x02\x65' \
+    b'\x5e\xa9\x2d\xc4\xc4\xe4\x1a\x89\x52\xc6\x51\xd3\x31\x74\xbe\x51' \
+    b'\xa1\x0c\x42\x11\x10\xe6\xd8\x15\x88\xed\xe8\x21\x03\xa2\x52\xd8' \
+    b'\xa7\x50\xe8\x76\x8d\xef\xff\xed\x91\x22\x81\x0a\xae\xb9\x9f\x91' \
+    b'\x72\xaf\x82\xb6\x04\xdc\x4b\x8e\x51\xbc\xb0\x82\x35\xa6\xf4\x34' \
+    b'\x13\x32\xe4\xca\x60\x48\x2a\x4b\xa1\xa0\x3b\x3e\x65\x00\x8f\xc5' \
+    b'\xda\x76\xb7\x0b\xf1\x69\x0d\xb4\xea\xe2\x9c\x5f\x1b\xad\xd0\x3c' \
+    b'\x5c\xcf\x2a\x55\xd7\x05\xdd\xcd\x86\xd4\x49\x51\x1c\xeb\x7e\xc3' \
+    b'\x0b\xf1\x2b\x1f\xa3\x5b\x91\x3f\x9f\x74\x7a\x8a\xfd\x1b\x13\x0e' \
+    b'\x94\xbf\xf9\x4e\xff\xd0\x1a\x91\x73\x5c\xa1\x72\x6a\xcd\x0b\x19' \
+    b'\x7c\x4e\x5b\x03\x39\x36\x97\xe1\x26\x82\x6f\xb6\xbb\xde\x8e\xcc' \
+    b'\x1e\x08\x29\x85\x16\xe2\xc9\xed\x03\xff\x3c\x1b\x78\x60\xf6\xde' \
+    b'\x76\xd4\xce\xcd\x94\xc8\x11\x98\x55\xef\x52\x97\xca\x67\xe9\xf3' \
+    b'\xe7\xff\x72\xb1\xe9\x97\x85\xca\x0a\x7e\x77\x20\xc5\xb3\x6d\xc6' \
+    b'\xd7\x2c\xac\x95\x74\xc8\xcb\xbc\x2f\x80\x1e\x23\xe5\x6f\xd3\x44' \
+    b'\xb0\x7f\x22\x15\x4b\xeb\xa0\xf0\x8c\xe8\x89\x1e\x64\x3e\xd9\x95' \
+    b'\xc9\x4d\x9a\x69\xc9\xf1\xb5\xf4\x99\x02\x7a\x78\x57\x2a\xee\xbd' \
+    b'\x74\xd2\x0c\xc3\x98\x81\xc2\x13\xee\x77\x0b\x10\x10\xe4\xbe\xa7' \
+    b'\x18\x84\x69\x77\xae\x11\x9f\x7a\x02\x3a\xb5\x8c\xca\x0a\xd7\x52' \
+    b'\xaf\xe6\x56\xbb\x3c\x17\x25\x6a\x9f\x6e\x9b\xf1\x9f\xdd\x5a\x38' \
+    b'\xfc\x82\xbb\xe8\x72\xc5\x53\x9e\xdb\x60\x9e\xf4\xf7\x9c\x20\x3e' \
+    b'\xbb\x14\x0f\x2e\x58\x3c\xb2\xad\x15\xb4\xaa\x5b\x65\x50\x16\xa8' \
+    b'\x44\x92\x77\xdb\xd4\x77\xef\x2c\x8d\x6c\x01\x7d\xb7\x38\xb1\x8d' \
+    b'\xeb\x4a\x42\x7d\x19\x23\xce\x3f\xf2\x62\x73\x57\x79\xa4\x18\xf2' \
+    b'\x0a\x28\x2d\xf9\x20\x14\x7b\xea\xbe\x42\x1e\xe5\x31\x9d\x05\x68'
+xts_c10 = \
+    b'\x1c\x3b\x3a\x10\x2f\x77\x03\x86\xe4\x83\x6c\x99\xe3\x70\xcf\x9b' \
+    b'\xea\x00\x80\x3f\x5e\x48\x23\x57\xa4\xae\x12\xd4\x14\xa3\xe6\x3b' \
+    b'\x5d\x31\xe2\x76\xf8\xfe\x4a\x8d\x66\xb3\x17\xf9\xac\x68\x3f\x44' \
+    b'\x68\x0a\x86\xac\x35\xad\xfc\x33\x45\xbe\xfe\xcb\x4b\xb1\x88\xfd' \
+    b'\x57\x76\x92\x6c\x49\xa3\x09\x5e\xb1\x08\xfd\x10\x98\xba\xec\x70' \
+    b'\xaa\xa6\x69\x99\xa7\x2a\x82\xf2\x7d\x84\x8b\x21\xd4\xa7\x41\xb0' \
+    b'\xc5\xcd\x4d\x5f\xff\x9d\xac\x89\xae\xba\x12\x29\x61\xd0\x3a\x75' \
+    b'\x71\x23\xe9\x87\x0f\x8a\xcf\x10\x00\x02\x08\x87\x89\x14\x29\xca' \
+    b'\x2a\x3e\x7a\x7d\x7d\xf7\xb1\x03\x55\x16\x5c\x8b\x9a\x6d\x0a\x7d' \
+    b'\xe8\xb0\x62\xc4\x50\x0d\xc4\xcd\x12\x0c\x0f\x74\x18\xda\xe3\xd0' \
+    b'\xb5\x78\x1c\x34\x80\x3f\xa7\x54\x21\xc7\x90\xdf\xe1\xde\x18\x34' \
+    b'\xf2\x80\xd7\x66\x7b\x32\x7f\x6c\x8c\xd7\x55\x7e\x12\xac\x3a\x0f' \
+    b'\x93\xec\x05\xc5\x2e\x04\x93\xef\x31\xa1\x2d\x3d\x92\x60\xf7\x9a' \
+    b'\x28\x9d\x6a\x37\x9b\xc7\x0c\x50\x84\x14\x73\xd1\xa8\xcc\x81\xec' \
+    b'\x58\x3e\x96\x45\xe0\x7b\x8d\x96\x70\x65\x5b\xa5\xbb\xcf\xec\xc6' \
+    b'\xdc\x39\x66\x38\x0a\xd8\xfe\xcb\x17\xb6\xba\x02\x46\x9a\x02\x0a' \
+    b'\x84\xe1\x8e\x8f\x84\x25\x20\x70\xc1\x3e\x9f\x1f\x28\x9b\xe5\x4f' \
+    b'\xbc\x48\x14\x57\x77\x8f\x61\x60\x15\xe1\x32\x7a\x02\xb1\x40\xf1' \
+    b'\x50\x5e\xb3\x09\x32\x6d\x68\x37\x8f\x83\x74\x59\x5c\x84\x9d\x84' \
+    b'\xf4\xc3\x33\xec\x44\x23\x88\x51\x43\xcb\x47\xbd\x71\xc5\xed\xae' \
+    b'\x9b\xe6\x9a\x2f\xfe\xce\xb1\xbe\xc9\xde\x24\x4f\xbe\x15\x99\x2b' \
+    b'\x11\xb7\x7c\x04\x0f\x12\xbd\x8f\x6a\x97\x5a\x44\xa0\xf9\x0c\x29' \
+    b'\xa9\xab\xc3\xd4\xd8\x93\x92\x72\x84\xc5\x87\x54\xcc\xe2\x94\x52' \
+    b'\x9f\x86\x14\xdc\xd2\xab\xa9\x91\x92\x5f\xed\xc4\xae\x74\xff\xac' \
+    b'\x6e\x33\x3b\x93\xeb\x4a\xff\x04\x79\xda\x9a\x41\x0e\x44\x50\xe0' \
+    b'\xdd\x7a\xe4\xc6\xe2\x91\x09\x00\x57\x5d\xa4\x01\xfc\x07\x05\x9f' \
+    b'\x64\x5e\x8b\x7e\x9b\xfd\xef\x33\x94\x30\x54\xff\x84\x01\x14\x93' \
+    b'\xc2\x7b\x34\x29\xea\xed\xb4\xed\x53\x76\x44\x1a\x77\xed\x43\x85' \
+    b'\x1a\xd7\x7f\x16\xf5\x41\xdf\xd2\x69\xd5\x0d\x6a\x5f\x14\xfb\x0a' \
+    b'\xab\x1c\xbb\x4c\x15\x50\xbe\x97\xf7\xab\x40\x66\x19\x3c\x4c\xaa' \
+    b'\x77\x3d\xad\x38\x01\x4b\xd2\x09\x2f\xa7\x55\xc8\x24\xbb\x5e\x54' \
+    b'\xc4\xf3\x6f\xfd\xa9\xfc\xea\x70\xb9\xc6\xe6\x93\xe1\x48\xc1\x51'
+xts_c15 = \
+    b'\x6c\x16\x25\xdb\x46\x71\x52\x2d\x3d\x75\x99\x60\x1d\xe7\xca\x09' \
+    b'\xed'
+xts_c16 = \
+    b'\xd0\x69\x44\x4b\x7a\x7e\x0c\xab\x09\xe2\x44\x47\xd2\x4d\xeb\x1f' \
+    b'\xed\xbf'
+xts_c17 = \
+    b'\xe5\xdf\x13\x51\xc0\x54\x4b\xa1\x35\x0b\x33\x63\xcd\x8e\xf4\xbe' \
+    b'\xed\xbf\x9d'
+xts_c18 = \
+    b'\x9d\x84\xc8\x13\xf7\x19\xaa\x2c\x7b\xe3\xf6\x61\x71\xc7\xc5\xc2' \
+    b'\xed\xbf\x9d\xac'
+xts_vectors = [(xts_key1, 4, 0, bytes(32), xts_c1),
+               (xts_key2, 4, 0x3333333333, b'\x44' * 32, xts_c2),
+               (xts_key3, 4, 0x3333333333, b'\x44' * 32, xts_c3),
+               (xts_key4, 4, 0, xts_plaintext, xts_c4),
+               (xts_key10, 8, 0xff, xts_plaintext, xts_c10),
+               (xts_key15, 4, 0x123456789a, xts_plaintext[0:17], xts_c15),
+               (xts_key15, 4, 0x123456789a, xts_plaintext[0:18], xts_c16),
+               (xts_key15, 4, 0x123456789a, xts_plaintext[0:19], xts_c17),
+               (xts_key15, 4, 0x123456789a, xts_plaintext[0:20], xts_c18)]
+
+
+#
+# CMAC of the first 0, 16, 40 and 64 bytes of test_string under the
+#   test keys (appendix D of NIST Special Publication 800-38B):
+#   (key, n_k, message, tag)
+#
+cmac128_0 = \
+    b'\xbb\x1d\x69\x29\xe9\x59\x37\x28\x7f\xa3\x7d\x12\x9b\x75\x67\x46'
+cmac128_16 = \
+    b'\x07\x0a\x16\xb4\x6b\x4d\x41\x44\xf7\x9b\xdd\x9d\xd0\x4a\x28\x7c'
+cmac128_40 = \
+    b'\xdf\xa6\x67\x47\xde\x9a\xe6\x30\x30\xca\x32\x61\x14\x97\xc8\x27'
+cmac128_64 = \
+    b'\x51\xf0\xbe\xbf\x7e\x3b\x9d\x92\xfc\x49\x74\x17\x79\x36\x3c\xfe'
+cmac192_0 = \
+    b'\xd1\x7d\xdf\x46\xad\xaa\xcd\xe5\x31\xca\xc4\x83\xde\x7a\x93\x67'
+cmac192_16 = \
+    b'\x9e\x99\xa7\xbf\x31\xe7\x10\x90\x06\x62\xf6\x5e\x61\x7c\x51\x84'
+cmac192_40 = \
+    b'\x8a\x1d\xe5\xbe\x2e\xb3\x1a\xad\x08\x9a\x82\xe6\xee\x90\x8b\x0e'
+cmac192_64 = \
+    b'\xa1\xd5\xdf\x0e\xed\x79\x0f\x79\x4d\x77\x58\x96\x59\xf3\x9a\x11'
+cmac256_0 = \
+    b'\x02\x89\x62\xf6\x1b\x7b\xf8\x9e\xfc\x6b\x55\x1f\x46\x67\xd9\x83'
+cmac256_16 = \
+    b'\x28\xa7\x02\x3f\x45\x2e\x8f\x82\xbd\x4b\xf2\x8d\x8c\x37\xc3\x5c'
+cmac256_40 = \
+    b'\xaa\xf3\xd8\xf1\xde\x56\x40\xc2\x32\xf5\xb1\x69\xb9\xc9\x11\xe6'
+cmac256_64 = \
+    b'\xe1\x99\x21\x90\x54\x9f\x6e\xd5\x69\x6a\x2c\x05\x6c\x31\x54\x10'
+cmac_vectors = [(key128, 4, b'', cmac128_0),
+                (key128, 4, test_string[0:16], cmac128_16),
+                (key128, 4, test_string[0:40], cmac128_40),
+                (key128, 4, test_string, cmac128_64),
+                (key192, 6, b'', cmac192_0),
+                (key192, 6, test_string[0:16], cmac192_16),
+                (key192, 6, test_string[0:40], cmac192_40),
+                (key192, 6, test_string, cmac192_64),
+                (key256, 8, b'', cmac256_0),
+                (key256, 8, test_string[0:16], cmac256_16),
+                (key256, 8, test_string[0:40], cmac256_40),
+                (key256, 8, test_string, cmac256_64)]
+
 ##
 #
 # A Function for comparing two files, byte by byte
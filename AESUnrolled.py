@@ -0,0 +1,81 @@
+from functools import lru_cache
+from AESTTable import KeyExpansion, KeyExpansionEIC
+from AESTables import sbox, sboxInv, te0, te1, te2, te3, td0, td1, td2, td3
+
+
+#
+# Unrolled AES: at key setup the table-driven rounds of AESTTable
+# are written out as Python source with the Round Keys inlined as
+# constants, compiled once and cached per Cipher Key.  The resulting
+# functions have no round loop, no Round Key indexing and no
+# key-size branches.
+#
+
+
+# For the Cipher, output column j of a round reads row r of
+# column (j + r) % 4; for the Inverse Cipher it reads (j - r) % 4
+ENCRYPT_COLUMNS = [[(j + r) % 4 for r in range(4)] for j in range(4)]
+DECRYPT_COLUMNS = [[(j - r) % 4 for r in range(4)] for j in range(4)]
+
+
+def cipher_source(w, n_k, inverse=False):
+    """
+cipher_source(w, n_k, inverse=False) -> str
+
+cipher_source returns the source of a fully unrolled function
+block(inp) -> bytes for the Round Keys (w) of AESTTable.KeyExpansion,
+or, if inverse is True, of AESTTable.KeyExpansionEIC.
+n_k is the number of 32-bit words comprising the Cipher Key.
+  For this standard, n_k = 4, 6, or 8."""
+    n_r = n_k + 6
+    if inverse:
+        t, s, columns = 'td', 'sboxInv', DECRYPT_COLUMNS
+    else:
+        t, s, columns = 'te', 'sbox', ENCRYPT_COLUMNS
+    lines = ['def block(inp, t0=%s0, t1=%s1, t2=%s2, t3=%s3, s=%s):' % (t, t, t, t, s)]
+    for j in range(4):
+        lines.append('    a%d = int.from_bytes(inp[%d:%d], "big") ^ 0x%08x' % (j, 4 * j, 4 * j + 4, w[j]))
+    src, dst = 'a', 'b'
+    for i in range(1, n_r):
+        for j in range(4):
+            c = columns[j]
+            lines.append('    %s%d = t0[%s%d >> 24] ^ t1[(%s%d >> 16) & 255] ^ '
+                         't2[(%s%d >> 8) & 255] ^ t3[%s%d & 255] ^ 0x%08x'
+                         % (dst, j, src, c[0], src, c[1], src, c[2], src, c[3], w[4 * i + j]))
+        src, dst = dst, src
+    for j in range(4):
+        c = columns[j]
+        lines.append('    %s%d = ((s[%s%d >> 24] << 24) | (s[(%s%d >> 16) & 255] << 16) | '
+                     '(s[(%s%d >> 8) & 255] << 8) | s[%s%d & 255]) ^ 0x%08x'
+                     % (dst, j, src, c[0], src, c[1], src, c[2], src, c[3], w[4 * n_r + j]))
+    lines.append('    return ((%s0 << 96) | (%s1 << 64) | (%s2 << 32) | %s3).to_bytes(16, "big")'
+                 % (dst, dst, dst, dst))
+    return '\n'.join(lines) + '\n'
+
+
+def compile_cipher(w, n_k, inverse=False):
+    """
+compile_cipher(w, n_k, inverse=False) -> function
+
+compile_cipher compiles the source returned by cipher_source
+and returns the function block(inp) -> bytes."""
+    namespace = {'te0': te0, 'te1': te1, 'te2': te2, 'te3': te3,
+                 'td0': td0, 'td1': td1, 'td2': td2, 'td3': td3,
+                 'sbox': sbox, 'sboxInv': sboxInv}
+    exec(compile(cipher_source(w, n_k, inverse), '<aes-unrolled-%d>' % (32 * n_k), 'exec'), namespace)
+    return namespace['block']
+
+
+@lru_cache(maxsize=16)
+def unrolled_cipher(key, n_k):
+    """
+unrolled_cipher(key, n_k) -> (cipher, inv_cipher)
+
+unrolled_cipher returns a pair of functions that encrypt and
+decrypt one 16-byte block under the Cipher Key (key).  Both are
+generated and compiled on the first call for a key and cached
+for the following ones.
+n_k is the number of 32-bit words comprising the Cipher Key (key).
+  For this standard, n_k = 4, 6, or 8."""
+    return (compile_cipher(KeyExpansion(key, n_k), n_k),
+            compile_cipher(KeyExpansionEIC(key, n_k), n_k, True))
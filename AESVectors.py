@@ -0,0 +1,53 @@
+##
+#
+# Test Vectors (from NIST Special Publication 800-38A), used by the
+# self-test of each AES backend
+#
+##
+
+#
+# test file is equivalent to the following four bytes strings:
+#
+t1 = b'\x6b\xc1\xbe\xe2\x2e\x40\x9f\x96\xe9\x3d\x7e\x11\x73\x93\x17\x2a'
+t2 = b'\xae\x2d\x8a\x57\x1e\x03\xac\x9c\x9e\xb7\x6f\xac\x45\xaf\x8e\x51'
+t3 = b'\x30\xc8\x1c\x46\xa3\x5c\xe4\x11\xe5\xfb\xc1\x19\x1a\x0a\x52\xef'
+t4 = b'\xf6\x9f\x24\x45\xdf\x4f\x9b\x17\xad\x2b\x41\x7b\xe6\x6c\x37\x10'
+test_string = t1 + t2 + t3 + t4
+
+
+#
+# test keys:
+#
+key128 = 0x2b7e151628aed2a6abf7158809cf4f3c
+key192 = 0x8e73b0f7da0e6452c810f32b809079e562f8ead2522c6b7b
+key256 = \
+    0x603deb1015ca71be2b73aef0857d77811f352c073b6108d72d9810a30914dff4
+
+
+
+#
+# ECB encryption of test_string under the test keys
+#   (sections F.1.1, F.1.3 and F.1.5 of NIST Special Publication 800-38A):
+#
+ecb128 = \
+    b'\x3a\xd7\x7b\xb4\x0d\x7a\x36\x60\xa8\x9e\xca\xf3\x24\x66\xef\x97' \
+    b'\xf5\xd3\xd5\x85\x03\xb9\x69\x9d\xe7\x85\x89\x5a\x96\xfd\xba\xaf' \
+    b'\x43\xb1\xcd\x7f\x59\x8e\xce\x23\x88\x1b\x00\xe3\xed\x03\x06\x88' \
+    b'\x7b\x0c\x78\x5e\x27\xe8\xad\x3f\x82\x23\x20\x71\x04\x72\x5d\xd4'
+ecb192 = \
+    b'\xbd\x33\x4f\x1d\x6e\x45\xf2\x5f\xf7\x12\xa2\x14\x57\x1f\xa5\xcc' \
+    b'\x97\x41\x04\x84\x6d\x0a\xd3\xad\x77\x34\xec\xb3\xec\xee\x4e\xef' \
+    b'\xef\x7a\xfd\x22\x70\xe2\xe6\x0a\xdc\xe0\xba\x2f\xac\xe6\x44\x4e' \
+    b'\x9a\x4b\x41\xba\x73\x8d\x6c\x72\xfb\x16\x69\x16\x03\xc1\x8e\x0e'
+ecb256 = \
+    b'\xf3\xee\xd1\xbd\xb5\xd2\xa0\x3c\x06\x4b\x5a\x7e\x3d\xb1\x81\xf8' \
+    b'\x59\x1c\xcb\x10\xd4\x10\xed\x26\xdc\x5b\xa7\x4a\x31\x36\x28\x70' \
+    b'\xb6\xed\x21\xb9\x9c\xa6\xf4\xf9\xf1\x53\xe7\xb1\xbe\xaf\xed\x1d' \
+    b'\x23\x30\x4b\x7a\x39\xf9\xf3\xff\x06\x7d\x8d\x8f\x9e\x24\xec\xc7'
+
+#
+# (key, n_k, plaintext, ciphertext) for each of the above
+#
+ecb_vectors = [(key128, 4, test_string, ecb128),
+               (key192, 6, test_string, ecb192),
+               (key256, 8, test_string, ecb256)]
@@ -1,58 +1,181 @@
-from AES import KeyExpansion, Cipher, InvCipher
-from AESHelp import pad_strip, xor, aes_file_helper
+from AESBackend import new_engine, release_engine
+from AESPipeline import Pipeline
+from AESHelp import pad_strip, xor_bytes, read_chunk, aes_file_helper, key_words, CHUNK_SIZE
 
+# Pairs of files aes_encrypt_cbc_multi keeps open at once
+CBC_MULTI_FILES = 64
 
-def aes_encrypt_cbc(key, bits, in_name, out_name='file'):
+
+def aes_encrypt_cbc(key, bits, in_name, out_name='file', stats=None, mac=None):
     """
-aes_encrypt_cbc(key, bits, in_name, out_name='file') -> file
+aes_encrypt_cbc(key, bits, in_name, out_name='file', stats=None, mac=None) -> file
 
 aes_encrypt_cbc performs 128, 192, or 256-bit AES encryption
 using the cipher Block chaining mode of operation
-described in NIST Special Publication 800-38A."""
+described in NIST Special Publication 800-38A.
+The file is read and written by a Pipeline; if stats is a dict,
+the Pipeline's stage times are stored in it.  If mac is given
+(a CMAC, say), the IV and ciphertext are passed to its update
+method as they are written."""
     from os import urandom
-    f_in, f_out, keys, n_k = aes_cbc_helper(bits, in_name, key, out_name)
-    iv = urandom(16)
-    f_out.write(iv)
+    f_in, f_out, engine = aes_cbc_helper(bits, in_name, key, out_name)
+    try:
+        iv = urandom(16)
+        f_out.write(iv)
+        if mac is not None:
+            mac.update(iv)
+        c = iv
+        pipeline = Pipeline(f_in, f_out)
+        try:
+            os = pipeline.read()
+            while os != b'':
+                m_len = len(os) % 16
+                if m_len != 0:
+                    os = os + b'\x80' + bytes(16 - m_len - 1)
+                out = encrypt_chunk_cbc(engine, c, os)
+                c = out[-16:]
+                pipeline.write(out)
+                if mac is not None:
+                    mac.update(out)
+                os = pipeline.read()
+        except BaseException:
+            pipeline.close(False)
+            raise
+        times = pipeline.close()
+    finally:
+        release_engine(engine)
+        f_in.close()
+        f_out.close()
+    if stats is not None:
+        stats.update(times)
+
+
+def encrypt_chunk_cbc(engine, iv, os):
+    """
+encrypt_chunk_cbc(engine, iv, os) -> bytes
+
+encrypt_chunk_cbc encrypts the whole blocks of os with engine,
+iv being the ciphertext block before them (or the IV)."""
+    cipher = engine.cipher
     c = iv
-    os = f_in.read(16)
-    while os != b'':
-        m_len = len(os)
-        if m_len < 16:
-            pt = os + b'\x80' + bytes(16 - m_len - 1)
-        else:
-            pt = os
-        c = Cipher(xor(pt, c), keys, n_k)
-        f_out.write(c)
-        os = f_in.read(16)
-    f_in.close()
-    f_out.close()
+    out = []
+    for k in range(0, len(os), 16):
+        c = cipher((int.from_bytes(os[k:k + 16], 'big') ^ int.from_bytes(c, 'big')).to_bytes(16, 'big'))
+        out.append(c)
+    return b''.join(out)
+
+
+def aes_encrypt_cbc_multi(key, bits, files, limit=CBC_MULTI_FILES):
+    """
+aes_encrypt_cbc_multi(key, bits, files, limit=CBC_MULTI_FILES) -> files
+
+aes_encrypt_cbc_multi encrypts each (in_name, out_name) pair of the
+list files as aes_encrypt_cbc would, producing the same output.
+CBC encryption of one file is serial, but the files are
+independent chains: they are advanced in lockstep, and step k
+encrypts block k of every file with one call of the Engine's
+cipher_blocks, so the cost of a call is shared by all the files.
+At most limit pairs are open at once; the next pair is opened as
+soon as one is finished."""
+    from os import urandom
+    engine = new_engine(key, key_words(bits))
+    pending = list(files)
+    pending.reverse()
+    f_ins, f_outs, chains = [], [], []
+    try:
+        while f_ins or pending:
+            while pending and len(f_ins) < limit:
+                in_name, out_name = pending.pop()
+                f_ins.append(open(in_name, 'rb'))
+                f_outs.append(open(out_name, 'wb'))
+                iv = urandom(16)
+                f_outs[-1].write(iv)
+                chains.append(iv)
+            chunks = []
+            for j in range(len(f_ins)):
+                os = read_chunk(f_ins[j])
+                m_len = len(os) % 16
+                if m_len != 0:
+                    os = os + b'\x80' + bytes(16 - m_len - 1)
+                chunks.append(os)
+            outs = [[] for _ in chunks]
+            for k in range(0, max(len(os) for os in chunks), 16):
+                active = [j for j in range(len(chunks)) if k < len(chunks[j])]
+                c = engine.cipher_blocks(xor_bytes(b''.join([chunks[j][k:k + 16] for j in active]),
+                                                   b''.join([chains[j] for j in active])))
+                for i, j in enumerate(active):
+                    chains[j] = c[16 * i:16 * i + 16]
+                    outs[j].append(chains[j])
+            for j in range(len(chunks) - 1, -1, -1):
+                f_outs[j].write(b''.join(outs[j]))
+                if len(chunks[j]) < CHUNK_SIZE:
+                    f_ins.pop(j).close()
+                    f_outs.pop(j).close()
+                    chains.pop(j)
+    finally:
+        release_engine(engine)
+        for f in f_ins + f_outs:
+            f.close()
 
 
 def aes_cbc_helper(bits, in_name, key, out_name):
     f_in, f_out, n_k = aes_file_helper(bits, in_name, out_name)
-    keys = KeyExpansion(key, n_k)
-    return f_in, f_out, keys, n_k
+    try:
+        engine = new_engine(key, n_k)
+    except Exception:
+        f_in.close()
+        f_out.close()
+        raise
+    return f_in, f_out, engine
 
 
-def aes_decrypt_cbc(key, bits, in_name, out_name):
+def aes_decrypt_cbc(key, bits, in_name, out_name, workers=None, mac=None):
     """
-aes_decrypt_cbc(key, bits, in_name, out_name) -> file
+aes_decrypt_cbc(key, bits, in_name, out_name, workers=None, mac=None) -> file
 
 aes_decrypt_cbc performs 128, 192, or 256-bit AES decryption
 using the cipher Block chaining mode of operation
-described in NIST Special Publication 800-38A.  """
-    f_in, f_out, keys, n_k = aes_cbc_helper(bits, in_name, key, out_name)
-    iv = f_in.read(16)
-    os = f_in.read(16)
-    while os != b'':
-        m = xor(InvCipher(os, keys, n_k), iv)
-        iv = os
-        os = f_in.read(16)
-        if os == b'':
-            m = pad_strip(m)
-        f_out.write(m)
-    f_in.close()
-    f_out.close()
+described in NIST Special Publication 800-38A.
+With workers > 1 large files are decrypted by that many
+processes at once (see AESParallel).  If mac is given, the IV
+and ciphertext are passed to its update method as they are read,
+in a single process.  """
+    if workers is not None and workers > 1 and mac is None:
+        from AESParallel import cbc_decrypt_parallel
+        if cbc_decrypt_parallel(key, bits, in_name, out_name, workers):
+            return
+    f_in, f_out, engine = aes_cbc_helper(bits, in_name, key, out_name)
+    try:
+        iv = f_in.read(16)
+        if mac is not None:
+            mac.update(iv)
+        os = read_chunk(f_in)
+        while os != b'':
+            c = os
+            if mac is not None:
+                mac.update(c)
+            os = read_chunk(f_in)
+            f_out.write(decrypt_chunk_cbc(engine, iv, c, os == b''))
+            iv = c[-16:]
+    finally:
+        release_engine(engine)
+        f_in.close()
+        f_out.close()
+
+
+def decrypt_chunk_cbc(engine, iv, os, last):
+    """
+decrypt_chunk_cbc(engine, iv, os, last) -> bytes
+
+decrypt_chunk_cbc decrypts the ciphertext blocks os with engine,
+iv being the ciphertext block before them (or the IV).  Each
+plaintext block is InvCipher(C[j]) xor C[j-1], so any run of
+blocks can be decrypted on its own.  If os is the last chunk of
+the file, the padding is stripped from its last block."""
+    m = xor_bytes(engine.inv_cipher_blocks(os), iv + os[0:-16])
+    if last:
+        m = m[0:-16] + pad_strip(m[-16:])
+    return m
 
 
 def aes_encrypt_128_cbc(key, in_name, out_name='file'):
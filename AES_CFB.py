@@ -1,62 +1,154 @@
-from AES import KeyExpansion, Cipher
-from AESHelp import xor, pad_strip, msb, lsb, aes_file_helper
+from AESBackend import new_engine, release_engine
+from AESPipeline import Pipeline
+from AESHelp import xor_bytes, pad_strip, read_chunk, wide_numpy, aes_file_helper, CHUNK_SIZE
 
 
-def aes_encrypt_cfb(key, bits, s, in_name, out_name='file'):
+def aes_encrypt_cfb(key, bits, s, in_name, out_name='file', stats=None):
     """
-aes_encrypt_cfb(key, bits, s, in_name, out_name='file') -> file
+aes_encrypt_cfb(key, bits, s, in_name, out_name='file', stats=None) -> file
 
 aes_encrypt_cfb performs 128, 192, or 256-bit AES encryption
 using the s-bit Cipher Feedback block cipher mode of operation
-described in NIST Special Publication 800-38A."""
+described in NIST Special Publication 800-38A.
+The file is read and written by a Pipeline; if stats is a dict,
+the Pipeline's stage times are stored in it."""
     from os import urandom
-    b, f_in, f_out, keys, n_k = aes_cfb_helper(bits, in_name, key, out_name, s)
-    iv = urandom(16)
-    f_out.write(iv)
-    piece = f_in.read(b)
-    while piece != b'':
-        p_len = len(piece)
-        if p_len < b:
-            piece = piece + b'\x80' + bytes(b - p_len - 1)
-        output = Cipher(iv, keys, n_k)
-        encrypted_output = xor(piece, msb(s, output))
-        f_out.write(encrypted_output)
-        piece = f_in.read(b)
-        iv = lsb(128 - s, iv) + encrypted_output
-    f_in.close()
-    f_out.close()
+    b, f_in, f_out, engine = aes_cfb_helper(bits, in_name, key, out_name, s)
+    try:
+        iv = urandom(16)
+        f_out.write(iv)
+        pipeline = Pipeline(f_in, f_out, CHUNK_SIZE // b * b)
+        try:
+            piece = pipeline.read()
+            while piece != b'':
+                p_len = len(piece) % b
+                if p_len != 0:
+                    piece = piece + b'\x80' + bytes(b - p_len - 1)
+                encrypted_output = encrypt_chunk_cfb(engine, iv, piece, b)
+                pipeline.write(encrypted_output)
+                iv = (iv + encrypted_output)[-16:]
+                piece = pipeline.read()
+        except BaseException:
+            pipeline.close(False)
+            raise
+        times = pipeline.close()
+    finally:
+        release_engine(engine)
+        f_in.close()
+        f_out.close()
+    if stats is not None:
+        stats.update(times)
 
 
 def aes_cfb_helper(bits, in_name, key, out_name, s):
+    b = segment_bytes(s)
     f_in, f_out, n_k = aes_file_helper(bits, in_name, out_name)
+    try:
+        engine = new_engine(key, n_k)
+    except Exception:
+        f_in.close()
+        f_out.close()
+        raise
+    return b, f_in, f_out, engine
+
+
+def segment_bytes(s):
+    """
+segment_bytes(s) -> number
+
+segment_bytes returns the number of bytes in an s-bit segment."""
     if s % 8 != 0 or s < 8 or s > 128:
         raise Exception("s must be a multiple of 8, between 8 and 128")
-    b = s // 8
-    keys = KeyExpansion(key, n_k)
-    return b, f_in, f_out, keys, n_k
+    return s // 8
 
 
-def aes_decrypt_cfb(key, bits, s, in_name, out_name):
+def aes_decrypt_cfb(key, bits, s, in_name, out_name, workers=None):
     """
-aes_decrypt_cfb(key, bits, s, in_name, out_name) -> file
+aes_decrypt_cfb(key, bits, s, in_name, out_name, workers=None) -> file
 
 aes_decrypt_cfb performs 128, 192, or 256-bit AES decryption
 using the s-bit Cipher Feedback block cipher mode of operation
-described in NIST Special Publication 800-38A.  """
-
-    byte, f_in, f_out, keys, n_k = aes_cfb_helper(bits, in_name, key, out_name, s)
-    data_in = f_in.read(16)
-    data_out = f_in.read(byte)
-    while data_out != b'':
-        o = Cipher(data_in, keys, n_k)
-        p = xor(data_out, msb(s, o))
-        data_in = lsb(128 - s, data_in) + data_out
-        data_out = f_in.read(byte)
-        if data_out == b'' and byte > 1:
-            p = pad_strip(p)
-        f_out.write(p)
-    f_in.close()
-    f_out.close()
+described in NIST Special Publication 800-38A.
+With workers > 1 large files are decrypted by that many
+processes at once (see AESParallel).  """
+    if workers is not None and workers > 1:
+        from AESParallel import cfb_decrypt_parallel
+        if cfb_decrypt_parallel(key, bits, s, in_name, out_name, workers):
+            return
+    byte, f_in, f_out, engine = aes_cfb_helper(bits, in_name, key, out_name, s)
+    chunk_size = CHUNK_SIZE // byte * byte
+    try:
+        data_in = f_in.read(16)
+        data_out = read_chunk(f_in, chunk_size)
+        while data_out != b'':
+            c = data_out
+            data_out = read_chunk(f_in, chunk_size)
+            f_out.write(decrypt_chunk_cfb(engine, data_in, c, byte, data_out == b''))
+            data_in = (data_in + c)[-16:]
+    finally:
+        release_engine(engine)
+        f_in.close()
+        f_out.close()
+
+
+def encrypt_chunk_cfb(engine, data_in, data, byte):
+    """
+encrypt_chunk_cfb(engine, data_in, data, byte) -> bytes
+
+encrypt_chunk_cfb encrypts the plaintext segments of byte bytes in
+data with engine, data_in being the 16 bytes of IV and ciphertext
+before them.  The shift register is not rebuilt for every segment:
+IV || ciphertext is kept in one bytearray, and the input block of
+each segment is a 16-byte view into it ending where the segment
+starts."""
+    n = len(data)
+    window = bytearray(data_in) + bytearray(n)
+    view = memoryview(window)
+    cipher = engine.cipher
+    if byte == 1:
+        for i in range(n):
+            window[16 + i] = data[i] ^ cipher(view[i:i + 16])[0]
+    else:
+        for i in range(0, n, byte):
+            o = int.from_bytes(cipher(view[i:i + 16])[0:byte], 'big')
+            window[16 + i:16 + i + byte] = (int.from_bytes(data[i:i + byte], 'big') ^ o).to_bytes(byte, 'big')
+    view.release()
+    return bytes(window[16:])
+
+
+def decrypt_chunk_cfb(engine, data_in, data_out, byte, last):
+    """
+decrypt_chunk_cfb(engine, data_in, data_out, byte, last) -> bytes
+
+decrypt_chunk_cfb decrypts the ciphertext segments of byte bytes
+in data_out with engine, data_in being the 16 bytes of IV and
+ciphertext before them.  The input block of each segment is the
+16 bytes of IV || ciphertext that end where the segment starts,
+so all of them are known up front and any run of segments can be
+decrypted on its own.  If data_out is the last chunk of the file,
+the padding is stripped from its last segment."""
+    n = len(data_out)
+    window = data_in + data_out
+    numpy = wide_numpy(16 * n // byte)
+    if byte == 16:
+        inputs = window[0:n]
+    elif numpy is not None:
+        from numpy.lib.stride_tricks import sliding_window_view
+        inputs = sliding_window_view(numpy.frombuffer(window, dtype=numpy.uint8), 16)[0:n:byte].tobytes()
+    else:
+        inputs = b''.join([window[i:i + 16] for i in range(0, n, byte)])
+    o = engine.cipher_blocks(inputs)
+    if byte == 1:
+        o = o[0::16]
+    elif byte < 16:
+        if numpy is not None:
+            o = numpy.frombuffer(o, dtype=numpy.uint8).reshape(-1, 16)[:, 0:byte].tobytes()
+        else:
+            o = b''.join([o[i:i + byte] for i in range(0, len(o), 16)])
+    p = xor_bytes(data_out, o[0:n])
+    if last and byte > 1:
+        p = p[0:-byte] + pad_strip(p[-byte:])
+    return p
 
 
 def aes_encrypt_128_cfb_8(key, in_name, out_name='file'):
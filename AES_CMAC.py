@@ -0,0 +1,242 @@
+from AESBackend import new_engine, release_engine
+from AESHelp import xor_bytes, read_chunk, key_words
+
+
+#
+# The CMAC authentication mode of NIST Special Publication 800-38B:
+# a CBC-MAC whose last block is first xored with the subkey K1, if it
+# is whole, or padded with 10...0 and xored with the subkey K2.
+#
+CMAC_TAG_BYTES = 16
+# The shortest tag a verifier accepts (SP 800-38B, Appendix A)
+CMAC_MIN_TAG_BYTES = 8
+MASK128 = (1 << 128) - 1
+
+
+def double(l):
+    # l * x in GF(2^128) for the subkeys (SP 800-38B section 6.1)
+    return ((l << 1) & MASK128) ^ (0x87 if l >> 127 else 0)
+
+
+def subkeys(engine):
+    """
+subkeys(engine) -> (number, number)
+
+subkeys returns the subkeys K1 and K2 of the Cipher Key of engine,
+as integers."""
+    k1 = double(int.from_bytes(engine.cipher(bytes(16)), 'big'))
+    return k1, double(k1)
+
+
+def last_block(block, k1, k2):
+    # The last block of a message, whole or not, as an integer
+    if len(block) == 16:
+        return int.from_bytes(block, 'big') ^ k1
+    return int.from_bytes(block + b'\x80' + bytes(15 - len(block)), 'big') ^ k2
+
+
+class CMAC:
+    """
+CMAC(key, n_k) -> CMAC
+
+A CMAC computes the CMAC of a message under the Cipher Key (key),
+in pieces of any length passed to update.  digest returns the tag
+of the message so far, and verify checks one, without ending it;
+close hands back the Engine once the CMAC is no longer needed.
+n_k is the number of 32-bit words comprising the Cipher Key (key).
+  For this standard, n_k = 4, 6, or 8."""
+    __slots__ = ('engine', 'k1', 'k2', 'x', 'pending')
+
+    def __init__(self, key, n_k):
+        self.engine = new_engine(key, n_k)
+        try:
+            self.k1, self.k2 = subkeys(self.engine)
+        except Exception:
+            self.close()
+            raise
+        self.x = 0
+        self.pending = b''
+
+    def update(self, data):
+        """
+update(data) -> None
+
+update adds the byte string data to the message.  The last block
+seen so far is held back, since it may turn out to be the last of
+the message."""
+        data = self.pending + data
+        whole = (len(data) - 1) // 16 * 16 if data else 0
+        cipher = self.engine.cipher
+        x = self.x
+        for k in range(0, whole, 16):
+            x = int.from_bytes(cipher((x ^ int.from_bytes(data[k:k + 16], 'big')).to_bytes(16, 'big')), 'big')
+        self.x = x
+        self.pending = data[whole:]
+
+    def digest(self, length=CMAC_TAG_BYTES):
+        """
+digest(length=CMAC_TAG_BYTES) -> bytes
+
+digest returns the tag of the message so far, truncated to its
+first length bytes."""
+        if not 0 < length <= CMAC_TAG_BYTES:
+            raise Exception("Unsupported tag length of %d bytes" % length)
+        y = self.x ^ last_block(self.pending, self.k1, self.k2)
+        return bytes(self.engine.cipher(y.to_bytes(16, 'big')))[0:length]
+
+    def verify(self, tag, length=CMAC_TAG_BYTES):
+        """
+verify(tag, length=CMAC_TAG_BYTES) -> None
+
+verify raises an Exception unless tag is the first length bytes of
+the tag of the message so far.  The verifier, not the tag, sets the
+length, which must be at least CMAC_MIN_TAG_BYTES."""
+        from hmac import compare_digest
+        check_tag_length(length)
+        if len(tag) != length or not compare_digest(self.digest(length), tag):
+            raise Exception("CMAC authentication failed")
+
+    def close(self):
+        """
+close() -> None
+
+close hands back the Engine."""
+        if self.engine is not None:
+            release_engine(self.engine)
+            self.engine = None
+
+
+def check_tag_length(length):
+    # Raises unless a verifier may accept tags of length bytes
+    if not CMAC_MIN_TAG_BYTES <= length <= CMAC_TAG_BYTES:
+        raise Exception("Unsupported tag length of %d bytes" % length)
+
+
+def cmac_tags(key, n_k, messages, length=CMAC_TAG_BYTES):
+    """
+cmac_tags(key, n_k, messages, length=CMAC_TAG_BYTES) -> bytes list
+
+cmac_tags returns the tag of each byte string of messages under the
+Cipher Key (key).  Each tag is a chain of block encryptions, but
+the chains of different messages are independent: they are
+advanced in lockstep, and step k encrypts block k of every message
+long enough to have one with a single call of the Engine's
+cipher_blocks."""
+    if not 0 < length <= CMAC_TAG_BYTES:
+        raise Exception("Unsupported tag length of %d bytes" % length)
+    engine = new_engine(key, n_k)
+    try:
+        k1, k2 = subkeys(engine)
+        # Each message with its last block already xored with its subkey
+        prepared = []
+        for m in messages:
+            whole = (len(m) - 1) // 16 * 16 if m else 0
+            prepared.append(m[0:whole] + last_block(m[whole:], k1, k2).to_bytes(16, 'big'))
+        chains = [bytes(16)] * len(prepared)
+        for k in range(0, max([len(m) for m in prepared], default=0), 16):
+            active = [j for j in range(len(prepared)) if k < len(prepared[j])]
+            c = bytes(engine.cipher_blocks(xor_bytes(b''.join([prepared[j][k:k + 16] for j in active]),
+                                                     b''.join([chains[j] for j in active]))))
+            for i, j in enumerate(active):
+                chains[j] = c[16 * i:16 * i + 16]
+    finally:
+        release_engine(engine)
+    return [chain[0:length] for chain in chains]
+
+
+def cmac_verify_batch(key, n_k, pairs, length=CMAC_TAG_BYTES):
+    """
+cmac_verify_batch(key, n_k, pairs, length=CMAC_TAG_BYTES) -> bool list
+
+cmac_verify_batch checks each (message, tag) of pairs under the
+Cipher Key (key), computing all the tags at once with cmac_tags,
+and returns whether each tag is right.  As for CMAC.verify, a tag
+must be exactly length bytes long."""
+    from hmac import compare_digest
+    check_tag_length(length)
+    tags = cmac_tags(key, n_k, [message for message, tag in pairs], length)
+    return [len(tag) == length and compare_digest(tags[j], tag)
+            for j, (message, tag) in enumerate(pairs)]
+
+
+def aes_cmac(key, bits, in_name):
+    """
+aes_cmac(key, bits, in_name) -> bytes
+
+aes_cmac returns the 128-bit CMAC of the file in_name under the
+128, 192, or 256-bit Cipher Key (key), as described in NIST
+Special Publication 800-38B."""
+    mac = CMAC(key, key_words(bits))
+    try:
+        with open(in_name, 'rb') as f_in:
+            m = read_chunk(f_in)
+            while m != b'':
+                mac.update(m)
+                m = read_chunk(f_in)
+        return mac.digest()
+    finally:
+        mac.close()
+
+
+#
+# Encryption and authentication in one pass over the data: the mode
+# function feeds the CMAC everything it writes (encryption) or reads
+# (decryption) after the key, i.e. the IV or initial counter block
+# and the ciphertext, so the tag authenticates the encrypted file as
+# stored (Encrypt-then-MAC).  mac_key should be independent of key.
+#
+MAC_MODES = ('cbc', 'ctr')
+
+
+def aes_encrypt_and_mac(key, mac_key, bits, in_name, out_name='file', mode='ctr'):
+    """
+aes_encrypt_and_mac(key, mac_key, bits, in_name, out_name='file', mode='ctr') -> bytes
+
+aes_encrypt_and_mac encrypts the file in_name into out_name with
+aes_encrypt_cbc (mode 'cbc') or aes_cipher_ctr (mode 'ctr') under
+key, and returns the CMAC under mac_key of the file written,
+computed while it is written."""
+    n_k = key_words(bits)
+    mac = CMAC(mac_key, n_k)
+    try:
+        if mode == 'cbc':
+            from AES_CBC import aes_encrypt_cbc
+            aes_encrypt_cbc(key, bits, in_name, out_name, mac=mac)
+        elif mode == 'ctr':
+            from AES_CTR import aes_cipher_ctr
+            aes_cipher_ctr(key, bits, 'e', in_name, out_name, mac=mac)
+        else:
+            raise Exception('Unsupported Mode')
+        return mac.digest()
+    finally:
+        mac.close()
+
+
+def aes_decrypt_and_verify(key, mac_key, bits, in_name, out_name, tag, mode='ctr',
+                           length=CMAC_TAG_BYTES):
+    """
+aes_decrypt_and_verify(key, mac_key, bits, in_name, out_name, tag, mode='ctr', length=CMAC_TAG_BYTES) -> file
+
+aes_decrypt_and_verify decrypts a file written by
+aes_encrypt_and_mac, checking tag, which must be length bytes long
+(see CMAC.verify), while it is read.  If the tag does not match, the output file is removed and an Exception
+raised."""
+    from os import remove
+    n_k = key_words(bits)
+    mac = CMAC(mac_key, n_k)
+    try:
+        if mode == 'cbc':
+            from AES_CBC import aes_decrypt_cbc
+            aes_decrypt_cbc(key, bits, in_name, out_name, mac=mac)
+        elif mode == 'ctr':
+            from AES_CTR import aes_cipher_ctr
+            aes_cipher_ctr(key, bits, 'd', in_name, out_name, mac=mac)
+        else:
+            raise Exception('Unsupported Mode')
+        try:
+            mac.verify(tag, length)
+        except Exception:
+            remove(out_name)
+            raise
+    finally:
+        mac.close()
@@ -1,25 +1,51 @@
-from AES import Cipher
-from AESHelp import xor, msb, aes_ctr_ofb_helper
+from AESBackend import release_engine
+from AESCounter import CounterBlock, COUNTER_128
+from AESHelp import xor_bytes, read_chunk, aes_ctr_ofb_helper
 
 
-def aes_cipher_ctr(key, bits, mode, in_name, out_name='file'):
+def aes_cipher_ctr(key, bits, mode, in_name, out_name='file', counter_bits=COUNTER_128, workers=None,
+                   mac=None):
     """
-aes_cipher_ctr(key, bits, mode, in_name, out_name='file') -> file
+aes_cipher_ctr(key, bits, mode, in_name, out_name='file', counter_bits=COUNTER_128, workers=None, mac=None) -> file
 
 aes_cipher_ctr performs 128, 192, or 256-bit AES encryption
 or decryption using the Counter block cipher mode
-of operation described in NIST Special Publication 800-38A."""
-    ctr, f_in, f_out, keys, m, n_k = aes_ctr_ofb_helper(bits, in_name, key, mode, out_name)
-    while len(m) == 16:
-        inp = Cipher(ctr, keys, n_k)
-        f_out.write(xor(m, inp))
-        m = f_in.read(16)
-        ctr = increment(ctr)
-    if m != b'':
-        inp = Cipher(ctr, keys, n_k)
-        f_out.write(xor(m, msb(len(m) * 8, inp)))
-    f_in.close()
-    f_out.close()
+of operation described in NIST Special Publication 800-38A.
+The initial counter block is stored ahead of the ciphertext; its
+low counter_bits bits are the counter field (see AESCounter).
+With workers > 1 large files are processed by that many
+processes at once (see AESParallel).  If mac is given (a CMAC,
+say), the initial counter block and ciphertext are passed to its
+update method as they are written or read, in a single process."""
+    if workers is not None and workers > 1 and mac is None:
+        from AESParallel import ctr_parallel
+        if ctr_parallel(key, bits, mode, in_name, out_name, counter_bits, workers):
+            return
+    ctr, f_in, f_out, engine, m = aes_ctr_ofb_helper(bits, in_name, key, mode, out_name)
+    try:
+        counter = CounterBlock(ctr, counter_bits)
+        if mac is not None:
+            mac.update(ctr)
+        while m != b'':
+            out = cipher_chunk_ctr(engine, counter, m)
+            f_out.write(out)
+            if mac is not None:
+                mac.update(out if mode == 'e' else m)
+            m = read_chunk(f_in)
+    finally:
+        release_engine(engine)
+        f_in.close()
+        f_out.close()
+
+
+def cipher_chunk_ctr(engine, counter, m):
+    """
+cipher_chunk_ctr(engine, counter, m) -> bytes
+
+cipher_chunk_ctr xors the byte string m with the keystream of the
+next counter blocks of the CounterBlock (counter)."""
+    keystream = engine.cipher_blocks(counter.blocks((len(m) + 15) // 16))
+    return xor_bytes(m, keystream[0:len(m)])
 
 
 def increment(os, i=1):
@@ -27,16 +53,10 @@ def increment(os, i=1):
 increment(os, i=1) -> bytes
 
 increment takes a bytes object and returns a 
-bytes object that has been incremented by i."""
-    if os == b'':
-        return b''
-    else:
-        x = os[-1]
-        x += i
-        if x > 255:
-            return increment(os[0:-1]) + b'\x00'
-        else:
-            return os[0:-1] + bytes([x])
+bytes object that has been incremented by i, modulo
+2 to the power of its length in bits."""
+    n = len(os)
+    return ((int.from_bytes(os, 'big') + i) % (1 << 8 * n)).to_bytes(n, 'big')
 
 
 def aes_encrypt_128_ctr(key, in_name, out_name='file'):
@@ -1,49 +1,107 @@
-from AES import Cipher, InvCipher, KeyExpansion
-from AESHelp import pad_strip, aes_file_helper
+from AESBackend import new_engine, release_engine
+from AESHelp import pad_strip, read_chunk, aes_file_helper
 
 
-def aes_encrypt_ecb(key, bits, in_name, out_name='file'):
+def aes_encrypt_ecb(key, bits, in_name, out_name='file', workers=None, cache=None):
     """
-aes_encrypt_ecb(key, bits, in_name, out_name='file') -> file
+aes_encrypt_ecb(key, bits, in_name, out_name='file', workers=None, cache=None) -> file
   
 aes_encrypt_ecb performs 128, 192, or 256-bit AES encryption
 using the Electronic Code Book block cipher mode of operation
-described in NIST Special Publication 800-38A."""
+described in NIST Special Publication 800-38A.
+With workers > 1 large files are encrypted by that many
+processes at once (see AESParallel).  If cache is a BlockCache,
+blocks it has seen before under this key are not encrypted again;
+read the caveat in AESBlockCache first.  A cache is only used by
+a single process, so it turns workers off."""
+    if workers is not None and workers > 1 and cache is None:
+        from AESParallel import ecb_parallel
+        if ecb_parallel(key, bits, in_name, out_name, False, workers):
+            return
     f_in, f_out, n_k = aes_file_helper(bits, in_name, out_name)
-    keys = KeyExpansion(key, n_k)
-    os = f_in.read(16)
-    while os != b'':
-        m_len = len(os)
-        if m_len < 16:
-            m = os + b'\x80' + bytes(16 - m_len - 1)
-        else:
-            m = os
-        c = Cipher(m, keys, n_k)
-        f_out.write(c)
-        os = f_in.read(16)
-    f_in.close()
-    f_out.close()
-
-
-def aes_decrypt_ecb(key, bits, in_name, out_name):
+    engine = None
+    try:
+        engine = new_engine(key, n_k)
+        tag = cache_tag(key, n_k, cache)
+        os = read_chunk(f_in)
+        while os != b'':
+            f_out.write(encrypt_chunk_ecb(engine, os, cache, tag))
+            os = read_chunk(f_in)
+    finally:
+        if engine is not None:
+            release_engine(engine)
+        f_in.close()
+        f_out.close()
+
+
+def aes_decrypt_ecb(key, bits, in_name, out_name, workers=None, cache=None):
     """
-aes_decrypt_ecb(key, bits, in_name, out_name) -> file
+aes_decrypt_ecb(key, bits, in_name, out_name, workers=None, cache=None) -> file
   
 aes_decrypt_ecb performs 128, 192, or 256-bit AES decryption
 using the Electronic Code Book block cipher mode of operation
-described in NIST Special Publication 800-38A.  """
+described in NIST Special Publication 800-38A.
+With workers > 1 large files are decrypted by that many
+processes at once (see AESParallel).  cache is as for
+aes_encrypt_ecb.  """
+    if workers is not None and workers > 1 and cache is None:
+        from AESParallel import ecb_parallel
+        if ecb_parallel(key, bits, in_name, out_name, True, workers):
+            return
     f_in, f_out, n_k = aes_file_helper(bits, in_name, out_name)
-    keys = KeyExpansion(key, n_k)
-    os = f_in.read(16)
-    while os != b'':
-        c = os
-        os = f_in.read(16)
-        m = InvCipher(c, keys, n_k)
-        if os == b'':
-            m = pad_strip(m)
-        f_out.write(m)
-    f_in.close()
-    f_out.close()
+    engine = None
+    try:
+        engine = new_engine(key, n_k)
+        tag = cache_tag(key, n_k, cache)
+        os = read_chunk(f_in)
+        while os != b'':
+            c = os
+            os = read_chunk(f_in)
+            f_out.write(decrypt_chunk_ecb(engine, c, os == b'', cache, tag))
+    finally:
+        if engine is not None:
+            release_engine(engine)
+        f_in.close()
+        f_out.close()
+
+
+def cache_tag(key, n_k, cache):
+    # The tag under which cache keeps the blocks of this Cipher Key
+    if cache is None:
+        return None
+    from AESKeySchedule import schedule_tag
+    return schedule_tag(key, n_k)
+
+
+def encrypt_chunk_ecb(engine, os, cache=None, tag=None):
+    """
+encrypt_chunk_ecb(engine, os, cache=None, tag=None) -> bytes
+
+encrypt_chunk_ecb encrypts the byte string os with engine,
+padding a final partial block with '\x80\x00...'.  If cache is
+a BlockCache, the blocks go through it under tag."""
+    m_len = len(os) % 16
+    if m_len != 0:
+        os = os + b'\x80' + bytes(16 - m_len - 1)
+    if cache is not None:
+        return cache.transform(tag, os, False, engine.cipher_blocks)
+    return engine.cipher_blocks(os)
+
+
+def decrypt_chunk_ecb(engine, os, last, cache=None, tag=None):
+    """
+decrypt_chunk_ecb(engine, os, last, cache=None, tag=None) -> bytes
+
+decrypt_chunk_ecb decrypts the byte string os with engine and,
+if it is the last chunk of the file, strips the padding from
+its last block.  cache and tag are as for encrypt_chunk_ecb."""
+    if cache is not None:
+        m = cache.transform(tag, os, True, engine.inv_cipher_blocks)
+    else:
+        m = engine.inv_cipher_blocks(os)
+    if last:
+        m = m[0:-16] + pad_strip(m[-16:])
+    return m
 
 
 def aes_encrypt_128_ecb(key, in_name, out_name='file'):
@@ -0,0 +1,300 @@
+from AESBackend import new_engine, release_engine, schedule_cache
+from AESCounter import CounterBlock, COUNTER_32
+from AESGHash import GHashTable, GHASH_TABLE_BITS
+from AESHelp import xor_bytes, read_chunk, aes_file_helper
+from AESKeySchedule import schedule_tag
+
+
+#
+# The Galois/Counter Mode of NIST Special Publication 800-38D: CTR
+# encryption with a 32-bit counter field (GCTR) followed by GHASH over
+# the additional authenticated data and the ciphertext.
+#
+GCM_IV_BYTES = 12
+GCM_TAG_BYTES = 16
+TAG_LENGTHS = (4, 8, 12, 13, 14, 15, 16)
+
+
+class GCM:
+    """
+GCM(key, n_k, iv, table_bits=GHASH_TABLE_BITS) -> GCM
+
+A GCM authenticates and encrypts, or authenticates and decrypts,
+one message under the Cipher Key (key) and the initialization
+vector iv, in pieces of any length: first all the additional
+authenticated data through update_aad, then the plaintext through
+encrypt or the ciphertext through decrypt.  digest returns the
+authentication tag and verify checks one; either ends the message.
+The GHASH table of table_bits (see AESGHash) is kept in the schedule
+cache together with the Engines, so messages under the same key
+share it.
+n_k is the number of 32-bit words comprising the Cipher Key (key).
+  For this standard, n_k = 4, 6, or 8."""
+    __slots__ = ('engine', 'ghash', 'counter', 'mask', 'y', 'pending', 'keystream',
+                 'aad_len', 'text_len', 'tag')
+
+    def __init__(self, key, n_k, iv, table_bits=GHASH_TABLE_BITS):
+        if len(iv) == 0:
+            raise Exception("The IV must not be empty")
+        engine = new_engine(key, n_k)
+        self.engine = engine
+        self.ghash = None
+        try:
+            self.ghash = schedule_cache.acquire(
+                schedule_tag(key, n_k, 'ghash', table_bits),
+                lambda: GHashTable(int.from_bytes(engine.cipher(bytes(16)), 'big'), table_bits))
+            if len(iv) == GCM_IV_BYTES:
+                j0 = iv + b'\x00\x00\x00\x01'
+            else:
+                pad = -len(iv) % 16
+                j0 = self.ghash.update(0, iv + bytes(pad + 8) + (8 * len(iv)).to_bytes(8, 'big'))
+                j0 = j0.to_bytes(16, 'big')
+            self.counter = CounterBlock(j0, COUNTER_32)
+            self.mask = int.from_bytes(engine.cipher(self.counter.next_block()), 'big')
+        except Exception:
+            self.close()
+            raise
+        self.y = 0
+        self.pending = b''
+        self.keystream = b''
+        self.aad_len = 0
+        self.text_len = None
+        self.tag = None
+
+    def absorb(self, data):
+        # Hashes the whole blocks of pending + data, keeping the rest
+        data = self.pending + data
+        whole = len(data) - len(data) % 16
+        self.y = self.ghash.update(self.y, data[0:whole])
+        self.pending = data[whole:]
+
+    def flush(self):
+        # Hashes the pending partial block, padded with zeros
+        if self.pending:
+            self.y = self.ghash.update(self.y, self.pending + bytes(16 - len(self.pending)))
+            self.pending = b''
+
+    def update_aad(self, data):
+        """
+update_aad(data) -> None
+
+update_aad adds the byte string data to the additional
+authenticated data, which must all come before the text."""
+        if self.text_len is not None:
+            raise Exception("Additional authenticated data must come before the text")
+        self.aad_len += len(data)
+        self.absorb(data)
+
+    def crypt(self, data):
+        # data xor the next len(data) bytes of the GCTR keystream
+        if self.tag is not None:
+            raise Exception("The message is already finished")
+        if self.text_len is None:
+            self.flush()
+            self.text_len = 0
+        self.text_len += len(data)
+        keystream = self.keystream
+        if len(data) > len(keystream):
+            n = (len(data) - len(keystream) + 15) // 16
+            keystream = keystream + bytes(self.engine.cipher_blocks(self.counter.blocks(n)))
+        self.keystream = keystream[len(data):]
+        return xor_bytes(data, keystream[0:len(data)])
+
+    def encrypt(self, data):
+        """
+encrypt(data) -> bytes
+
+encrypt returns the ciphertext of the next piece of plaintext."""
+        out = self.crypt(data)
+        self.absorb(out)
+        return out
+
+    def decrypt(self, data):
+        """
+decrypt(data) -> bytes
+
+decrypt returns the plaintext of the next piece of ciphertext.
+It is not authentic until verify has accepted the tag."""
+        out = self.crypt(data)
+        self.absorb(data)
+        return out
+
+    def digest(self, length=GCM_TAG_BYTES):
+        """
+digest(length=GCM_TAG_BYTES) -> bytes
+
+digest finishes the message and returns its authentication tag,
+truncated to length bytes."""
+        if length not in TAG_LENGTHS:
+            raise Exception("Unsupported tag length of %d bytes" % length)
+        if self.tag is None:
+            self.flush()
+            text_len = self.text_len or 0
+            s = self.ghash.update(self.y, (8 * self.aad_len).to_bytes(8, 'big') +
+                                  (8 * text_len).to_bytes(8, 'big'))
+            self.tag = (s ^ self.mask).to_bytes(16, 'big')
+            self.close()
+        return self.tag[0:length]
+
+    def verify(self, tag):
+        """
+verify(tag) -> None
+
+verify finishes the message and raises an Exception unless tag is
+its authentication tag (or a permitted truncation of it)."""
+        from hmac import compare_digest
+        if not compare_digest(self.digest(len(tag)), tag):
+            raise Exception("GCM authentication failed")
+
+    def close(self):
+        """
+close() -> None
+
+close hands back the Engine and the GHASH table; digest and verify
+call it."""
+        if self.engine is not None:
+            release_engine(self.engine)
+            if self.ghash is not None:
+                schedule_cache.release(self.ghash)
+            self.engine = self.ghash = None
+
+
+def aes_encrypt_gcm(key, bits, in_name, out_name='file', aad=b''):
+    """
+aes_encrypt_gcm(key, bits, in_name, out_name='file', aad=b'') -> file
+
+aes_encrypt_gcm performs 128, 192, or 256-bit AES authenticated
+encryption using the Galois/Counter Mode described in NIST Special
+Publication 800-38D.  The file written is a random 96-bit IV, the
+ciphertext and a 128-bit tag that also covers aad.  If encryption
+fails, the output file is removed."""
+    from os import urandom, remove
+    f_in, f_out, n_k = aes_file_helper(bits, in_name, out_name)
+    gcm = None
+    try:
+        iv = urandom(GCM_IV_BYTES)
+        gcm = GCM(key, n_k, iv)
+        f_out.write(iv)
+        gcm.update_aad(aad)
+        m = read_chunk(f_in)
+        while m != b'':
+            f_out.write(gcm.encrypt(m))
+            m = read_chunk(f_in)
+        f_out.write(gcm.digest())
+    except Exception:
+        if gcm is not None:
+            gcm.close()
+        f_in.close()
+        f_out.close()
+        remove(out_name)
+        raise
+    f_in.close()
+    f_out.close()
+
+
+def aes_decrypt_gcm(key, bits, in_name, out_name, aad=b''):
+    """
+aes_decrypt_gcm(key, bits, in_name, out_name, aad=b'') -> file
+
+aes_decrypt_gcm performs 128, 192, or 256-bit AES authenticated
+decryption using the Galois/Counter Mode described in NIST Special
+Publication 800-38D, of a file written by aes_encrypt_gcm.  If the
+tag does not match, the output file is removed and an Exception
+raised."""
+    from os import remove
+    f_in, f_out, n_k = aes_file_helper(bits, in_name, out_name)
+    gcm = None
+    try:
+        gcm = GCM(key, n_k, f_in.read(GCM_IV_BYTES))
+        gcm.update_aad(aad)
+        held = b''
+        c = read_chunk(f_in)
+        while c != b'':
+            c = held + c
+            held = c[-GCM_TAG_BYTES:]
+            f_out.write(gcm.decrypt(c[0:-GCM_TAG_BYTES]))
+            c = read_chunk(f_in)
+        if len(held) != GCM_TAG_BYTES:
+            raise Exception("The file is too short to hold a GCM tag")
+        gcm.verify(held)
+    except Exception:
+        if gcm is not None:
+            gcm.close()
+        f_in.close()
+        f_out.close()
+        remove(out_name)
+        raise
+    f_in.close()
+    f_out.close()
+
+
+def aes_encrypt_128_gcm(key, in_name, out_name='file'):
+    """
+aes_encrypt_128_gcm(key, in_name, out_name='file') -> file
+
+aes_encrypt_128_gcm performs 128-bit AES authenticated encryption
+using the Galois/Counter Mode described in NIST Special
+Publication 800-38D."""
+    if len(hex(key)[2:]) / 2 != 16:
+        raise Exception('key must be 128 bits long')
+    aes_encrypt_gcm(key, 128, in_name, out_name)
+
+
+def aes_encrypt_192_gcm(key, in_name, out_name='file'):
+    """
+aes_encrypt_192_gcm(key, in_name, out_name='file') -> file
+
+aes_encrypt_192_gcm performs 192-bit AES authenticated encryption
+using the Galois/Counter Mode described in NIST Special
+Publication 800-38D."""
+    if len(hex(key)[2:]) / 2 != 24:
+        raise Exception('key must be 192 bits long')
+    aes_encrypt_gcm(key, 192, in_name, out_name)
+
+
+def aes_encrypt_256_gcm(key, in_name, out_name='file'):
+    """
+aes_encrypt_256_gcm(key, in_name, out_name='file') -> file
+
+aes_encrypt_256_gcm performs 256-bit AES authenticated encryption
+using the Galois/Counter Mode described in NIST Special
+Publication 800-38D."""
+    if len(hex(key)[2:]) / 2 != 32:
+        raise Exception('key must be 256 bits long')
+    aes_encrypt_gcm(key, 256, in_name, out_name)
+
+
+def aes_decrypt_128_gcm(key, in_name, out_name):
+    """
+aes_decrypt_128_gcm(key, in_name, out_name) -> file
+
+aes_decrypt_128_gcm performs 128-bit AES authenticated decryption
+using the Galois/Counter Mode described in NIST Special
+Publication 800-38D.  """
+    if len(hex(key)[2:]) / 2 != 16:
+        raise Exception('key must be 128 bits long')
+    aes_decrypt_gcm(key, 128, in_name, out_name)
+
+
+def aes_decrypt_192_gcm(key, in_name, out_name):
+    """
+aes_decrypt_192_gcm(key, in_name, out_name) -> file
+
+aes_decrypt_192_gcm performs 192-bit AES authenticated decryption
+using the Galois/Counter Mode described in NIST Special
+Publication 800-38D.  """
+    if len(hex(key)[2:]) / 2 != 24:
+        raise Exception('key must be 192 bits long')
+    aes_decrypt_gcm(key, 192, in_name, out_name)
+
+
+def aes_decrypt_256_gcm(key, in_name, out_name):
+    """
+aes_decrypt_256_gcm(key, in_name, out_name) -> file
+
+aes_decrypt_256_gcm performs 256-bit AES authenticated decryption
+using the Galois/Counter Mode described in NIST Special
+Publication 800-38D.  """
+    if len(hex(key)[2:]) / 2 != 32:
+        raise Exception('key must be 256 bits long')
+    aes_decrypt_gcm(key, 256, in_name, out_name)
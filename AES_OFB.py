@@ -1,24 +1,144 @@
-from AES import Cipher
-from AESHelp import xor, msb, aes_ctr_ofb_helper
+from queue import Queue, Empty
+from threading import Event, Thread
+from AESBackend import release_engine
+from AESPipeline import Pipeline
+from AESHelp import xor_bytes, aes_ctr_ofb_helper, CHUNK_SIZE
 
+# Keystream chunks aes_cipher_ofb lets its producer thread run ahead
+OFB_DEPTH = 4
 
-def aes_cipher_ofb(key, bits, mode, in_name, out_name='file'):
+
+def aes_cipher_ofb(key, bits, mode, in_name, out_name='file', depth=OFB_DEPTH, stats=None):
     """
-aes_cipher_ofb(key, bits, mode, in_name, out_name='file') -> file
+aes_cipher_ofb(key, bits, mode, in_name, out_name='file', depth=OFB_DEPTH, stats=None) -> file
 
 aes_cipher_ofb performs 128, 192, or 256-bit AES encryption
 or decryption using the Output Feedback block cipher mode
-of operation described in NIST Special Publication 800-38A."""
-    i, f_in, f_out, keys, m, n_k = aes_ctr_ofb_helper(bits, in_name, key, mode, out_name)
-    while len(m) == 16:
-        i = Cipher(i, keys, n_k)
-        f_out.write(xor(m, i))
-        m = f_in.read(16)
-    if m != b'':
-        i = Cipher(i, keys, n_k)
-        f_out.write(xor(m, msb(len(m) * 8, i)))
-    f_in.close()
-    f_out.close()
+of operation described in NIST Special Publication 800-38A.
+The keystream does not depend on the data, so it is generated by
+an OFBKeystream up to depth chunks ahead of the file reads, writes
+and xors; with depth 0 it is generated in step with them.  The
+keystream is cut to the length of in_name only if it is a regular
+file; from a pipe or other stream the producer runs open-ended,
+and depth None then means OFB_DEPTH.
+The file is read and written by a Pipeline; if stats is a dict,
+the Pipeline's stage times are stored in it."""
+    from os import fstat
+    from stat import S_ISREG
+    i, f_in, f_out, engine, m = aes_ctr_ofb_helper(bits, in_name, key, mode, out_name)
+    try:
+        keystream = None
+        if depth != 0:
+            length = None
+            st = fstat(f_in.fileno())
+            if S_ISREG(st.st_mode):
+                length = st.st_size - f_in.tell() + len(m)
+            elif depth is None:
+                depth = OFB_DEPTH
+            keystream = OFBKeystream(engine, i, length, depth)
+        try:
+            pipeline = Pipeline(f_in, f_out)
+            try:
+                while m != b'':
+                    if keystream is None:
+                        blocks = []
+                        for _ in range((len(m) + 15) // 16):
+                            i = engine.cipher(i)
+                            blocks.append(i)
+                        pipeline.write(xor_bytes(m, b''.join(blocks)[0:len(m)]))
+                    else:
+                        pipeline.write(xor_bytes(m, keystream.read(len(m))))
+                    m = pipeline.read()
+            except BaseException:
+                pipeline.close(False)
+                raise
+            times = pipeline.close()
+        finally:
+            if keystream is not None:
+                keystream.close()
+    finally:
+        release_engine(engine)
+        f_in.close()
+        f_out.close()
+    if stats is not None:
+        stats.update(times)
+
+
+class OFBKeystream:
+    """
+OFBKeystream(engine, iv, length=None, depth=OFB_DEPTH, chunk_size=CHUNK_SIZE) -> OFBKeystream
+
+An OFBKeystream generates the OFB keystream of the Engine (engine)
+and the initialization vector iv in a producer thread, chunk_size
+bytes at a time, into a queue of at most depth chunks; read takes
+the keystream from the queue.  With length the keystream ends
+after length bytes, and with depth None as well the whole of it is
+generated at once, so that it is ready before the message arrives;
+depth None needs a length.
+close stops the producer; the Engine must not be released before."""
+    __slots__ = ('buffers', 'pending', 'stop', 'thread')
+
+    def __init__(self, engine, iv, length=None, depth=OFB_DEPTH, chunk_size=CHUNK_SIZE):
+        if chunk_size % 16 != 0:
+            raise Exception("chunk_size must be a multiple of 16")
+        if depth is None and length is None:
+            raise Exception("An OFBKeystream without a length must have a depth")
+        self.buffers = Queue(depth or 0)
+        self.pending = b''
+        self.stop = Event()
+        self.thread = Thread(target=self.produce, args=(engine, iv, length, chunk_size), daemon=True)
+        self.thread.start()
+
+    def produce(self, engine, iv, length, chunk_size):
+        # Runs in the producer thread
+        try:
+            cipher = engine.cipher
+            while not self.stop.is_set() and (length is None or length > 0):
+                n = chunk_size if length is None else min(chunk_size, length)
+                keystream = []
+                for _ in range((n + 15) // 16):
+                    iv = cipher(iv)
+                    keystream.append(iv)
+                self.buffers.put(b''.join(keystream)[0:n])
+                if length is not None:
+                    length -= n
+            self.buffers.put(None)
+        except Exception as e:
+            self.buffers.put(e)
+
+    def read(self, n):
+        """
+read(n) -> bytes
+
+read returns the next n bytes of the keystream, waiting for the
+producer if it has not generated them yet."""
+        pieces = [self.pending]
+        have = len(self.pending)
+        while have < n:
+            chunk = self.buffers.get()
+            if chunk is None:
+                self.buffers.put(None)
+                raise Exception("The keystream has ended")
+            if isinstance(chunk, Exception):
+                raise chunk
+            pieces.append(chunk)
+            have += len(chunk)
+        data = b''.join(pieces)
+        self.pending = data[n:]
+        return data[0:n]
+
+    def close(self):
+        """
+close() -> None
+
+close stops the producer and waits for it to finish."""
+        self.stop.set()
+        while self.thread.is_alive():
+            try:
+                self.buffers.get(timeout=0.01)
+            except Empty:
+                pass
+        self.thread.join()
 
 
 def aes_encrypt_128_ofb(key, in_name, out_name='file'):
@@ -0,0 +1,294 @@
+from AESBackend import new_engine, release_engine
+from AESHelp import xor_bytes, read_chunk, aes_file_helper, key_words, CHUNK_SIZE
+
+
+#
+# The XTS-AES mode of IEEE Std 1619 (NIST Special Publication 800-38E)
+# for storage divided into sectors (data units).  The XTS key is two
+# AES keys, Key1 || Key2: block j of sector i is encrypted as
+#   C = Cipher(Key1, P xor T) xor T,  T = Cipher(Key2, i) * alpha^j
+# in GF(2^128), i being a 128-bit little-endian integer.  A sector
+# can be read or rewritten without touching any other, and its
+# ciphertext is as long as its plaintext: a final partial block is
+# handled by ciphertext stealing, so a sector must hold at least one
+# whole block.
+#
+XTS_BITS = (128, 256)
+XTS_SECTOR_SIZE = 512
+MASK128 = (1 << 128) - 1
+
+
+def mul_alpha(t):
+    # t * alpha for a tweak held as a little-endian integer
+    return ((t << 1) & MASK128) ^ (0x87 if t >> 127 else 0)
+
+
+def xex(blocks, data, tweaks):
+    # The XEX step, blocks being cipher_blocks or inv_cipher_blocks
+    return xor_bytes(bytes(blocks(xor_bytes(data, tweaks))), tweaks)
+
+
+def xts_sectors(engine, tweak_engine, sector, data, sector_size, inverse):
+    """
+xts_sectors(engine, tweak_engine, sector, data, sector_size, inverse) -> bytes
+
+xts_sectors encrypts, or with inverse decrypts, data, which is
+consecutive sectors of sector_size bytes starting with sector
+number sector; the last may be shorter, but no sector may be
+shorter than 16 bytes.  engine is the Engine of Key1 and
+tweak_engine that of Key2.  The blocks of all the sectors go to
+the Engine together: one call for the tweaks, one for the whole
+blocks and two more for ciphertext stealing."""
+    n = (len(data) + sector_size - 1) // sector_size
+    if n == 0:
+        return b''
+    if len(data) - (n - 1) * sector_size < 16:
+        raise Exception("An XTS sector must be at least 16 bytes long")
+    initial = bytes(tweak_engine.cipher_blocks(
+        b''.join([(sector + i).to_bytes(16, 'little') for i in range(n)])))
+    blocks = engine.inv_cipher_blocks if inverse else engine.cipher_blocks
+    body, tweaks, steals = [], [], []
+    for i in range(n):
+        start = i * sector_size
+        length = min(sector_size, len(data) - start)
+        regular = length // 16 - (1 if length % 16 else 0)
+        body.append(data[start:start + 16 * regular])
+        t = int.from_bytes(initial[16 * i:16 * i + 16], 'little')
+        for j in range(regular):
+            tweaks.append(t.to_bytes(16, 'little'))
+            t = mul_alpha(t)
+        if length % 16:
+            steals.append((start + 16 * regular, length % 16, t, mul_alpha(t)))
+    out = xex(blocks, b''.join(body), b''.join(tweaks))
+    if not steals:
+        return out
+    #
+    # Ciphertext stealing (IEEE 1619 section 5.3.2 and 5.4.2).  In
+    # encryption CC = XEX(P[m-1], T[m-1]) and C[m-1] = XEX(P[m] || CC
+    # tail, T[m]); decryption takes the tweaks in the other order.
+    #
+    firsts = [(t, u) if not inverse else (u, t) for offset, tail, t, u in steals]
+    x = xex(blocks, b''.join([data[offset:offset + 16] for offset, tail, t, u in steals]),
+            b''.join([first.to_bytes(16, 'little') for first, second in firsts]))
+    y = xex(blocks, b''.join([data[steals[k][0] + 16:steals[k][0] + 16 + steals[k][1]] +
+                              x[16 * k + steals[k][1]:16 * k + 16] for k in range(len(steals))]),
+            b''.join([second.to_bytes(16, 'little') for first, second in firsts]))
+    pieces = []
+    position = 0
+    k = 0
+    for i in range(n):
+        start = i * sector_size
+        length = min(sector_size, len(data) - start)
+        regular = 16 * (length // 16 - (1 if length % 16 else 0))
+        pieces.append(out[position:position + regular])
+        position += regular
+        if length % 16:
+            pieces.append(y[16 * k:16 * k + 16] + x[16 * k:16 * k + length % 16])
+            k += 1
+    return b''.join(pieces)
+
+
+def xts_keys(key, n_k):
+    # Key1 and Key2 of the XTS key (key), each of n_k words
+    key = key.to_bytes(8 * n_k, 'big')
+    return int.from_bytes(key[0:4 * n_k], 'big'), int.from_bytes(key[4 * n_k:], 'big')
+
+
+def xts_chunk(engine, data, tweak_key, sector, sector_size, inverse):
+    """
+xts_chunk(engine, data, tweak_key, sector, sector_size, inverse) -> bytes
+
+xts_chunk is xts_sectors with the Engine of Key2 made from
+tweak_key, for the parallel file functions of AESParallel."""
+    tweak_engine = new_engine(tweak_key, engine.n_k)
+    try:
+        return xts_sectors(engine, tweak_engine, sector, data, sector_size, inverse)
+    finally:
+        release_engine(tweak_engine)
+
+
+class XTS:
+    """
+XTS(key, n_k, sector_size=XTS_SECTOR_SIZE) -> XTS
+
+An XTS encrypts and decrypts sectors of sector_size bytes under
+the XTS key (key), which is Key1 || Key2: two AES keys of n_k
+32-bit words each.  For IEEE Std 1619, n_k = 4 or 8.  close hands
+back the Engines."""
+    __slots__ = ('engine', 'tweak_engine', 'sector_size')
+
+    def __init__(self, key, n_k, sector_size=XTS_SECTOR_SIZE):
+        if n_k not in (4, 8):
+            raise Exception("%d-bit XTS is not supported" % (32 * n_k))
+        if sector_size < 16:
+            raise Exception("An XTS sector must be at least 16 bytes long")
+        key1, key2 = xts_keys(key, n_k)
+        self.engine = new_engine(key1, n_k)
+        try:
+            self.tweak_engine = new_engine(key2, n_k)
+        except Exception:
+            release_engine(self.engine)
+            self.engine = None
+            raise
+        self.sector_size = sector_size
+
+    def encrypt_sectors(self, sector, data):
+        """
+encrypt_sectors(sector, data) -> bytes
+
+encrypt_sectors encrypts data, one or more consecutive sectors
+starting with number sector; only the last may be shorter than
+sector_size."""
+        return xts_sectors(self.engine, self.tweak_engine, sector, data, self.sector_size, False)
+
+    def decrypt_sectors(self, sector, data):
+        """
+decrypt_sectors(sector, data) -> bytes
+
+decrypt_sectors decrypts data, one or more consecutive sectors
+starting with number sector; only the last may be shorter than
+sector_size."""
+        return xts_sectors(self.engine, self.tweak_engine, sector, data, self.sector_size, True)
+
+    def close(self):
+        """
+close() -> None
+
+close hands back the Engines of Key1 and Key2."""
+        if self.engine is not None:
+            release_engine(self.engine)
+            release_engine(self.tweak_engine)
+            self.engine = self.tweak_engine = None
+
+
+def xts_n_k(bits):
+    # n_k of each half of a bits-bit XTS-AES key
+    if bits not in XTS_BITS:
+        raise Exception("%d-bit XTS is not supported" % bits)
+    return key_words(bits)
+
+
+def aes_cipher_xts(key, bits, inverse, in_name, out_name, sector_size=XTS_SECTOR_SIZE, sector=0,
+                   workers=None):
+    """
+aes_cipher_xts(key, bits, inverse, in_name, out_name, sector_size=XTS_SECTOR_SIZE, sector=0, workers=None) -> file
+
+aes_cipher_xts performs XTS-AES-128 or XTS-AES-256 encryption, or
+with inverse decryption, of the file in_name as in IEEE Std 1619,
+its first sector being number sector.  key is the 2 * bits-bit
+XTS key.  The output is as long as the input, so each sector of
+it can later be read or rewritten on its own with aes_read_xts
+and aes_write_xts.  The length of the file must not leave a last
+sector of fewer than 16 bytes; this is checked before the output is
+opened.  With workers > 1 large files are processed by
+that many processes at once (see AESParallel)."""
+    from os.path import getsize, isfile
+    xts_n_k(bits)
+    if isfile(in_name) and 0 < getsize(in_name) % sector_size < 16:
+        raise Exception("An XTS sector must be at least 16 bytes long")
+    if workers is not None and workers > 1:
+        from AESParallel import xts_parallel
+        if xts_parallel(key, bits, inverse, in_name, out_name, sector_size, sector, workers):
+            return
+    f_in, f_out, n_k = aes_file_helper(bits, in_name, out_name)
+    xts = None
+    try:
+        xts = XTS(key, n_k, sector_size)
+        chunk = max(CHUNK_SIZE // sector_size, 1) * sector_size
+        data = read_chunk(f_in, chunk)
+        while data != b'':
+            if inverse:
+                f_out.write(xts.decrypt_sectors(sector, data))
+            else:
+                f_out.write(xts.encrypt_sectors(sector, data))
+            sector += chunk // sector_size
+            data = read_chunk(f_in, chunk)
+    finally:
+        if xts is not None:
+            xts.close()
+        f_in.close()
+        f_out.close()
+
+
+def aes_read_xts(key, bits, name, sector, count=1, sector_size=XTS_SECTOR_SIZE, first=0):
+    """
+aes_read_xts(key, bits, name, sector, count=1, sector_size=XTS_SECTOR_SIZE, first=0) -> bytes
+
+aes_read_xts reads count sectors, starting with number sector, of
+the XTS-AES encrypted file name, whose first sector is number
+first, and returns them decrypted."""
+    n_k = xts_n_k(bits)
+    with open(name, 'rb') as f:
+        f.seek((sector - first) * sector_size)
+        data = read_chunk(f, count * sector_size)
+    xts = XTS(key, n_k, sector_size)
+    try:
+        return xts.decrypt_sectors(sector, data)
+    finally:
+        xts.close()
+
+
+def aes_write_xts(key, bits, name, sector, data, sector_size=XTS_SECTOR_SIZE, first=0):
+    """
+aes_write_xts(key, bits, name, sector, data, sector_size=XTS_SECTOR_SIZE, first=0) -> file
+
+aes_write_xts encrypts data, one or more sectors starting with
+number sector, and writes them in place in the XTS-AES encrypted
+file name, whose first sector is number first.  Only a sector
+that ends the file may be shorter than sector_size."""
+    xts = XTS(key, xts_n_k(bits), sector_size)
+    try:
+        out = xts.encrypt_sectors(sector, data)
+    finally:
+        xts.close()
+    with open(name, 'r+b') as f:
+        f.seek((sector - first) * sector_size)
+        f.write(out)
+
+
+def aes_encrypt_128_xts(key, in_name, out_name='file'):
+    """
+aes_encrypt_128_xts(key, in_name, out_name='file') -> file
+
+aes_encrypt_128_xts performs XTS-AES-128 encryption, with a
+256-bit key, as described in IEEE Std 1619 and NIST Special
+Publication 800-38E."""
+    if len(hex(key)[2:]) / 2 != 32:
+        raise Exception('key must be 256 bits long')
+    aes_cipher_xts(key, 128, False, in_name, out_name)
+
+
+def aes_encrypt_256_xts(key, in_name, out_name='file'):
+    """
+aes_encrypt_256_xts(key, in_name, out_name='file') -> file
+
+aes_encrypt_256_xts performs XTS-AES-256 encryption, with a
+512-bit key, as described in IEEE Std 1619 and NIST Special
+Publication 800-38E."""
+    if len(hex(key)[2:]) / 2 != 64:
+        raise Exception('key must be 512 bits long')
+    aes_cipher_xts(key, 256, False, in_name, out_name)
+
+
+def aes_decrypt_128_xts(key, in_name, out_name):
+    """
+aes_decrypt_128_xts(key, in_name, out_name) -> file
+
+aes_decrypt_128_xts performs XTS-AES-128 decryption, with a
+256-bit key, as described in IEEE Std 1619 and NIST Special
+Publication 800-38E.  """
+    if len(hex(key)[2:]) / 2 != 32:
+        raise Exception('key must be 256 bits long')
+    aes_cipher_xts(key, 128, True, in_name, out_name)
+
+
+def aes_decrypt_256_xts(key, in_name, out_name):
+    """
+aes_decrypt_256_xts(key, in_name, out_name) -> file
+
+aes_decrypt_256_xts performs XTS-AES-256 decryption, with a
+512-bit key, as described in IEEE Std 1619 and NIST Special
+Publication 800-38E.  """
+    if len(hex(key)[2:]) / 2 != 64:
+        raise Exception('key must be 512 bits long')
+    aes_cipher_xts(key, 256, True, in_name, out_name)